@@ -1,5 +1,8 @@
 from SearchTracksByActivity import SearchTracksByActivity
-from constants import SPOTIFY_GREEN, SPOTIFY_BLACK, ACTIVITY_GENRES
+from VirtualTrackList import VirtualTrackList
+from constants import (
+    SPOTIFY_GREEN, SPOTIFY_BLACK, ACTIVITY_GENRES, UI_TRACK_BATCH_SIZE
+)
 import webbrowser
 import customtkinter as ctk
 import threading
@@ -12,6 +15,9 @@ class AppUI:
         self.generator = generator
         self.activities = list(ACTIVITY_GENRES.keys())
         self.playlist_url = None
+        self.spotify_playlist_ids = {}
+        self.query = None
+        self.existing_playlist_entry = None
 
         self.root = ctk.CTk()
         self.root.title("Spotify Playlist Generator")
@@ -366,11 +372,141 @@ class AppUI:
         back_button.pack(pady=10)
 
     def generate_playlist(self, query, num_tracks):
-        """Generate the playlist and show results"""
-        playlist = self.generator.generate_playlist(query, num_tracks)
+        """Generate the playlist on a worker thread and show progress"""
+        for widget in self.main_frame.winfo_children():
+            widget.destroy()
+
+        heading = ctk.CTkLabel(
+            self.main_frame,
+            text=f"Generating playlist: {query}",
+            font=("Helvetica", 18, "bold"),
+            text_color=SPOTIFY_GREEN
+        )
+        heading.pack(pady=(40, 20))
+
+        progress_bar = ctk.CTkProgressBar(
+            self.main_frame,
+            width=400,
+            progress_color=SPOTIFY_GREEN
+        )
+        progress_bar.set(0)
+        progress_bar.pack(pady=10)
+
+        status_label = ctk.CTkLabel(
+            self.main_frame,
+            text="Searching Spotify...",
+            font=("Helvetica", 12)
+        )
+        status_label.pack(pady=10)
+
+        cancel_event = threading.Event()
+        progress = {"tracks": 0, "pages": 0}
+
+        def cancel_generation():
+            cancel_event.set()
+            self.create_main_menu()
+
+        cancel_button = ctk.CTkButton(
+            self.main_frame,
+            text="Cancel",
+            font=("Helvetica", 14),
+            fg_color="#555555",
+            hover_color="#444444",
+            command=cancel_generation
+        )
+        cancel_button.pack(pady=20)
+
+        def update_progress():
+            if cancel_event.is_set():
+                return
+            progress_bar.set(min(progress["tracks"] / num_tracks, 1))
+            status_label.configure(
+                text=f"{progress['tracks']} of {num_tracks} tracks "
+                     f"({progress['pages']} pages fetched)")
+
+        def page_fetched(genre, offset, count):
+            progress["pages"] += 1
+            self.root.after(0, update_progress)
+
+        def tracks_found(batch):
+            progress["tracks"] += len(batch)
+            update_progress()
+
+        stream = self.generator.generate_playlist_iter(
+            query, num_tracks, progress_callback=page_fetched)
+        playlist = self.generator.playlist
+
+        def generate_playlist_thread():
+            batch = []
+            try:
+                for track in stream:
+                    if cancel_event.is_set():
+                        break
+                    batch.append(track)
+                    if len(batch) >= UI_TRACK_BATCH_SIZE:
+                        self.root.after(
+                            0, lambda batch=batch: tracks_found(batch))
+                        batch = []
+            except Exception as error:
+                # Anything escaping here would leave the progress screen up
+                message = str(error)
+                print(f"Error generating playlist: {message}")
+                self.root.after(0, lambda: self.generation_failed(
+                    query, cancel_event, message))
+                return
+            finally:
+                stream.close()
+
+            if batch:
+                self.root.after(0, lambda: tracks_found(batch))
+            self.root.after(0, lambda: self.playlist_generated(
+                playlist, query, cancel_event))
+
+        thread = threading.Thread(target=generate_playlist_thread)
+        thread.daemon = True
+        thread.start()
+
+    def playlist_generated(self, playlist, query, cancel_event):
+        """Handle playlist generation completion"""
+        if cancel_event.is_set():
+            return
 
         self.show_playlist_results(playlist, query)
 
+    def generation_failed(self, query, cancel_event, message):
+        """Show why generation stopped and offer a way back to the menu"""
+        if cancel_event.is_set():
+            return
+
+        for widget in self.main_frame.winfo_children():
+            widget.destroy()
+
+        error_label = ctk.CTkLabel(
+            self.main_frame,
+            text=f"Could not generate playlist: {query}",
+            font=("Helvetica", 16),
+            text_color="red"
+        )
+        error_label.pack(pady=(40, 10))
+
+        detail_label = ctk.CTkLabel(
+            self.main_frame,
+            text=message,
+            font=("Helvetica", 12),
+            wraplength=450
+        )
+        detail_label.pack(pady=10)
+
+        menu_button = ctk.CTkButton(
+            self.main_frame,
+            text="Back to Menu",
+            font=("Helvetica", 16),
+            fg_color=SPOTIFY_GREEN,
+            hover_color="#1aa34a",
+            command=self.create_main_menu
+        )
+        menu_button.pack(pady=20)
+
     def show_playlist_results(self, playlist, query):
         """Show the playlist results UI"""
         for widget in self.main_frame.winfo_children():
@@ -384,22 +520,25 @@ class AppUI:
         )
         heading.pack(pady=(20, 10))
 
-        tracks_frame = ctk.CTkScrollableFrame(
+        tracks_list = VirtualTrackList(
             self.main_frame,
             width=500,
             height=200,
             fg_color="#333333"
         )
-        tracks_frame.pack(pady=10, padx=20, fill="both", expand=True)
+        tracks_list.pack(pady=10, padx=20, fill="both", expand=True)
+        tracks_list.set_items(playlist.tracks)
 
-        for i, track in enumerate(playlist.tracks):
-            track_label = ctk.CTkLabel(
-                tracks_frame,
-                text=f"{i+1}. {track}",
-                font=("Helvetica", 12),
-                anchor="w"
-            )
-            track_label.pack(pady=2, padx=10, anchor="w", fill="x")
+        self.query = query
+        self.existing_playlist_entry = ctk.CTkEntry(
+            self.main_frame,
+            width=400,
+            placeholder_text="Existing playlist link to update (optional)"
+        )
+        self.existing_playlist_entry.pack(pady=(0, 5))
+        if query in self.spotify_playlist_ids:
+            self.existing_playlist_entry.insert(
+                0, self.spotify_playlist_ids[query])
 
         button_frame = ctk.CTkFrame(self.main_frame, fg_color=SPOTIFY_BLACK)
         button_frame.pack(pady=20, fill="x")
@@ -436,41 +575,68 @@ class AppUI:
             auth_message.pack(pady=10)
             return
 
+        playlist_id = self.parse_playlist_id(
+            self.existing_playlist_entry.get())
+
         loading_label = ctk.CTkLabel(
             self.main_frame,
-            text="Creating playlist in Spotify...",
+            text="Updating playlist in Spotify..." if playlist_id
+            else "Creating playlist in Spotify...",
             font=("Helvetica", 12),
             text_color=SPOTIFY_GREEN
         )
         loading_label.pack(pady=10)
 
         def create_playlist_thread():
-            playlist_id = self.generator.create_spotify_playlist(
-                self.generator.auth.user_id,
-                self.generator.auth.access_token
-            )
+            if playlist_id:
+                result = self.generator.sync_spotify_playlist(
+                    playlist_id,
+                    self.generator.auth.access_token
+                )
+            else:
+                result = self.generator.create_spotify_playlist(
+                    self.generator.auth.user_id,
+                    self.generator.auth.access_token
+                )
 
             self.root.after(100, lambda: self.playlist_created(
-                playlist_id, loading_label))
+                result, loading_label))
 
         thread = threading.Thread(target=create_playlist_thread)
         thread.daemon = True
         thread.start()
 
-    def playlist_created(self, playlist_id, loading_label):
+    def parse_playlist_id(self, text):
+        """Return the playlist id from a Spotify link, URI or bare id"""
+        text = text.strip()
+        if "playlist/" in text:
+            text = text.split("playlist/", 1)[1]
+        elif text.startswith("spotify:playlist:"):
+            text = text.rsplit(":", 1)[1]
+        return text.split("?", 1)[0].strip("/")
+
+    def playlist_created(self, result, loading_label):
         """Handle playlist creation completion"""
         loading_label.destroy()
 
-        if playlist_id:
+        if result:
+            self.spotify_playlist_ids[self.query] = result.playlist_id
+            if result.complete:
+                message = "Playlist saved to Spotify successfully!"
+            else:
+                message = (f"Playlist saved, but only {result.present_count} "
+                           f"of {result.total_count} tracks were added.")
+
             success_label = ctk.CTkLabel(
                 self.main_frame,
-                text="Playlist created successfully!",
+                text=message,
                 font=("Helvetica", 12),
                 text_color=SPOTIFY_GREEN
             )
             success_label.pack(pady=10)
 
-            playlist_url = f"https://open.spotify.com/playlist/{playlist_id}"
+            playlist_url = (
+                f"https://open.spotify.com/playlist/{result.playlist_id}")
 
             view_button = ctk.CTkButton(
                 self.main_frame,
@@ -0,0 +1,96 @@
+from AsyncTrackSearcher import AsyncTrackSearcher
+from AsyncSearchTracksByGenre import AsyncSearchTracksByGenre
+from constants import ACTIVITY_GENRES
+from itertools import chain, zip_longest
+import asyncio
+import random
+import time
+
+
+def interleave_tracks(track_lists):
+    """Merge track lists round-robin so every list gets a fair share"""
+    return [
+        track
+        for track in chain.from_iterable(zip_longest(*track_lists))
+        if track is not None
+    ]
+
+
+class AsyncSearchTracksByActivity(AsyncTrackSearcher):
+    """Asyncio strategy for searching tracks by activity"""
+
+    def __init__(self, auth, client=None, cache=None, page_size=None):
+        super().__init__(auth, client, cache)
+        self.genre_searcher = AsyncSearchTracksByGenre(
+            auth, self.client, cache, page_size=page_size)
+
+    async def search_tracks(self, activity, num_tracks=20):
+        """Search for tracks by activity"""
+        if activity not in ACTIVITY_GENRES:
+            print(f"Error: Activity '{activity}' not recognized")
+            return []
+
+        started = time.perf_counter()
+        genres = ACTIVITY_GENRES[activity]
+        all_tracks = []
+        seen_keys = set()
+        checked = 0
+        discarded = 0
+        cursors = {
+            genre: self.genre_searcher.make_planner() for genre in genres
+        }
+
+        remainder = num_tracks % len(genres)
+
+        attempts = 0
+        max_attempts = 3
+
+        while len(all_tracks) < num_tracks and attempts < max_attempts:
+            active_genres = [
+                genre for genre in genres if not cursors[genre].finished
+            ]
+            if not active_genres:
+                break
+
+            remaining_tracks = num_tracks - len(all_tracks)
+            current_tracks_per_genre = remaining_tracks // len(genres)
+            target_tracks = current_tracks_per_genre + remainder + 10
+
+            genre_results = await self._fetch_genres(
+                active_genres, target_tracks, cursors)
+
+            for track in interleave_tracks(genre_results):
+                checked += 1
+                key = track.get_dedupe_key()
+                if key in seen_keys:
+                    discarded += 1
+                else:
+                    all_tracks.append(track)
+                    seen_keys.add(key)
+
+                    if len(all_tracks) >= num_tracks:
+                        break
+
+            attempts += 1
+
+            if len(all_tracks) < num_tracks:
+                print(f"Retrieved {len(all_tracks)} tracks, ")
+                print("attempting to fetch more...")
+
+        self._record_dedupe("merge", checked, discarded)
+        self._record_generation(
+            "activity", started,
+            sum(cursor.pages_recorded for cursor in cursors.values()))
+
+        random.shuffle(all_tracks)
+
+        return all_tracks[:num_tracks]
+
+    async def _fetch_genres(self, genres, target_tracks, cursors):
+        """Search all genres concurrently, returned in arrival order"""
+        tasks = [
+            self.genre_searcher.search_tracks(
+                genre, target_tracks, cursors[genre])
+            for genre in genres
+        ]
+        return [await task for task in asyncio.as_completed(tasks)]
@@ -0,0 +1,92 @@
+from AsyncTrackSearcher import AsyncTrackSearcher
+from constants import PAGE_FETCH_WORKERS
+from PaginationPlanner import PaginationPlanner
+import asyncio
+import time
+
+
+class AsyncSearchTracksByGenre(AsyncTrackSearcher):
+    """Asyncio strategy for searching tracks by genre"""
+
+    def __init__(self, auth, client=None, cache=None,
+                 max_workers=PAGE_FETCH_WORKERS, random_offsets=False,
+                 page_size=None):
+        super().__init__(auth, client, cache)
+        self.max_workers = max_workers
+        self.random_offsets = random_offsets
+        self.page_size = page_size
+
+    def make_planner(self):
+        """Return a fresh pagination planner for one genre query"""
+        return PaginationPlanner(
+            random_offsets=self.random_offsets, page_size=self.page_size)
+
+    async def search_tracks(self, genre, num_tracks=20, cursor=None):
+        """Search for tracks by genre, resuming from cursor when given"""
+        started = time.perf_counter()
+        planner = self.make_planner() if cursor is None else cursor
+        all_tracks = []
+        seen_keys = planner.seen_keys
+        checked = 0
+
+        while len(all_tracks) < num_tracks:
+            # Tracks an earlier call fetched but did not reach
+            while planner.held and len(all_tracks) < num_tracks:
+                track = planner.take_held()
+                checked += 1
+                key = track.get_dedupe_key()
+                if key not in seen_keys:
+                    all_tracks.append(track)
+                    seen_keys.add(key)
+                    planner.count_unique()
+            if len(all_tracks) >= num_tracks:
+                break
+
+            max_pages = None if self.max_workers > 1 else 1
+            pages = planner.plan(num_tracks - len(all_tracks), max_pages)
+            if not pages:
+                break
+
+            results = await self._fetch_pages(genre, pages)
+            for index, ((limit, offset), tracks) in enumerate(
+                    zip(pages, results)):
+                unique = 0
+                examined = 0
+                for track in tracks:
+                    examined += 1
+                    checked += 1
+                    key = track.get_dedupe_key()
+                    if key not in seen_keys:
+                        all_tracks.append(track)
+                        seen_keys.add(key)
+                        unique += 1
+
+                        if len(all_tracks) >= num_tracks:
+                            break
+
+                planner.record(limit, offset, len(tracks), unique)
+                planner.hold(tracks[examined:])
+                if len(all_tracks) >= num_tracks or planner.exhausted:
+                    # Keep the rest of the wave for a resumed cursor
+                    for page, rest in zip(pages[index + 1:],
+                                          results[index + 1:]):
+                        planner.record(*page, len(rest), 0)
+                        planner.hold(rest)
+                    break
+
+        self._record_dedupe("page", checked, checked - len(all_tracks))
+        if cursor is None:
+            self._record_generation("genre", started, planner.pages_recorded)
+        return all_tracks
+
+    async def _fetch_pages(self, genre, pages):
+        """Fetch result pages concurrently, returned in plan order"""
+        semaphore = asyncio.Semaphore(max(self.max_workers, 1))
+
+        async def fetch(limit, offset):
+            async with semaphore:
+                return await self._search_tracks_by_genre(
+                    genre, limit=limit, offset=offset)
+
+        return await asyncio.gather(
+            *(fetch(limit, offset) for limit, offset in pages))
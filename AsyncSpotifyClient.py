@@ -0,0 +1,111 @@
+from constants import (
+    SPOTIFY_API_URL, SPOTIFY_ACCOUNTS_URL,
+    HTTP_POOL_SIZE, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT
+)
+from RequestScheduler import RequestScheduler
+from ResponseDecoder import decode_json
+from Metrics import MetricsRegistry, endpoint_name
+import asyncio
+import time
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncResponse:
+    """Fully read HTTP response returned by AsyncSpotifyClient"""
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def json(self):
+        return decode_json(self.content)
+
+
+class AsyncSpotifyClient:
+    """Class wrapping a pooled non-blocking HTTP session for Spotify calls"""
+
+    def __init__(
+            self,
+            pool_size=HTTP_POOL_SIZE,
+            connect_timeout=HTTP_CONNECT_TIMEOUT,
+            read_timeout=HTTP_READ_TIMEOUT,
+            api_url=SPOTIFY_API_URL,
+            accounts_url=SPOTIFY_ACCOUNTS_URL,
+            scheduler=None,
+            metrics=None
+            ):
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.api_url = api_url
+        self.accounts_url = accounts_url
+        self.scheduler = scheduler or RequestScheduler()
+        self.metrics = metrics or MetricsRegistry()
+        self.session = None
+        self.loop = None
+
+    def _get_session(self):
+        """Return the session bound to the running event loop"""
+        if aiohttp is None:
+            raise RuntimeError(
+                "aiohttp is required for async searching: pip install aiohttp")
+
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self.loop is not loop:
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            timeout = aiohttp.ClientTimeout(
+                sock_connect=self.connect_timeout,
+                sock_read=self.read_timeout)
+            self.session = aiohttp.ClientSession(
+                connector=connector, timeout=timeout)
+            self.loop = loop
+        return self.session
+
+    async def request(self, method, url, **kwargs):
+        """Send a request through the shared session and scheduler"""
+        session = self._get_session()
+        endpoint = endpoint_name(url)
+
+        async def send():
+            start = time.perf_counter()
+            status = "error"
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    content = await response.read()
+                    status = response.status
+                    return AsyncResponse(
+                        response.status, response.headers, content)
+            finally:
+                self.metrics.observe(
+                    "spotify_request_duration_seconds",
+                    time.perf_counter() - start,
+                    method=method, endpoint=endpoint)
+                self.metrics.inc("spotify_requests_total", method=method,
+                                 endpoint=endpoint, status=status)
+
+        if method == "POST":
+            # Only repeat a POST that was throttled or never connected
+            return await self.scheduler.execute_async(
+                send, (aiohttp.ClientConnectorError,),
+                retry_server_errors=False)
+        return await self.scheduler.execute_async(
+            send, (aiohttp.ClientError, asyncio.TimeoutError))
+
+    async def get(self, url, **kwargs):
+        """Send a GET request through the shared session"""
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        """Send a POST request through the shared session"""
+        return await self.request("POST", url, **kwargs)
+
+    async def close(self):
+        """Close all pooled connections"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
@@ -0,0 +1,78 @@
+from AsyncSpotifyClient import AsyncSpotifyClient
+from Track import Track
+from ResponseDecoder import decode_search_page, extract_track_items
+import asyncio
+import time
+from abc import ABC, abstractmethod
+
+
+class AsyncTrackSearcher(ABC):
+    """Abstract base class for asyncio track searching strategies"""
+    def __init__(self, auth, client=None, cache=None):
+        self.auth = auth
+        self.client = client or AsyncSpotifyClient()
+        self.cache = cache
+
+    @abstractmethod
+    async def search_tracks(self, query, num_tracks=20):
+        """Abstract coroutine to search for tracks based on query"""
+        pass
+
+    @property
+    def metrics(self):
+        """Metrics registry shared with the HTTP client"""
+        return self.client.metrics
+
+    def _record_page(self, source, count):
+        """Count one served search page and its tracks"""
+        self.metrics.inc("search_pages_total", source=source)
+        self.metrics.inc("search_page_tracks_total", count, source=source)
+
+    def _record_dedupe(self, stage, checked, discarded):
+        """Count tracks checked and dropped by one dedupe pass"""
+        if checked:
+            self.metrics.inc("dedupe_tracks_total", checked, stage=stage)
+            self.metrics.inc("dedupe_discarded_total", discarded, stage=stage)
+
+    def _record_generation(self, strategy, started, pages):
+        """Record the time and pages one top-level search took"""
+        self.metrics.observe("generation_duration_seconds",
+                             time.perf_counter() - started, strategy=strategy)
+        self.metrics.observe("generation_pages", pages, strategy=strategy)
+
+    async def _get_auth_header(self):
+        """Return the authorization header without blocking the loop"""
+        if not self.auth.client_token.is_fresh():
+            return await asyncio.to_thread(self.auth.get_auth_header)
+        return self.auth.get_auth_header()
+
+    async def _search_tracks_by_genre(self, genre, limit=20, offset=0):
+        """Helper coroutine to search tracks by genre"""
+        cached = []
+        if self.cache is not None:
+            cached, done = self.cache.cached_range(genre, limit, offset)
+            if done:
+                self._record_page("cache", len(cached))
+                return [Track(item) for item in cached]
+            # Only request the part of the page the cache lacks
+            limit -= len(cached)
+            offset += len(cached)
+
+        url = f"{self.client.api_url}/search"
+        headers = await self._get_auth_header()
+        query = f"q=genre:{genre}&type=track&limit={limit}&offset={offset}"
+        url += f"?{query}"
+
+        result = await self.client.get(url, headers=headers)
+        json_result = decode_search_page(result.content)
+        items = extract_track_items(json_result)
+
+        if items is not None:
+            if self.cache is not None:
+                self.cache.store_range(genre, offset, items, limit)
+            self._record_page("network", len(items))
+            return [Track(item) for item in cached + items]
+        else:
+            print(f"Error: Could not retrieve tracks for genre '{genre}'.")
+            print(f"Response: {json_result}")
+            return []
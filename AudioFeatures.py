@@ -0,0 +1,69 @@
+from constants import AUDIO_FEATURES_BATCH_SIZE, AUDIO_FEATURES_WORKERS
+from ResponseDecoder import decode_json
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AudioFeatureFetcher:
+    """Class fetching audio features for many tracks in batched calls
+
+    Spotify has closed the audio-features endpoint to new applications.
+    The first 403 or 404 switches the fetcher off, so later generations
+    keep search order without spending a request on it.
+    """
+
+    def __init__(
+            self,
+            auth,
+            batch_size=AUDIO_FEATURES_BATCH_SIZE,
+            max_workers=AUDIO_FEATURES_WORKERS
+            ):
+        self.auth = auth
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.available = True
+
+    def fetch(self, track_ids):
+        """Return {track_id: audio features} for the ids Spotify knows"""
+        ids = list(dict.fromkeys(track_id for track_id in track_ids
+                                 if track_id))
+        if not self.available or not ids:
+            return {}
+
+        batches = [ids[start:start + self.batch_size]
+                   for start in range(0, len(ids), self.batch_size)]
+        if len(batches) == 1 or self.max_workers <= 1:
+            pages = [self._fetch_batch(batch) for batch in batches]
+        else:
+            workers = min(self.max_workers, len(batches))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pages = list(executor.map(self._fetch_batch, batches))
+
+        features = {}
+        for page in pages:
+            features.update(page)
+        return features
+
+    def _fetch_batch(self, ids):
+        """Fetch features for up to batch_size ids in one request"""
+        if not self.available:
+            return {}
+
+        response = self.auth.client.get(
+            f"{self.auth.client.api_url}/audio-features",
+            headers=self.auth.get_auth_header(),
+            params={"ids": ",".join(ids)})
+        if response.status_code in (403, 404):
+            self.available = False
+            print("Audio features unavailable, keeping search order")
+            return {}
+        if response.status_code != 200:
+            print(f"Error fetching audio features: {response.content}")
+            return {}
+
+        # Null fields are dropped so rankers can read features directly.
+        items = decode_json(response.content).get("audio_features") or []
+        return {
+            item["id"]: {name: value for name, value in item.items()
+                         if value is not None}
+            for item in items if item
+        }
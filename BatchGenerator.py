@@ -0,0 +1,119 @@
+from Playlist import Playlist
+from PlaylistFactory import make_search_strategy, generate_playlist
+from SearchCache import SearchCache
+from constants import BATCH_WORKERS, BATCH_CACHE_SIZE
+from concurrent.futures import ThreadPoolExecutor
+import csv
+import json
+import time
+
+
+class BatchJob:
+    """Class describing one playlist to generate in a batch run"""
+
+    def __init__(self, strategy, query, num_tracks):
+        self.strategy = strategy
+        self.query = query
+        self.num_tracks = num_tracks
+
+    @property
+    def name(self):
+        return f"{self.query} ({self.num_tracks})"
+
+    def __repr__(self):
+        return f"BatchJob({self.strategy!r}, {self.query!r}, {self.num_tracks})"
+
+
+class BatchResult:
+    """Class holding the playlist and timing of one finished job"""
+
+    def __init__(self, job, playlist, seconds, error=None):
+        self.job = job
+        self.playlist = playlist
+        self.seconds = seconds
+        self.error = error
+
+
+class BatchGenerator:
+    """Class generating many playlists in one run with shared page fetches"""
+
+    def __init__(
+            self,
+            auth,
+            cache=None,
+            catalog=None,
+            max_workers=BATCH_WORKERS,
+            audio_features=None
+            ):
+        self.auth = auth
+        self.cache = cache or SearchCache(max_entries=BATCH_CACHE_SIZE)
+        self.catalog = catalog
+        self.max_workers = max_workers
+        self.audio_features = audio_features
+
+    def make_searcher(self, strategy):
+        """Return a searcher sharing the batch's cache and catalog"""
+        return make_search_strategy(
+            strategy, self.auth, self.cache, self.catalog,
+            audio_features=self.audio_features)
+
+    def run_job(self, job):
+        """Generate one playlist, capturing its timing and any error"""
+        start = time.perf_counter()
+        try:
+            playlist = generate_playlist(
+                self.make_searcher(job.strategy), job.query,
+                job.num_tracks, job.name)
+        except Exception as error:
+            return BatchResult(job, Playlist(name=job.name),
+                               time.perf_counter() - start, error)
+        return BatchResult(job, playlist, time.perf_counter() - start)
+
+    def run(self, jobs):
+        """Run jobs on the worker pool, returning results in job order"""
+        if self.max_workers <= 1:
+            return [self.run_job(job) for job in jobs]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self.run_job, jobs))
+
+
+def result_to_dict(result):
+    """Return a JSON-ready description of a batch result"""
+    return {
+        "strategy": result.job.strategy,
+        "query": result.job.query,
+        "num_tracks": result.job.num_tracks,
+        "seconds": round(result.seconds, 4),
+        "error": str(result.error) if result.error else None,
+        "tracks": [track.to_dict() for track in result.playlist.tracks]
+    }
+
+
+def write_json(results, stream):
+    """Write every playlist with its timing as one JSON document"""
+    json.dump([result_to_dict(result) for result in results], stream,
+              indent=2)
+    stream.write("\n")
+
+
+def write_csv(results, stream):
+    """Write one CSV row per track, prefixed with its job"""
+    writer = csv.writer(stream)
+    writer.writerow(["strategy", "query", "num_tracks", "position",
+                     "id", "name", "artist", "uri"])
+    for result in results:
+        job = result.job
+        for position, track in enumerate(result.playlist.tracks, 1):
+            writer.writerow([job.strategy, job.query, job.num_tracks,
+                             position, track.id, track.name,
+                             track.main_artist, track.uri])
+
+
+def write_timings(results, stream):
+    """Write a per-job timing table"""
+    for result in results:
+        status = f"error: {result.error}" if result.error else "ok"
+        stream.write(f"{result.job.strategy:<9} {result.job.name:<24} "
+                     f"{len(result.playlist):>5} tracks "
+                     f"{result.seconds * 1000:9.1f} ms  {status}\n")
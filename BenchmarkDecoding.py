@@ -0,0 +1,58 @@
+from MockSpotifyServer import MockSpotifyServer
+from ResponseDecoder import decode_track_items, orjson
+from unittest.mock import patch
+import ResponseDecoder
+from Track import Track
+import json
+import time
+import tracemalloc
+
+
+def make_page(page_size=50):
+    """Serialize one search page with full Spotify track objects"""
+    server = MockSpotifyServer()
+    items = [server.make_track("rock", index) for index in range(page_size)]
+    return json.dumps({"tracks": {"items": items}}).encode("utf-8")
+
+
+def decode_stdlib(content):
+    json_result = json.loads(content)
+    return [Track(item) for item in json_result["tracks"]["items"]]
+
+
+def decode_selective(content):
+    return [Track(item) for item in decode_track_items(content)]
+
+
+def decode_selective_stdlib(content):
+    with patch.object(ResponseDecoder, "orjson", None):
+        return decode_selective(content)
+
+
+def measure(name, decode, content, repeats=200):
+    """Report mean decode time and peak memory for one page"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        decode(content)
+    elapsed = (time.perf_counter() - start) / repeats
+
+    tracemalloc.start()
+    decode(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:<22} {elapsed * 1000:7.3f} ms/page  "
+          f"peak {peak / 1024:8.1f} KiB")
+
+
+def main():
+    content = make_page()
+    print(f"page size {len(content) / 1024:.1f} KiB, "
+          f"backend {'orjson' if orjson else 'json'}")
+    measure("json.loads + Track", decode_stdlib, content)
+    measure("ResponseDecoder", decode_selective, content)
+    measure("ResponseDecoder (json)", decode_selective_stdlib, content)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+from Track import Track, normalize_title
+import random
+import time
+
+SUFFIXES = [
+    "", "", "", "", "", "", " - Remastered 2011", " (feat. Guest)",
+    " - Radio Edit", " [Live at Wembley]", " - Single Version", " (Remix)"
+]
+
+
+def make_items(num_tracks, seed=1):
+    """Build search items where some titles are versions of others"""
+    rng = random.Random(seed)
+    items = []
+    for index in range(num_tracks):
+        song = rng.randrange(num_tracks // 2)
+        artist = f"Artist {song % 500}"
+        items.append({
+            "id": f"id{index}",
+            "name": f"Song {song}{rng.choice(SUFFIXES)}",
+            "artists": [{"name": artist}],
+            "uri": f"spotify:track:{index}",
+            "album": {"name": "Album"}
+        })
+    return items
+
+
+def main(num_tracks=100000):
+    items = make_items(num_tracks)
+    names = [item["name"] for item in items]
+
+    start = time.perf_counter()
+    for name in names:
+        normalize_title(name)
+    per_title = (time.perf_counter() - start) / num_tracks * 1e6
+
+    start = time.perf_counter()
+    tracks = [Track(item) for item in items]
+    per_track = (time.perf_counter() - start) / num_tracks * 1e6
+
+    raw = len({track.get_signature() for track in tracks})
+    normalized = len({track.get_dedupe_key() for track in tracks})
+
+    print(f"{num_tracks} tracks")
+    print(f"normalize_title     {per_title:6.2f} us per title")
+    print(f"Track construction  {per_track:6.2f} us per track")
+    print(f"unique by signature {raw}")
+    print(f"unique by dedupe key {normalized}")
+
+
+if __name__ == "__main__":
+    main()
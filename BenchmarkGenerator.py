@@ -0,0 +1,131 @@
+from MockSpotifyServer import MockSpotifyServer
+from Playlist import Playlist
+from RequestScheduler import RequestScheduler
+from SpotifyAuth import SpotifyAuth
+from SpotifyClient import SpotifyClient
+from SpotifyPlaylistGenerator import SpotifyPlaylistGenerator
+import argparse
+import statistics
+import time
+
+SIZES = (20, 100, 1000)
+
+
+def percentiles(latencies):
+    """Return p50, p95 and p99 of latencies"""
+    if len(latencies) < 2:
+        return latencies * 3
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+
+def measure(server, auth, prepare, run, repeat):
+    """Time run(generator) on a fresh generator repeat times
+
+    Every repetition gets its own cache and catalog, so each one goes
+    to the server instead of replaying the previous run.
+    """
+    latencies = []
+    track_counts = []
+    requests_before = server.request_count
+    throttled_before = server.throttled_count
+
+    for _ in range(repeat):
+        generator = SpotifyPlaylistGenerator(auth=auth)
+        prepare(generator)
+        start = time.perf_counter()
+        track_counts.append(run(generator))
+        latencies.append((time.perf_counter() - start) * 1000)
+        generator.catalog.close()
+
+    return (latencies,
+            min(track_counts),
+            (server.request_count - requests_before) / repeat,
+            (server.throttled_count - throttled_before) / repeat)
+
+
+def report(name, size, latencies, track_count, requests, throttled):
+    p50, p95, p99 = percentiles(latencies)
+    print(f"{name:<10}{size:>6}{track_count:>8}{p50:>10.1f}{p95:>10.1f}"
+          f"{p99:>10.1f}{requests:>10.1f}{throttled:>8.1f}")
+
+
+def generate(strategy_type, query, size):
+    """Return prepare and run steps generating a playlist"""
+    def prepare(generator):
+        generator.set_strategy(strategy_type)
+
+    def run(generator):
+        return len(generator.generate_playlist(query, size))
+
+    return prepare, run
+
+
+def upload(tracks, size):
+    """Return prepare and run steps uploading size tracks"""
+    def prepare(generator):
+        generator.playlist = Playlist(name=f"Benchmark {size}")
+        generator.playlist.add_tracks(tracks[:size])
+
+    def run(generator):
+        result = generator.create_spotify_playlist("mock-user", "user-token")
+        return result.present_count
+
+    return prepare, run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time generation and upload against a mock Spotify API")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="base seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.03,
+                        help="extra random seconds per request, at most")
+    parser.add_argument("--throttle", type=float, default=0.02,
+                        help="share of requests answered with a 429")
+    parser.add_argument("--duplicates", type=float, default=0.2,
+                        help="share of search items that are re-releases")
+    parser.add_argument("--paced", action="store_true",
+                        help="use the production request rate limit")
+    args = parser.parse_args(argv)
+
+    server = MockSpotifyServer(
+        latency=args.latency, latency_jitter=args.jitter,
+        throttle_rate=args.throttle, duplicate_rate=args.duplicates,
+        total_tracks=5000, seed=1)
+    server.start()
+    scheduler = RequestScheduler() if args.paced \
+        else RequestScheduler(rate=None)
+    client = SpotifyClient(api_url=server.api_url, accounts_url=server.url,
+                           scheduler=scheduler)
+    auth = SpotifyAuth(client=client)
+
+    try:
+        auth.get_token()
+        pool = SpotifyPlaylistGenerator(auth=auth)
+        pool.set_strategy("activity")
+        tracks = pool.generate_playlist("Party", max(args.sizes)).tracks
+
+        print(f"{args.repeat} runs each, latencies in ms, "
+              f"requests and 429s per run")
+        print(f"{'':<10}{'size':>6}{'tracks':>8}{'p50':>10}{'p95':>10}"
+              f"{'p99':>10}{'requests':>10}{'429s':>8}")
+        scenarios = [
+            ("genre", lambda size: generate("genre", "rock", size)),
+            ("activity", lambda size: generate("activity", "Workout", size)),
+            ("upload", lambda size: upload(tracks, size)),
+        ]
+        for name, steps in scenarios:
+            for size in args.sizes:
+                prepare, run = steps(size)
+                report(name, size,
+                       *measure(server, auth, prepare, run, args.repeat))
+    finally:
+        client.close()
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+from MockSpotifyServer import MockSpotifyServer
+from RequestScheduler import RequestScheduler
+from SpotifyClient import SpotifyClient
+import requests
+import statistics
+import time
+
+
+def time_requests(send, url, num_requests):
+    """Return per-request latencies in milliseconds"""
+    latencies = []
+    for i in range(num_requests):
+        params = {"q": "genre:rock", "type": "track",
+                  "limit": 50, "offset": (i % 10) * 50}
+        start = time.perf_counter()
+        response = send(url, params=params)
+        response.content
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name, latencies, connections):
+    print(f"{name:<22} mean {statistics.mean(latencies):7.3f} ms  "
+          f"p50 {statistics.median(latencies):7.3f} ms  "
+          f"connections {connections}")
+
+
+def main(num_requests=500):
+    server = MockSpotifyServer()
+    server.start()
+    url = f"{server.api_url}/search"
+
+    try:
+        before = server.connection_count
+        latencies = time_requests(requests.get, url, num_requests)
+        report("requests.get", latencies, server.connection_count - before)
+
+        client = SpotifyClient(api_url=server.api_url,
+                               scheduler=RequestScheduler(rate=None))
+        before = server.connection_count
+        latencies = time_requests(client.get, url, num_requests)
+        report("SpotifyClient.get", latencies,
+               server.connection_count - before)
+        client.close()
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
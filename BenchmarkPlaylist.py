@@ -0,0 +1,82 @@
+from Playlist import Playlist
+from Track import Track
+import time
+
+
+class ListPlaylist:
+    """Previous Playlist layout: a plain list plus a signature set"""
+
+    def __init__(self):
+        self.tracks = []
+        self.seen_tracks = set()
+
+    def add_track(self, track):
+        signature = track.get_signature()
+        if signature not in self.seen_tracks:
+            self.tracks.append(track)
+            self.seen_tracks.add(signature)
+            return True
+        return False
+
+    def add_tracks(self, tracks):
+        added_count = 0
+        for track in tracks:
+            if self.add_track(track):
+                added_count += 1
+        return added_count
+
+    def get_track_uris(self):
+        return [track.uri for track in self.tracks if track.uri]
+
+    def get_by_uri(self, uri):
+        return next((track for track in self.tracks if track.uri == uri), None)
+
+    def remove_uri(self, uri):
+        track = self.get_by_uri(uri)
+        if track is None:
+            return False
+        self.tracks.remove(track)
+        self.seen_tracks.discard(track.get_signature())
+        return True
+
+
+def make_tracks(num_tracks):
+    """Build distinct tracks with a few duplicates mixed in"""
+    tracks = [
+        Track.from_fields(f"id{i}", f"Song {i}", (f"Artist {i % 500}",),
+                          f"spotify:track:{i}", "Album")
+        for i in range(num_tracks)
+    ]
+    return tracks + tracks[:num_tracks // 10]
+
+
+def timed(operation):
+    start = time.perf_counter()
+    operation()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(name, playlist, tracks, lookups, removals):
+    results = [
+        timed(lambda: playlist.add_tracks(tracks)),
+        timed(lambda: [playlist.get_track_uris() for _ in range(100)]),
+        timed(lambda: [playlist.get_by_uri(uri) for uri in lookups]),
+        timed(lambda: [playlist.remove_uri(uri) for uri in removals]),
+    ]
+    print(f"{name:<14}" + "".join(f"{value:12.1f}" for value in results))
+
+
+def main(num_tracks=100000):
+    tracks = make_tracks(num_tracks)
+    lookups = [f"spotify:track:{i}" for i in range(0, num_tracks, 100)]
+    removals = [f"spotify:track:{i}" for i in range(50, num_tracks, 100)]
+
+    print(f"{num_tracks} tracks, times in ms")
+    print(f"{'':<14}{'add_tracks':>12}{'100x uris':>12}"
+          f"{'1k lookups':>12}{'1k removals':>12}")
+    run("list + set", ListPlaylist(), tracks, lookups, removals)
+    run("Playlist", Playlist(), tracks, lookups, removals)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+from Track import Track
+from TrackRanker import TrackRanker
+from unittest.mock import patch
+import random
+import time
+
+
+def make_candidates(num_tracks):
+    """Build tracks with random audio features"""
+    rng = random.Random(1)
+    tracks = [Track.from_fields(f"id{i}", f"Song {i}", (f"Artist {i}",),
+                                f"spotify:track:{i}", "Album")
+              for i in range(num_tracks)]
+    features = {
+        track.id: {
+            "energy": rng.random(), "danceability": rng.random(),
+            "valence": rng.random(), "tempo": rng.uniform(60, 200)
+        }
+        for track in tracks
+    }
+    return tracks, features
+
+
+def timed(operation, repeat=20):
+    """Return the best time of repeat runs in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def main(num_tracks=10000, k=100):
+    tracks, features = make_candidates(num_tracks)
+    ranker = TrackRanker.for_activity("Workout")
+
+    def full_sort():
+        scores = ranker.scores(tracks, features)
+        order = sorted(range(len(tracks)), key=scores.__getitem__,
+                       reverse=True)
+        return [tracks[index] for index in order[:k]]
+
+    print(f"{num_tracks} candidates, top {k}, best of 20 runs in ms")
+    print(f"numpy top-k   {timed(lambda: ranker.top(tracks, features, k)):8.2f}")
+    with patch("TrackRanker.np", None):
+        print(f"python top-k  {timed(lambda: ranker.top(tracks, features, k)):8.2f}")
+        print(f"python sort   {timed(full_sort):8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+from MockSpotifyServer import MockSpotifyServer
+from Track import Track
+from TrackBatch import TrackBatch
+import json
+import time
+import tracemalloc
+
+
+class DictTrack:
+    """Previous Track layout with a per-instance __dict__ and artist list"""
+
+    def __init__(self, track_data):
+        self.id = track_data.get('id')
+        self.name = track_data.get('name')
+        self.artists = [
+            artist['name'] for artist in track_data.get('artists', [])
+        ]
+        self.main_artist = self.artists[0] if self.artists else "Unknown"
+        self.uri = track_data.get('uri')
+        self.album = track_data.get('album', {}).get('name', "Unknown Album")
+        self.popularity = track_data.get('popularity', 0)
+
+
+def make_pages(num_tracks, page_size=50):
+    """Serialize fake search pages the way they arrive over the network"""
+    server = MockSpotifyServer()
+    genres = ["rock", "pop", "jazz", "edm"]
+    pages = []
+    for start in range(0, num_tracks, page_size):
+        genre = genres[(start // page_size) % len(genres)]
+        items = [server.make_track(genre, index)
+                 for index in range(start, start + page_size)]
+        pages.append(json.dumps({"items": items}))
+    return pages
+
+
+def measure(name, build, pages):
+    """Report retained memory and build time for one layout"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(pages)
+    elapsed = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<12} {retained / 1024 / 1024:8.2f} MiB  "
+          f"{elapsed * 1000:8.1f} ms")
+    return result
+
+
+def build_dict_tracks(pages):
+    tracks = []
+    for page in pages:
+        tracks.extend(DictTrack(item) for item in json.loads(page)["items"])
+    return tracks
+
+
+def build_slot_tracks(pages):
+    tracks = []
+    for page in pages:
+        tracks.extend(Track(item) for item in json.loads(page)["items"])
+    return tracks
+
+
+def build_batch(pages):
+    batch = TrackBatch()
+    for page in pages:
+        batch.extend(json.loads(page)["items"])
+    return batch
+
+
+def main(num_tracks=100000):
+    pages = make_pages(num_tracks)
+    print(f"{num_tracks} tracks")
+    measure("dict Track", build_dict_tracks, pages)
+    measure("slots Track", build_slot_tracks, pages)
+    measure("TrackBatch", build_batch, pages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+from constants import METRICS_LATENCY_BUCKETS, METRICS_COUNT_BUCKETS
+from bisect import bisect_left
+import threading
+import urllib.parse
+
+# Path segments followed by an id that would blow up label cardinality
+ID_SEGMENTS = {"playlists", "users", "tracks", "artists", "albums",
+               "audio-features"}
+
+METRICS = {
+    "spotify_requests_total": (
+        "counter", "Spotify API responses by endpoint and status code"),
+    "spotify_request_duration_seconds": (
+        "histogram", "Spotify API request latency, per attempt"),
+    "search_pages_total": (
+        "counter", "Search result pages served, by source"),
+    "search_page_tracks_total": (
+        "counter", "Tracks contained in served search pages, by source"),
+    "dedupe_tracks_total": (
+        "counter", "Tracks checked against the dedupe keys seen so far"),
+    "dedupe_discarded_total": (
+        "counter", "Tracks dropped as duplicates"),
+    "generation_pages": (
+        "histogram", "Search pages fetched per generation"),
+    "generation_duration_seconds": (
+        "histogram", "Time to produce a generation's tracks"),
+    "upload_batch_duration_seconds": (
+        "histogram", "Playlist write latency per batch, including retries"),
+    "upload_duration_seconds": (
+        "histogram", "Time to upload or sync a whole playlist"),
+    "upload_tracks_total": (
+        "counter", "Tracks written to Spotify playlists"),
+    "hydrated_tracks_total": (
+        "counter", "Tracks hydrated by id, by memory or network source"),
+}
+
+COUNT_HISTOGRAMS = {"generation_pages"}
+
+
+def endpoint_name(url):
+    """Return the path of url with ids replaced, e.g. /v1/playlists/{id}"""
+    parts = urllib.parse.urlsplit(url).path.split("/")
+    for index in range(1, len(parts)):
+        if parts[index - 1] in ID_SEGMENTS and parts[index] \
+                and parts[index] not in ID_SEGMENTS:
+            parts[index] = "{id}"
+    return "/".join(parts)
+
+
+def label_key(labels):
+    """Return labels as a sorted tuple of string pairs"""
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def format_labels(labels):
+    """Render a label tuple in Prometheus text syntax"""
+    if not labels:
+        return ""
+    rendered = ",".join(
+        '{}="{}"'.format(name, value.replace("\\", "\\\\")
+                         .replace("\n", "\\n").replace('"', '\\"'))
+        for name, value in labels)
+    return "{" + rendered + "}"
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms, exportable for Prometheus"""
+
+    def __init__(
+            self,
+            latency_buckets=METRICS_LATENCY_BUCKETS,
+            count_buckets=METRICS_COUNT_BUCKETS
+            ):
+        self.latency_buckets = tuple(latency_buckets)
+        self.count_buckets = tuple(count_buckets)
+        self.counters = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def buckets(self, name):
+        """Return the upper bounds used for histogram name"""
+        if name in COUNT_HISTOGRAMS:
+            return self.count_buckets
+        return self.latency_buckets
+
+    def inc(self, name, value=1, **labels):
+        """Add value to the counter name with the given labels"""
+        key = label_key(labels)
+        with self.lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """Record value in the histogram name with the given labels"""
+        key = label_key(labels)
+        bounds = self.buckets(name)
+        index = bisect_left(bounds, value)
+        with self.lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = {
+                    "counts": [0] * (len(bounds) + 1), "sum": 0.0, "count": 0
+                }
+            histogram["counts"][index] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def counter(self, name, **labels):
+        """Return the value of one counter series, 0 if never incremented"""
+        key = label_key(labels)
+        with self.lock:
+            return self.counters.get(name, {}).get(key, 0)
+
+    def total(self, name):
+        """Return a counter summed over all its label values"""
+        with self.lock:
+            return sum(self.counters.get(name, {}).values())
+
+    def histogram(self, name, **labels):
+        """Return count, sum and cumulative buckets of one histogram series"""
+        key = label_key(labels)
+        with self.lock:
+            histogram = self.histograms.get(name, {}).get(key)
+            if histogram is None:
+                return {"count": 0, "sum": 0.0, "buckets": {}}
+            return self._summarize(name, histogram)
+
+    def ratio(self, numerator, denominator, **labels):
+        """Return counter numerator over counter denominator, or 0.0"""
+        below = self.counter(denominator, **labels)
+        return self.counter(numerator, **labels) / below if below else 0.0
+
+    def snapshot(self):
+        """Return every series as plain dicts keyed by metric name"""
+        with self.lock:
+            result = {}
+            for name, series in self.counters.items():
+                result[name] = [
+                    {"labels": dict(key), "value": value}
+                    for key, value in series.items()
+                ]
+            for name, series in self.histograms.items():
+                result[name] = [
+                    dict(self._summarize(name, histogram), labels=dict(key))
+                    for key, histogram in series.items()
+                ]
+            return result
+
+    def to_prometheus(self):
+        """Return every series in the Prometheus text exposition format"""
+        lines = []
+        with self.lock:
+            for name in sorted(set(self.counters) | set(self.histograms)):
+                kind, description = METRICS.get(
+                    name, ("histogram" if name in self.histograms
+                           else "counter", name))
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} {kind}")
+
+                for key, value in sorted(self.counters.get(name, {}).items()):
+                    lines.append(f"{name}{format_labels(key)} {value}")
+
+                for key, histogram in sorted(
+                        self.histograms.get(name, {}).items()):
+                    summary = self._summarize(name, histogram)
+                    for bound, count in summary["buckets"].items():
+                        labels = key + (("le", bound),)
+                        lines.append(
+                            f"{name}_bucket{format_labels(labels)} {count}")
+                    lines.append(f"{name}_sum{format_labels(key)} "
+                                 f"{summary['sum']}")
+                    lines.append(f"{name}_count{format_labels(key)} "
+                                 f"{summary['count']}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Drop every recorded series"""
+        with self.lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def _summarize(self, name, histogram):
+        """Turn raw bucket counts into cumulative counts keyed by bound"""
+        buckets = {}
+        cumulative = 0
+        bounds = [str(bound) for bound in self.buckets(name)] + ["+Inf"]
+        for bound, count in zip(bounds, histogram["counts"]):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"count": histogram["count"], "sum": histogram["sum"],
+                "buckets": buckets}
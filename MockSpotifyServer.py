@@ -0,0 +1,391 @@
+import http.server
+import json
+import random
+import threading
+import time
+import urllib.parse
+import zlib
+
+MARKETS = [first + second for first in "ABCDEFGHIJKLMN"
+           for second in "ABCDEFGHIJKLM"]
+
+
+class MockSpotifyServer:
+    """Local stand-in for the Spotify Web API used by tests and benchmarks"""
+
+    def __init__(
+            self,
+            port=0,
+            latency=0.0,
+            total_tracks=1000,
+            latency_jitter=0.0,
+            throttle_rate=0.0,
+            retry_after=0.05,
+            duplicate_rate=0.0,
+            seed=None
+            ):
+        self.port = port
+        self.latency = latency
+        self.total_tracks = total_tracks
+        self.latency_jitter = latency_jitter
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.duplicate_rate = duplicate_rate
+        self.audio_features_enabled = True
+        self.rng = random.Random(seed)
+        self.request_count = 0
+        self.throttled_count = 0
+        self.connection_count = 0
+        self.playlists = {}
+        self.snapshot_count = 0
+        self.lock = threading.Lock()
+        self.server = None
+        self.server_thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    @property
+    def api_url(self):
+        return f"{self.url}/v1"
+
+    def make_track(self, genre, index):
+        """Build a fake search item shaped like a real Spotify track"""
+        track_id = f"{genre}-{index}"
+        album_id = f"{genre}-album-{index % 31}"
+        artist = {
+            "id": f"{genre}-artist-{index % 97}",
+            "name": f"{genre.title()} Artist {index % 97}",
+            "type": "artist",
+            "uri": f"spotify:artist:{genre}-artist-{index % 97}",
+            "external_urls": {"spotify": "https://open.spotify.com/artist/x"}
+        }
+        return {
+            "id": track_id,
+            "name": f"{genre.title()} Track {index}",
+            "artists": [artist],
+            "uri": f"spotify:track:{track_id}",
+            "album": {
+                "id": album_id,
+                "name": f"{genre.title()} Album {index % 31}",
+                "album_type": "album",
+                "artists": [artist],
+                "available_markets": MARKETS,
+                "images": [
+                    {"url": f"https://i.scdn.co/image/{album_id}-{size}",
+                     "height": size, "width": size}
+                    for size in (640, 300, 64)
+                ],
+                "release_date": "2020-01-01",
+                "total_tracks": 12
+            },
+            "available_markets": MARKETS,
+            "disc_number": 1,
+            "duration_ms": 180000 + index,
+            "explicit": False,
+            "external_ids": {"isrc": f"XX{index:010d}"},
+            "external_urls": {
+                "spotify": f"https://open.spotify.com/track/{track_id}"
+            },
+            "href": f"https://api.spotify.com/v1/tracks/{track_id}",
+            "popularity": index % 100,
+            "preview_url": None,
+            "track_number": index % 12 + 1,
+            "type": "track"
+        }
+
+    def make_item(self, genre, index):
+        """Build a search item, re-releasing an earlier track at the set rate
+
+        Re-releases keep the title and artist of the original but get
+        their own id and album, like singles later collected on an album.
+        """
+        original = index // 2
+        if original and (index * 7919) % 1000 < self.duplicate_rate * 1000:
+            item = self.make_track(genre, original)
+            item["id"] = f"{genre}-{index}"
+            item["uri"] = f"spotify:track:{genre}-{index}"
+            item["album"] = dict(item["album"], id=f"{genre}-single-{index}",
+                                 name=f"{item['name']} - Single",
+                                 album_type="single")
+            return item
+        return self.make_track(genre, index)
+
+    def search(self, params):
+        """Return one page of fake search results"""
+        query = params.get("q", [""])[0]
+        genre = query.split("genre:", 1)[-1]
+        limit = int(params.get("limit", ["20"])[0])
+        offset = int(params.get("offset", ["0"])[0])
+        end = min(offset + limit, self.total_tracks)
+        items = [self.make_item(genre, i) for i in range(offset, end)]
+        return 200, {
+            "tracks": {
+                "items": items,
+                "limit": limit,
+                "offset": offset,
+                "total": self.total_tracks
+            }
+        }
+
+    def make_audio_features(self, track_id):
+        """Build stable fake audio features for a track id"""
+        seed = zlib.crc32(track_id.encode("utf-8"))
+        return {
+            "id": track_id,
+            "energy": (seed % 101) / 100,
+            "danceability": (seed // 101 % 101) / 100,
+            "valence": (seed // 10201 % 101) / 100,
+            "acousticness": (seed // 7 % 101) / 100,
+            "instrumentalness": (seed // 13 % 101) / 100,
+            "speechiness": (seed // 17 % 101) / 100,
+            "tempo": 60 + seed // 19 % 121,
+            "type": "audio_features",
+            "uri": f"spotify:track:{track_id}"
+        }
+
+    def tracks(self, params):
+        """Return full tracks for up to 50 ids, null for unknown ones"""
+        ids = params.get("ids", [""])[0].split(",")
+        if len(ids) > 50:
+            return self.error(400, "Too many ids requested")
+        items = []
+        for track_id in ids:
+            genre, _, index = track_id.rpartition("-")
+            items.append(self.make_track(genre, int(index))
+                         if genre and index.isdigit() else None)
+        return 200, {"tracks": items}
+
+    def audio_features(self, params):
+        """Return features for up to 100 ids, or 403 once deprecated"""
+        if not self.audio_features_enabled:
+            return self.error(403, "Forbidden")
+        ids = params.get("ids", [""])[0].split(",")
+        if len(ids) > 100:
+            return self.error(400, "Too many ids requested")
+        return 200, {
+            "audio_features": [self.make_audio_features(track_id)
+                               for track_id in ids]
+        }
+
+    def token(self):
+        """Return a fake client credentials token"""
+        return 200, {
+            "access_token": "mock-token",
+            "token_type": "Bearer",
+            "expires_in": 3600
+        }
+
+    def error(self, status, message):
+        """Return a Spotify-style error body"""
+        return status, {"error": {"status": status, "message": message}}
+
+    def next_snapshot(self):
+        """Return a new playlist snapshot id"""
+        self.snapshot_count += 1
+        return f"snapshot-{self.snapshot_count}"
+
+    def create_playlist(self, body):
+        """Create an empty fake playlist"""
+        with self.lock:
+            playlist_id = f"playlist{len(self.playlists) + 1}"
+            self.playlists[playlist_id] = []
+            return 201, {
+                "id": playlist_id,
+                "name": body.get("name"),
+                "snapshot_id": self.next_snapshot()
+            }
+
+    def add_playlist_items(self, playlist_id, body):
+        """Insert URIs, rejecting positions past the end like Spotify"""
+        with self.lock:
+            items = self.playlists[playlist_id]
+            uris = body.get("uris", [])
+            if len(uris) > 100:
+                return self.error(400, "Too many ids requested")
+            position = body.get("position", len(items))
+            if position > len(items):
+                return self.error(400, "Index out of bounds")
+            items[position:position] = uris
+            return 201, {"snapshot_id": self.next_snapshot()}
+
+    def reorder_playlist_items(self, playlist_id, body):
+        """Move a block of items using Spotify's reorder semantics"""
+        with self.lock:
+            items = self.playlists[playlist_id]
+            start = body.get("range_start", 0)
+            length = body.get("range_length", 1)
+            insert_before = body.get("insert_before", 0)
+            if start + length > len(items) or insert_before > len(items):
+                return self.error(400, "Index out of bounds")
+            block = items[start:start + length]
+            del items[start:start + length]
+            if insert_before > start:
+                insert_before -= length
+            items[insert_before:insert_before] = block
+            return 200, {"snapshot_id": self.next_snapshot()}
+
+    def replace_playlist_items(self, playlist_id, body):
+        """Replace every item of a fake playlist"""
+        with self.lock:
+            uris = body.get("uris", [])
+            if len(uris) > 100:
+                return self.error(400, "Too many ids requested")
+            self.playlists[playlist_id][:] = uris
+            return 200, {"snapshot_id": self.next_snapshot()}
+
+    def remove_playlist_items(self, playlist_id, body):
+        """Remove every occurrence of the given URIs"""
+        with self.lock:
+            uris = {track.get("uri") for track in body.get("tracks", [])}
+            if len(uris) > 100:
+                return self.error(400, "Too many ids requested")
+            if not all(isinstance(uri, str) for uri in uris):
+                return self.error(400, "Invalid track uri")
+            items = self.playlists[playlist_id]
+            items[:] = [uri for uri in items if uri not in uris]
+            return 200, {"snapshot_id": self.next_snapshot()}
+
+    def get_playlist_items(self, playlist_id, params):
+        """Return one page of a fake playlist's items"""
+        limit = int(params.get("limit", ["100"])[0])
+        offset = int(params.get("offset", ["0"])[0])
+        with self.lock:
+            items = self.playlists[playlist_id]
+            page = items[offset:offset + limit]
+            return 200, {
+                # None stands for an unavailable track, which Spotify
+                # lists with a null track
+                "items": [{"track": {"uri": uri} if uri else None}
+                          for uri in page],
+                "limit": limit,
+                "offset": offset,
+                "total": len(items)
+            }
+
+    def delay(self):
+        """Return the simulated network delay for one request"""
+        with self.lock:
+            return self.latency + self.rng.uniform(0, self.latency_jitter)
+
+    def throttled(self):
+        """Decide whether to answer this request with a 429"""
+        with self.lock:
+            if self.rng.random() < self.throttle_rate:
+                self.throttled_count += 1
+                return True
+            return False
+
+    def route(self, method, path, params, body):
+        """Dispatch a request to the matching fake endpoint"""
+        parts = path.strip("/").split("/")
+        if method == "GET" and path == "/v1/search":
+            return self.search(params)
+        if method == "POST" and path == "/api/token":
+            return self.token()
+        if method == "GET" and path == "/v1/tracks":
+            return self.tracks(params)
+        if method == "GET" and path == "/v1/audio-features":
+            return self.audio_features(params)
+        if method == "GET" and path == "/v1/me":
+            return 200, {"id": "mock-user"}
+        if method == "POST" and parts[:2] == ["v1", "users"] \
+                and parts[-1] == "playlists":
+            return self.create_playlist(body)
+        if parts[:2] == ["v1", "playlists"] and len(parts) == 4 \
+                and parts[3] == "tracks":
+            if parts[2] not in self.playlists:
+                return self.error(404, "Not found")
+            if method == "POST":
+                return self.add_playlist_items(parts[2], body)
+            if method == "GET":
+                return self.get_playlist_items(parts[2], params)
+            if method == "PUT" and "range_start" in body:
+                return self.reorder_playlist_items(parts[2], body)
+            if method == "PUT":
+                return self.replace_playlist_items(parts[2], body)
+            if method == "DELETE":
+                return self.remove_playlist_items(parts[2], body)
+        return self.error(404, "Not found")
+
+    def start(self):
+        """Start the server on a background thread"""
+        mock_self = self
+
+        class MockHandler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with mock_self.lock:
+                    mock_self.connection_count += 1
+
+            def handle_request(self, method):
+                parsed = urllib.parse.urlparse(self.path)
+                params = urllib.parse.parse_qs(parsed.query)
+                length = int(self.headers.get("Content-Length") or 0)
+                raw_body = self.rfile.read(length) if length else b""
+                body = {}
+                if raw_body.startswith(b"{"):
+                    body = json.loads(raw_body)
+
+                with mock_self.lock:
+                    mock_self.request_count += 1
+
+                delay = mock_self.delay()
+                if delay:
+                    time.sleep(delay)
+
+                headers = {}
+                if mock_self.throttled():
+                    status, response = mock_self.error(
+                        429, "API rate limit exceeded")
+                    headers["Retry-After"] = str(mock_self.retry_after)
+                else:
+                    status, response = mock_self.route(
+                        method, parsed.path, params, body)
+                content = json.dumps(response).encode("utf-8")
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def do_GET(self):
+                self.handle_request("GET")
+
+            def do_POST(self):
+                self.handle_request("POST")
+
+            def do_PUT(self):
+                self.handle_request("PUT")
+
+            def do_DELETE(self):
+                self.handle_request("DELETE")
+
+            def log_message(self, format, *args):
+                return
+
+        server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", self.port), MockHandler)
+        server.daemon_threads = True
+        server_thread = threading.Thread(target=server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+
+        self.server = server
+        self.server_thread = server_thread
+
+        return self.url
+
+    def stop(self):
+        """Shutdown the server"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
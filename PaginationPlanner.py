@@ -0,0 +1,143 @@
+from constants import (
+    SEARCH_PAGE_LIMIT, SEARCH_MAX_OFFSET, SEARCH_MAX_PAGES, SEARCH_MIN_YIELD
+)
+from collections import deque
+import math
+import random
+
+
+class PaginationPlanner:
+    """Class planning search pages for one query from the observed yield
+
+    A planner doubles as a resumable cursor: passing the same instance to
+    a later search continues after the pages and tracks it already saw.
+    Tracks fetched but not yet examined are held for that later search,
+    and planned pages that were never fetched are planned again.
+    """
+
+    def __init__(
+            self,
+            max_limit=SEARCH_PAGE_LIMIT,
+            max_offset=SEARCH_MAX_OFFSET,
+            max_pages=SEARCH_MAX_PAGES,
+            random_offsets=False,
+            rng=None,
+            page_size=None
+            ):
+        self.max_limit = max_limit
+        self.page_size = page_size
+        self.max_offset = max_offset
+        self.max_pages = max_pages
+        self.random_offsets = random_offsets
+        self.rng = rng or random.Random()
+
+        self.next_offset = 0
+        self.used_slots = set()
+        self.pages_planned = 0
+        self.pages_recorded = 0
+        self.received = 0
+        self.unique = 0
+        self.exhausted = False
+        self.seen_keys = set()
+        self.catalog_cursor = None
+        self.held = deque()
+        self.released = []
+
+    @property
+    def finished(self):
+        """Whether no further page can be planned"""
+        return self.exhausted or self.pages_planned >= self.max_pages
+
+    @property
+    def yield_ratio(self):
+        """Share of received tracks that survived dedupe so far"""
+        if not self.received:
+            return 1.0
+        return max(self.unique / self.received, SEARCH_MIN_YIELD)
+
+    def plan(self, remaining, max_pages=None):
+        """Return (limit, offset) pairs for the next wave of pages
+
+        The wave is sized so that, at the yield seen so far, it should
+        deliver the remaining tracks and no more.
+        """
+        if (self.exhausted and not self.released) or remaining <= 0:
+            return []
+
+        wanted = math.ceil(remaining / self.yield_ratio)
+        count = min(-(-wanted // self.max_limit),
+                    self.max_pages - self.pages_planned)
+        if max_pages is not None:
+            count = min(count, max_pages)
+
+        pages = []
+        for _ in range(count):
+            # Pages follow the request unless a fixed page size is set;
+            # the search cache serves any limit from its blocks.
+            page = self._take(self.page_size or min(self.max_limit, wanted))
+            if page is None:
+                self.exhausted = self.exhausted or not pages
+                break
+            pages.append(page)
+            wanted -= page[0]
+
+        self.pages_planned += len(pages)
+        return pages
+
+    def hold(self, tracks):
+        """Keep recorded tracks a search stopped before examining"""
+        self.held.extend(tracks)
+        self.received -= len(tracks)
+
+    def take_held(self):
+        """Return the next held track, counting it as received"""
+        self.received += 1
+        return self.held.popleft()
+
+    def count_unique(self, unique=1):
+        """Count held tracks that survived dedupe"""
+        self.unique += unique
+
+    def release(self, page):
+        """Give back a planned page whose fetch was cancelled"""
+        self.released.append(page)
+        self.pages_planned -= 1
+
+    def skip_to(self, offset):
+        """Start sequential paging at offset, past already known pages"""
+        self.next_offset = max(self.next_offset, offset)
+
+    def _take(self, limit):
+        """Reserve the next page of up to limit tracks, or None"""
+        while self.released:
+            page = self.released.pop(0)
+            if page[1] < self.max_offset:
+                return page
+        if self.exhausted:
+            return None
+        if self.random_offsets:
+            free = [slot for slot in range(0, self.max_offset, self.max_limit)
+                    if slot not in self.used_slots]
+            if not free:
+                return None
+            offset = self.rng.choice(free)
+            self.used_slots.add(offset)
+        else:
+            offset = self.next_offset
+            if offset >= self.max_offset:
+                return None
+
+        limit = min(limit, self.max_offset - offset)
+        self.next_offset = max(self.next_offset, offset + limit)
+        return limit, offset
+
+    def record(self, limit, offset, received, unique):
+        """Record a fetched page; a short page marks the end of results"""
+        self.pages_recorded += 1
+        self.received += received
+        self.unique += unique
+
+        if received < limit:
+            self.max_offset = min(self.max_offset, offset + received)
+            if not self.random_offsets:
+                self.exhausted = True
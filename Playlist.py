@@ -1,3 +1,7 @@
+from collections import OrderedDict
+from itertools import islice
+
+
 class Playlist:
     """Class representing a collection of tracks"""
 
@@ -8,34 +12,174 @@ class Playlist:
             ):
         self.name = name
         self.description = description
-        self.tracks = []
-        self.seen_tracks = set()
+        self._tracks = OrderedDict()
+        self._by_uri = None
+        self._by_id = None
+        self._track_list = None
+        self._uri_list = None
+
+    @property
+    def tracks(self):
+        """Tracks in playlist order, as a cached read-only list"""
+        if self._track_list is None:
+            self._track_list = list(self._tracks.values())
+        return self._track_list
+
+    @property
+    def seen_tracks(self):
+        """Dedupe keys of the tracks in the playlist"""
+        return self._tracks.keys()
+
+    def _changed(self):
+        """Drop the cached track and URI lists after a mutation"""
+        self._track_list = None
+        self._uri_list = None
+
+    def _build_indexes(self):
+        """Build the URI and id indexes on first lookup"""
+        if self._by_uri is None:
+            self._by_uri = {}
+            self._by_id = {}
+            for key, track in self._tracks.items():
+                self._index(key, track)
+
+    def _index(self, key, track):
+        if track.uri:
+            self._by_uri.setdefault(track.uri, key)
+        if track.id:
+            self._by_id.setdefault(track.id, key)
 
     def add_track(self, track):
         """Add a track to the playlist if it's not already there"""
-        signature = track.get_signature()
-        if signature not in self.seen_tracks:
-            self.tracks.append(track)
-            self.seen_tracks.add(signature)
+        key = track.get_dedupe_key()
+        if key not in self._tracks:
+            self._tracks[key] = track
+            if self._by_uri is not None:
+                self._index(key, track)
+            self._changed()
             return True
         return False
 
     def add_tracks(self, tracks):
         """Add multiple tracks to the playlist, avoiding duplicates"""
-        added_count = 0
-        for track in tracks:
-            if self.add_track(track):
-                added_count += 1
+        by_key = self._tracks
+        before = len(by_key)
+
+        if self._by_uri is None:
+            # setdefault keeps the first track per key in a single dict
+            # operation instead of a membership test plus an insert.
+            add = by_key.setdefault
+            for track in tracks:
+                add(track.get_dedupe_key(), track)
+        else:
+            for track in tracks:
+                key = track.get_dedupe_key()
+                if key not in by_key:
+                    by_key[key] = track
+                    self._index(key, track)
+
+        added_count = len(by_key) - before
+        if added_count:
+            self._changed()
         return added_count
 
+    def get_by_dedupe_key(self, key):
+        """Return the track with the given dedupe key, or None"""
+        return self._tracks.get(key)
+
+    def get_by_uri(self, uri):
+        """Return the track with the given Spotify URI, or None"""
+        self._build_indexes()
+        key = self._by_uri.get(uri)
+        return None if key is None else self._tracks[key]
+
+    def get_by_id(self, track_id):
+        """Return the track with the given Spotify id, or None"""
+        self._build_indexes()
+        key = self._by_id.get(track_id)
+        return None if key is None else self._tracks[key]
+
+    def remove_track(self, track):
+        """Remove a track from the playlist, returning whether it was there"""
+        return self._remove_key(track.get_dedupe_key())
+
+    def remove_uri(self, uri):
+        """Remove the track with the given URI"""
+        self._build_indexes()
+        key = self._by_uri.get(uri)
+        return key is not None and self._remove_key(key)
+
+    def remove_id(self, track_id):
+        """Remove the track with the given Spotify id"""
+        self._build_indexes()
+        key = self._by_id.get(track_id)
+        return key is not None and self._remove_key(key)
+
+    def _remove_key(self, key):
+        track = self._tracks.pop(key, None)
+        if track is None:
+            return False
+        if self._by_uri is not None:
+            if self._by_uri.get(track.uri) == key:
+                del self._by_uri[track.uri]
+            if self._by_id.get(track.id) == key:
+                del self._by_id[track.id]
+        self._changed()
+        return True
+
+    def move_to_end(self, track, last=True):
+        """Move a track to the end, or to the start when last is False"""
+        self._tracks.move_to_end(track.get_dedupe_key(), last=last)
+        self._changed()
+
+    def move(self, track, index):
+        """Move a track so it ends up at position index"""
+        moved = track.get_dedupe_key()
+        if moved not in self._tracks:
+            raise KeyError(moved)
+
+        count = len(self._tracks) - 1
+        index = max(0, min(index, count))
+        # Only rotate whichever side of index is shorter.
+        if index >= count // 2:
+            others = (key for key in reversed(self._tracks) if key != moved)
+            tail = list(islice(others, count - index))
+            self._tracks.move_to_end(moved)
+            for key in reversed(tail):
+                self._tracks.move_to_end(key)
+        else:
+            others = (key for key in self._tracks if key != moved)
+            head = list(islice(others, index))
+            self._tracks.move_to_end(moved, last=False)
+            for key in reversed(head):
+                self._tracks.move_to_end(key, last=False)
+        self._changed()
+
+    def reorder(self, key):
+        """Sort the playlist in place by key(track)"""
+        ordered = sorted(self._tracks.items(), key=lambda item: key(item[1]))
+        self._tracks = OrderedDict(ordered)
+        self._changed()
+
     def clear(self):
         """Clear all tracks from the playlist"""
-        self.tracks = []
-        self.seen_tracks.clear()
+        self._tracks.clear()
+        self._by_uri = None
+        self._by_id = None
+        self._changed()
 
     def get_track_uris(self):
         """Return list of Spotify URIs for all tracks in the playlist"""
-        return [track.uri for track in self.tracks if track.uri]
+        if self._uri_list is None:
+            self._uri_list = [
+                track.uri for track in self._tracks.values() if track.uri]
+        return self._uri_list
+
+    def __contains__(self, track):
+        return track.get_dedupe_key() in self._tracks
+
+    def __iter__(self):
+        return iter(self._tracks.values())
 
     def __len__(self):
-        return len(self.tracks)
+        return len(self._tracks)
@@ -0,0 +1,34 @@
+from Playlist import Playlist
+from SearchTracksByGenre import SearchTracksByGenre
+from SearchTracksByActivity import SearchTracksByActivity
+
+
+def make_search_strategy(
+        strategy_type, auth, cache=None, catalog=None, page_size=None,
+        audio_features=None):
+    """Return a new search strategy of the given type"""
+    if strategy_type == "genre":
+        return SearchTracksByGenre(
+            auth, cache, catalog=catalog, page_size=page_size)
+    if strategy_type == "activity":
+        return SearchTracksByActivity(
+            auth, cache, catalog, page_size, audio_features)
+    raise ValueError(f"Unknown strategy type: {strategy_type}")
+
+
+def generate_playlist(strategy, query, num_tracks=20, name=None):
+    """Generate a new playlist with strategy without touching shared state
+
+    Strategies keep no per-search state, so one instance can serve many
+    concurrent calls.
+    """
+    playlist = Playlist() if name is None else Playlist(name=name)
+    playlist.add_tracks(strategy.search_tracks(query, num_tracks))
+    return playlist
+
+
+def playlist_from_uris(hydrator, uris, name=None):
+    """Rebuild a playlist from stored track URIs, keeping their order"""
+    playlist = Playlist() if name is None else Playlist(name=name)
+    playlist.add_tracks(hydrator.tracks_for_uris(uris))
+    return playlist
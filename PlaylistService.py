@@ -0,0 +1,235 @@
+from PlaylistFactory import make_search_strategy, generate_playlist
+from PlaylistUploader import PlaylistUploader
+from SearchCache import SearchCache
+from ResponseDecoder import decode_json
+from constants import (
+    SERVICE_HOST, SERVICE_PORT, SERVICE_MAX_USERS, SERVICE_MAX_TRACKS,
+    BATCH_CACHE_SIZE
+)
+from collections import OrderedDict
+import http.server
+import json
+import socket
+import threading
+import urllib.parse
+
+
+class UserContext:
+    """Per-user Spotify state held by the service"""
+
+    def __init__(self, access_token):
+        self.access_token = access_token
+        self.user_id = None
+        self.lock = threading.Lock()
+
+
+class PlaylistService:
+    """Local HTTP service generating and uploading playlists for many users
+
+    Searches run on the shared client-credentials auth. Uploads use the
+    access token each request carries, so no user state lives on the
+    generator and one process can serve any number of users.
+    """
+
+    def __init__(
+            self,
+            auth,
+            cache=None,
+            catalog=None,
+            host=SERVICE_HOST,
+            port=SERVICE_PORT,
+            reuse_port=False,
+            max_users=SERVICE_MAX_USERS,
+            audio_features=None
+            ):
+        self.auth = auth
+        self.cache = cache or SearchCache(max_entries=BATCH_CACHE_SIZE)
+        self.strategies = {
+            strategy_type: make_search_strategy(
+                strategy_type, auth, self.cache, catalog,
+                audio_features=audio_features)
+            for strategy_type in ("genre", "activity")
+        }
+        self.host = host
+        self.port = port
+        self.reuse_port = reuse_port
+        self.max_users = max_users
+        self.users = OrderedDict()
+        self.lock = threading.Lock()
+        self.server = None
+        self.server_thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.server.server_address[1]}"
+
+    def user_context(self, access_token):
+        """Return the context for access_token, keeping recent users"""
+        with self.lock:
+            context = self.users.get(access_token)
+            if context is None:
+                context = self.users[access_token] = UserContext(access_token)
+            self.users.move_to_end(access_token)
+            while len(self.users) > self.max_users:
+                self.users.popitem(last=False)
+            return context
+
+    def user_id(self, context):
+        """Look up and remember the Spotify user id behind a context"""
+        with context.lock:
+            if context.user_id is None:
+                response = self.auth.client.get(
+                    f"{self.auth.client.api_url}/me",
+                    headers={
+                        "Authorization": f"Bearer {context.access_token}"
+                    })
+                if response.status_code == 200:
+                    context.user_id = decode_json(response.content).get("id")
+            return context.user_id
+
+    def generate(self, body):
+        """Handle POST /generate"""
+        strategy = body.get("strategy")
+        strategy = self.strategies.get(strategy) \
+            if isinstance(strategy, str) else None
+        query = body.get("query")
+        name = body.get("name")
+        num_tracks = body.get("num_tracks", 20)
+        if strategy is None or not isinstance(query, str) or not query:
+            return 400, {"error": "strategy must be genre or activity "
+                                  "and query must be a non-empty string"}
+        if name is not None and not isinstance(name, str):
+            return 400, {"error": "name must be a string"}
+        if not isinstance(num_tracks, int) \
+                or not 0 < num_tracks <= SERVICE_MAX_TRACKS:
+            return 400, {"error": "num_tracks must be between 1 and "
+                                  f"{SERVICE_MAX_TRACKS}"}
+
+        playlist = generate_playlist(
+            strategy, query, num_tracks, name or query)
+        return 200, {
+            "name": playlist.name,
+            "tracks": [track.to_dict() for track in playlist.tracks]
+        }
+
+    def upload(self, access_token, body):
+        """Handle POST /playlists for the user owning access_token"""
+        uris = body.get("uris")
+        if not isinstance(uris, list) or not uris:
+            return 400, {"error": "uris must be a non-empty list"}
+
+        context = self.user_context(access_token)
+        uploader = PlaylistUploader(self.auth.client, access_token)
+
+        if body.get("playlist_id"):
+            result = uploader.sync(body["playlist_id"], uris)
+        else:
+            user_id = self.user_id(context)
+            if user_id is None:
+                return 401, {"error": "access token was rejected"}
+            playlist_id = uploader.create_playlist(
+                user_id, body.get("name", "My Playlist"),
+                body.get("description",
+                         "Generated with Spotify Playlist Generator"))
+            result = None
+            if playlist_id is not None:
+                result = uploader.upload(playlist_id, uris)
+
+        if result is None:
+            return 502, {"error": "Spotify rejected the upload"}
+        return 200, {
+            "playlist_id": result.playlist_id,
+            "snapshot_id": result.snapshot_id,
+            "added_count": result.added_count,
+            "total_count": result.total_count,
+            "complete": result.complete
+        }
+
+    def route(self, method, path, headers, body):
+        """Dispatch a request to the matching endpoint"""
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok", "users": len(self.users)}
+        if method == "GET" and path == "/metrics":
+            return 200, self.auth.client.metrics.to_prometheus()
+        if method == "POST" and path == "/generate":
+            return self.generate(body)
+        if method == "POST" and path == "/playlists":
+            authorization = headers.get("Authorization", "")
+            if not authorization.startswith("Bearer "):
+                return 401, {"error": "Bearer token required"}
+            return self.upload(authorization[len("Bearer "):], body)
+        return 404, {"error": "Not found"}
+
+    def start(self):
+        """Start serving on a background thread"""
+        service = self
+
+        class ServiceHandler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def handle_request(self, method):
+                parsed = urllib.parse.urlparse(self.path)
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                    if length < 0:
+                        raise ValueError("invalid Content-Length")
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                    if not isinstance(body, dict):
+                        raise ValueError("body must be a JSON object")
+                    status, response = service.route(
+                        method, parsed.path, self.headers, body)
+                except ValueError as error:
+                    # The body may be left unread, so drop the connection
+                    self.close_connection = True
+                    status, response = 400, {"error": str(error)}
+                except Exception as error:
+                    status, response = 500, {"error": str(error)}
+
+                if isinstance(response, str):
+                    content = response.encode("utf-8")
+                    content_type = "text/plain; version=0.0.4"
+                else:
+                    content = json.dumps(response).encode("utf-8")
+                    content_type = "application/json"
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def do_GET(self):
+                self.handle_request("GET")
+
+            def do_POST(self):
+                self.handle_request("POST")
+
+            def log_message(self, format, *args):
+                return
+
+        class ServiceServer(http.server.ThreadingHTTPServer):
+            daemon_threads = True
+
+            def server_bind(self):
+                # Lets one process per core share the port.
+                if service.reuse_port and hasattr(socket, "SO_REUSEPORT"):
+                    self.socket.setsockopt(
+                        socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+                super().server_bind()
+
+        server = ServiceServer((self.host, self.port), ServiceHandler)
+        server_thread = threading.Thread(target=server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+
+        self.server = server
+        self.server_thread = server_thread
+
+        return self.url
+
+    def stop(self):
+        """Shutdown the server"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -0,0 +1,470 @@
+from constants import (
+    UPLOAD_BATCH_SIZE, UPLOAD_WORKERS, UPLOAD_REORDER_ATTEMPTS,
+    PLAYLIST_PAGE_SIZE
+)
+from ResponseDecoder import decode_json
+from bisect import bisect_left, insort
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import json
+import time
+
+
+def longest_increasing_subsequence(values):
+    """Return the set of values forming a longest increasing subsequence"""
+    tails = []
+    tail_indices = []
+    previous = [None] * len(values)
+
+    for index, value in enumerate(values):
+        position = bisect_left(tails, value)
+        if position > 0:
+            previous[index] = tail_indices[position - 1]
+        if position == len(tails):
+            tails.append(value)
+            tail_indices.append(index)
+        else:
+            tails[position] = value
+            tail_indices[position] = index
+
+    result = set()
+    index = tail_indices[-1] if tail_indices else None
+    while index is not None:
+        result.add(values[index])
+        index = previous[index]
+    return result
+
+
+def plan_moves(order, sizes=None):
+    """Return the fewest block moves that sort order ascending
+
+    order lists target ranks in their current sequence and sizes maps a
+    rank to the number of playlist items it spans (default 1). Each move
+    is a (range_start, range_length, insert_before) tuple in Spotify's
+    reorder semantics, applied one after another.
+    """
+    sizes = sizes or {}
+    placed = sorted(longest_increasing_subsequence(order))
+    current = list(order)
+    moves = []
+
+    def offset_of(rank):
+        index = current.index(rank)
+        return index, sum(sizes.get(other, 1) for other in current[:index])
+
+    for rank in sorted(set(order) - set(placed)):
+        index, range_start = offset_of(rank)
+        successor = bisect_left(placed, rank)
+        if successor < len(placed):
+            _, insert_before = offset_of(placed[successor])
+        else:
+            insert_before = sum(sizes.get(other, 1) for other in current)
+        moves.append((range_start, sizes.get(rank, 1), insert_before))
+
+        current.pop(index)
+        if successor < len(placed):
+            current.insert(current.index(placed[successor]), rank)
+        else:
+            current.append(rank)
+        insort(placed, rank)
+
+    return moves
+
+
+class UploadResult:
+    """Outcome of uploading tracks to a Spotify playlist
+
+    ordered is False when the tracks could not be verified or moved into
+    their intended order, in which case the upload is not complete.
+    """
+
+    def __init__(self, playlist_id, snapshot_id, added_count, total_count,
+                 ordered=True):
+        self.playlist_id = playlist_id
+        self.snapshot_id = snapshot_id
+        self.added_count = added_count
+        self.total_count = total_count
+        self.ordered = ordered
+
+    @property
+    def present_count(self):
+        return self.added_count
+
+    @property
+    def complete(self):
+        return self.ordered and self.present_count == self.total_count
+
+    def __repr__(self):
+        return (f"UploadResult({self.playlist_id!r}, "
+                f"{self.added_count}/{self.total_count} added, "
+                f"snapshot {self.snapshot_id!r})")
+
+
+class SyncResult(UploadResult):
+    """Outcome of syncing an existing Spotify playlist to new tracks"""
+
+    def __init__(
+            self,
+            playlist_id,
+            snapshot_id,
+            added_count,
+            total_count,
+            kept_count=0,
+            removed_count=0,
+            moved_count=0,
+            replaced=False,
+            ordered=True
+            ):
+        super().__init__(playlist_id, snapshot_id, added_count, total_count,
+                         ordered)
+        self.kept_count = kept_count
+        self.removed_count = removed_count
+        self.moved_count = moved_count
+        self.replaced = replaced
+
+    @property
+    def present_count(self):
+        return self.kept_count + self.added_count
+
+    def __repr__(self):
+        return (f"SyncResult({self.playlist_id!r}, "
+                f"{self.kept_count} kept, {self.removed_count} removed, "
+                f"{self.moved_count} moved, {self.added_count} added, "
+                f"snapshot {self.snapshot_id!r})")
+
+
+class PlaylistUploader:
+    """Class uploading track URIs to a playlist in overlapping batches"""
+
+    def __init__(
+            self,
+            client,
+            access_token,
+            batch_size=UPLOAD_BATCH_SIZE,
+            max_workers=UPLOAD_WORKERS
+            ):
+        self.client = client
+        self.headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json"
+        }
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+
+    def create_playlist(self, user_id, name, description, public=True):
+        """Create an empty playlist for user_id and return its id"""
+        data = json.dumps({
+            "name": name,
+            "description": description,
+            "public": public
+        })
+        response = self.client.post(
+            f"{self.client.api_url}/users/{user_id}/playlists",
+            headers=self.headers, data=data)
+        playlist_data = decode_json(response.content)
+
+        if "id" not in playlist_data:
+            print(f"Error creating playlist: {playlist_data}")
+            return None
+        return playlist_data["id"]
+
+    def upload(self, playlist_id, track_uris):
+        """Append track_uris to an empty playlist, keeping their order"""
+        started = time.perf_counter()
+        result = self._upload(playlist_id, track_uris)
+        self._record("upload", started, result)
+        return result
+
+    def _upload(self, playlist_id, track_uris):
+        tracks_url = f"{self.client.api_url}/playlists/{playlist_id}/tracks"
+        batches = [
+            track_uris[start:start + self.batch_size]
+            for start in range(0, len(track_uris), self.batch_size)
+        ]
+
+        # Spotify rejects positions past the current end, so positioned
+        # inserts cannot overlap. Append concurrently instead, then read
+        # the playlist back and move any batch that landed out of order.
+        snapshots = self._map(
+            lambda batch: self._append(tracks_url, batch), batches)
+        landed = [index for index, snapshot in enumerate(snapshots)
+                  if snapshot is not None]
+        snapshot_id = next(
+            (snapshot for snapshot in reversed(snapshots) if snapshot), None)
+
+        ordered = True
+        if len(landed) > 1 and self.max_workers > 1:
+            ordered, snapshot_id = self._restore_order(
+                tracks_url, batches, landed, snapshot_id)
+
+        added_count = sum(len(batches[index]) for index in landed)
+        return UploadResult(
+            playlist_id, snapshot_id, added_count, len(track_uris), ordered)
+
+    def _restore_order(self, tracks_url, batches, landed, snapshot_id):
+        """Move landed batches back into order; return (ordered, snapshot)
+
+        A failed move may still have been applied by Spotify, so instead
+        of continuing, the playlist is read back and the remaining moves
+        are planned again from what is actually there.
+        """
+        for _ in range(UPLOAD_REORDER_ATTEMPTS):
+            order = self._landed_order(tracks_url, batches, landed)
+            if order is None:
+                print("Error verifying uploaded track order")
+                return False, snapshot_id
+
+            sizes = {index: len(batches[index]) for index in order}
+            for range_start, range_length, insert_before in plan_moves(
+                    order, sizes):
+                moved = self._reorder(
+                    tracks_url, range_start, range_length, insert_before)
+                if moved is None:
+                    break
+                snapshot_id = moved or snapshot_id
+            else:
+                return True, snapshot_id
+        return False, snapshot_id
+
+    def sync(self, playlist_id, track_uris):
+        """Make an existing playlist hold track_uris with the fewest writes
+
+        The current items are read once. Stale URIs are removed, kept
+        tracks are moved into the new relative order and missing tracks
+        are inserted at their final positions. When that would take more
+        calls than rewriting the playlist, or a move fails part way, it is
+        replaced instead. Unavailable items have no URI to remove them by,
+        so a playlist holding any is replaced as well.
+        """
+        started = time.perf_counter()
+        result = self._sync(playlist_id, track_uris)
+        self._record("sync", started, result)
+        return result
+
+    def _sync(self, playlist_id, track_uris):
+        tracks_url = f"{self.client.api_url}/playlists/{playlist_id}/tracks"
+        current = self._read_all(tracks_url)
+        if current is None:
+            print(f"Error reading playlist {playlist_id}")
+            return None
+
+        target_index = {}
+        for index, uri in enumerate(track_uris):
+            target_index.setdefault(uri, index)
+
+        # Spotify removes every occurrence of a URI, so duplicated URIs are
+        # removed outright and inserted again where the target needs them.
+        counts = Counter(current)
+        unavailable = counts.pop(None, 0)
+        stale = [uri for uri in counts
+                 if uri not in target_index or counts[uri] > 1]
+        stale_set = set(stale)
+        kept = [uri for uri in current
+                if uri is not None and uri not in stale_set]
+        kept_set = set(kept)
+
+        moves = plan_moves([target_index[uri] for uri in kept])
+        runs = self._missing_runs(
+            [index for index, uri in enumerate(track_uris)
+             if uri not in kept_set])
+
+        diff_calls = (-(-len(stale) // self.batch_size)
+                      + len(moves) + len(runs))
+        replace_calls = 1 + -(-len(track_uris) // self.batch_size)
+        if unavailable or (current and diff_calls > replace_calls):
+            return self._replace(playlist_id, tracks_url, track_uris,
+                                 len(stale_set) + unavailable)
+
+        snapshot_id = None
+        removed_count = 0
+        for start in range(0, len(stale), self.batch_size):
+            batch = stale[start:start + self.batch_size]
+            removed = self._remove(tracks_url, batch)
+            if removed is None:
+                return None
+            snapshot_id = removed or snapshot_id
+            removed_count += len(batch)
+
+        for range_start, range_length, insert_before in moves:
+            moved = self._reorder(
+                tracks_url, range_start, range_length, insert_before)
+            if moved is None:
+                # The move may or may not have landed, and the remaining
+                # moves and inserts assume it did.
+                return self._replace(playlist_id, tracks_url, track_uris,
+                                     len(stale_set))
+            snapshot_id = moved or snapshot_id
+
+        added_count = 0
+        for position, length in runs:
+            uris = track_uris[position:position + length]
+            added = self._append(tracks_url, uris, position)
+            if added is None:
+                break
+            snapshot_id = added or snapshot_id
+            added_count += length
+
+        return SyncResult(
+            playlist_id, snapshot_id, added_count, len(track_uris),
+            kept_count=len(kept), removed_count=removed_count,
+            moved_count=len(moves))
+
+    def _missing_runs(self, indices):
+        """Group sorted target indices into (position, length) inserts"""
+        runs = []
+        for index in indices:
+            if runs and runs[-1][0] + runs[-1][1] == index \
+                    and runs[-1][1] < self.batch_size:
+                runs[-1][1] += 1
+            else:
+                runs.append([index, 1])
+        return [tuple(run) for run in runs]
+
+    def _replace(self, playlist_id, tracks_url, track_uris, removed_count):
+        """Clear the playlist and upload track_uris from scratch"""
+        response = self.client.put(
+            tracks_url, headers=self.headers, data=json.dumps({"uris": []}))
+        if not 200 <= response.status_code < 300:
+            print(f"Error clearing playlist: {response.content}")
+            return None
+
+        result = self._upload(playlist_id, track_uris)
+        return SyncResult(
+            playlist_id, result.snapshot_id, result.added_count,
+            result.total_count, removed_count=removed_count, replaced=True,
+            ordered=result.ordered)
+
+    def _record(self, operation, started, result):
+        """Record the duration and written tracks of an upload or sync"""
+        metrics = self.client.metrics
+        metrics.observe("upload_duration_seconds",
+                        time.perf_counter() - started, operation=operation)
+        if result is not None:
+            metrics.inc("upload_tracks_total", result.added_count,
+                        operation=operation)
+
+    def _record_batch(self, operation, started):
+        """Record the time one playlist write took, retries included"""
+        self.client.metrics.observe(
+            "upload_batch_duration_seconds", time.perf_counter() - started,
+            operation=operation)
+
+    def _map(self, function, items):
+        """Run function over items on the worker pool, keeping order"""
+        if len(items) <= 1 or self.max_workers <= 1:
+            return [function(item) for item in items]
+
+        workers = min(self.max_workers, len(items))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(function, items))
+
+    def _append(self, tracks_url, uris, position=None):
+        """Add one batch; return its snapshot_id, or None if it failed
+
+        The batch is posted once. The client already retries 429s and
+        connections that never reached Spotify, and posting again after
+        any other failure could add the tracks twice.
+        """
+        body = {"uris": uris}
+        if position is not None:
+            body["position"] = position
+        started = time.perf_counter()
+        response = self.client.post(
+            tracks_url, headers=self.headers, data=json.dumps(body))
+        self._record_batch("add", started)
+        if 200 <= response.status_code < 300:
+            return decode_json(response.content).get("snapshot_id", "")
+
+        print(f"Error adding {len(uris)} tracks: {response.content}")
+        return None
+
+    def _landed_order(self, tracks_url, batches, landed):
+        """Read the playlist back and return batch indices as they landed"""
+        uris = self._read_all(tracks_url)
+        if uris is None:
+            return None
+
+        starts = {}
+        for index in landed:
+            starts.setdefault(batches[index][0], []).append(index)
+
+        order = []
+        position = 0
+        while position < len(uris):
+            for index in starts.get(uris[position], []):
+                batch = batches[index]
+                if uris[position:position + len(batch)] == batch:
+                    starts[uris[position]].remove(index)
+                    order.append(index)
+                    position += len(batch)
+                    break
+            else:
+                return None
+        return order
+
+    def _read_all(self, tracks_url):
+        """Return every URI in the playlist, reading pages in parallel"""
+        first = self._read_page(tracks_url, 0)
+        if first is None:
+            return None
+        uris, total = first
+
+        offsets = range(PLAYLIST_PAGE_SIZE, total, PLAYLIST_PAGE_SIZE)
+        pages = self._map(
+            lambda offset: self._read_page(tracks_url, offset), offsets)
+        if any(page is None for page in pages):
+            return None
+        for page_uris, _ in pages:
+            uris.extend(page_uris)
+        return uris
+
+    def _read_page(self, tracks_url, offset):
+        """Return the URIs of one page of playlist items and the total"""
+        response = self.client.get(
+            tracks_url,
+            headers=self.headers,
+            params={
+                "offset": offset,
+                "limit": PLAYLIST_PAGE_SIZE,
+                "fields": "items(track(uri)),total"
+            })
+        if response.status_code != 200:
+            return None
+        page = decode_json(response.content)
+        uris = [(item.get("track") or {}).get("uri")
+                for item in page.get("items", [])]
+        return uris, page.get("total", len(uris))
+
+    def _remove(self, tracks_url, uris):
+        """Remove every occurrence of uris; return the new snapshot_id"""
+        data = json.dumps({"tracks": [{"uri": uri} for uri in uris]})
+        started = time.perf_counter()
+        response = self.client.delete(
+            tracks_url, headers=self.headers, data=data)
+        self._record_batch("remove", started)
+        if 200 <= response.status_code < 300:
+            return decode_json(response.content).get("snapshot_id", "")
+
+        print(f"Error removing tracks: {response.content}")
+        return None
+
+    def _reorder(self, tracks_url, range_start, range_length, insert_before):
+        """Move one block of items; return the new snapshot_id
+
+        A move applied twice scrambles the playlist, so it is not retried
+        after a server error or a lost response.
+        """
+        data = json.dumps({
+            "range_start": range_start,
+            "range_length": range_length,
+            "insert_before": insert_before
+        })
+        started = time.perf_counter()
+        response = self.client.put(tracks_url, headers=self.headers,
+                                   data=data, idempotent=False)
+        self._record_batch("reorder", started)
+        if 200 <= response.status_code < 300:
+            return decode_json(response.content).get("snapshot_id", "")
+
+        print(f"Error reordering tracks: {response.content}")
+        return None
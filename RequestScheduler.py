@@ -0,0 +1,209 @@
+from constants import (
+    SCHEDULER_RATE, SCHEDULER_BURST, SCHEDULER_MAX_CONCURRENCY,
+    SCHEDULER_MAX_RETRIES, SCHEDULER_BACKOFF_BASE, SCHEDULER_BACKOFF_CAP
+)
+import asyncio
+import random
+import threading
+import time
+
+
+class RequestScheduler:
+    """Class pacing Spotify calls with a token bucket and 429 backoff"""
+
+    def __init__(
+            self,
+            rate=SCHEDULER_RATE,
+            burst=SCHEDULER_BURST,
+            max_concurrency=SCHEDULER_MAX_CONCURRENCY,
+            max_retries=SCHEDULER_MAX_RETRIES,
+            backoff_base=SCHEDULER_BACKOFF_BASE,
+            backoff_cap=SCHEDULER_BACKOFF_CAP
+            ):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.clock = time.monotonic
+        self.sleep = time.sleep
+
+        self.tokens = burst
+        self.updated_at = self.clock()
+        self.concurrency_limit = max_concurrency
+        self.in_flight = 0
+        self.paused_until = 0
+        self.success_streak = 0
+        self.throttled_count = 0
+        self.retry_count = 0
+        self.condition = threading.Condition()
+
+    def execute(self, send, retry_exceptions=(), retry_if=None,
+                retry_server_errors=True):
+        """Run send() when allowed, retrying throttled and failed calls
+
+        retry_if narrows which retry_exceptions are retried. Requests that
+        are not safe to repeat pass retry_server_errors=False, so a 5xx
+        is returned at once and only 429s are sent again.
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                response = send()
+            except retry_exceptions as error:
+                if retry_if is not None and not retry_if(error):
+                    self._release()
+                    raise
+                delay = self._complete(None, {}, attempt)
+                if delay is None:
+                    raise
+            except BaseException:
+                self._release()
+                raise
+            else:
+                delay = self._complete(
+                    response.status_code, response.headers, attempt,
+                    retry_server_errors)
+                if delay is None:
+                    return response
+
+            self.sleep(delay)
+            attempt += 1
+
+    async def execute_async(self, send, retry_exceptions=(), retry_if=None,
+                            retry_server_errors=True):
+        """Await send() when allowed, retrying throttled and failed calls"""
+        attempt = 0
+        while True:
+            await self.acquire_async()
+            try:
+                response = await send()
+            except retry_exceptions as error:
+                if retry_if is not None and not retry_if(error):
+                    self._release()
+                    raise
+                delay = self._complete(None, {}, attempt)
+                if delay is None:
+                    raise
+            except BaseException:
+                self._release()
+                raise
+            else:
+                delay = self._complete(
+                    response.status_code, response.headers, attempt,
+                    retry_server_errors)
+                if delay is None:
+                    return response
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def acquire(self):
+        """Block until a rate token and a concurrency slot are available"""
+        while True:
+            with self.condition:
+                delay = self._reserve()
+                if delay == 0:
+                    return
+                if delay is None:
+                    self.condition.wait()
+                    continue
+            self.sleep(delay)
+
+    async def acquire_async(self):
+        """Wait without blocking the loop for a token and a slot"""
+        while True:
+            with self.condition:
+                delay = self._reserve()
+            if delay == 0:
+                return
+            await asyncio.sleep(delay if delay is not None else 0.01)
+
+    def stats(self):
+        """Return scheduler counters"""
+        with self.condition:
+            return {
+                "concurrency_limit": self.concurrency_limit,
+                "in_flight": self.in_flight,
+                "throttled": self.throttled_count,
+                "retries": self.retry_count
+            }
+
+    def _reserve(self):
+        """Take a token and a slot, or return seconds to wait (None: slot)"""
+        now = self.clock()
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.in_flight >= self.concurrency_limit:
+            return None
+        if self.rate is None:
+            # No token bucket, only the concurrency limit applies
+            self.in_flight += 1
+            return 0
+
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        # Tolerate float drift so a refill of 0.999... still counts as 1
+        if self.tokens < 1 - 1e-9:
+            return (1 - self.tokens) / self.rate
+
+        self.tokens -= 1
+        self.in_flight += 1
+        return 0
+
+    def _complete(self, status_code, headers, attempt,
+                  retry_server_errors=True):
+        """Release the slot and return the retry delay, or None if done"""
+        with self.condition:
+            self._release()
+
+            if status_code == 429:
+                self.throttled_count += 1
+                self.success_streak = 0
+                self.concurrency_limit = max(1, self.concurrency_limit // 2)
+
+                delay = self._retry_after(headers)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                else:
+                    delay += random.uniform(0, self.backoff_base)
+                self.paused_until = max(self.paused_until,
+                                        self.clock() + delay)
+            elif status_code is None or status_code >= 500:
+                if not retry_server_errors:
+                    return None
+                delay = self._backoff(attempt)
+            else:
+                self.success_streak += 1
+                if (self.success_streak >= self.concurrency_limit
+                        and self.concurrency_limit < self.max_concurrency):
+                    self.concurrency_limit += 1
+                    self.success_streak = 0
+                return None
+
+            if attempt >= self.max_retries:
+                return None
+            self.retry_count += 1
+            return delay
+
+    def _release(self):
+        """Give back a concurrency slot"""
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def _backoff(self, attempt):
+        """Return a full-jitter exponential backoff delay"""
+        return random.uniform(
+            0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def _retry_after(self, headers):
+        """Return the Retry-After delay in seconds, if the header is set"""
+        value = headers.get("Retry-After")
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,66 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bulky fields of search payloads that Track never reads
+UNUSED_FIELDS = frozenset((
+    "available_markets", "images", "external_urls", "external_ids",
+    "href", "preview_url", "linked_from", "restrictions"
+))
+
+
+def decode_json(content):
+    """Decode a response body with the fastest available JSON backend"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def drop_unused_fields(obj):
+    """Strip unused fields from each object as the parser builds it"""
+    for key in UNUSED_FIELDS.intersection(obj):
+        del obj[key]
+    return obj
+
+
+def decode_search_page(content):
+    """Decode a search response, dropping unused fields while parsing
+
+    orjson gives no per-object hook, but it builds the document far
+    faster than the stdlib parser and items are slimmed right after.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content, object_hook=drop_unused_fields)
+
+
+def slim_track_item(item):
+    """Keep only the track fields Track reads"""
+    album = item.get("album") or {}
+    return {
+        "id": item.get("id"),
+        "name": item.get("name"),
+        "artists": [
+            {"name": artist.get("name")}
+            for artist in item.get("artists", [])
+        ],
+        "uri": item.get("uri"),
+        "album": {"name": album.get("name", "Unknown Album")},
+        "popularity": item.get("popularity", 0)
+    }
+
+
+def extract_track_items(json_result, key="tracks"):
+    """Return slimmed track items of a search page, or None if missing"""
+    container = json_result.get(key) if isinstance(json_result, dict) else None
+    if not isinstance(container, dict) or "items" not in container:
+        return None
+    return [slim_track_item(item) for item in container["items"] if item]
+
+
+def decode_track_items(content):
+    """Decode a search response straight to slimmed track items"""
+    return extract_track_items(decode_search_page(content))
@@ -0,0 +1,276 @@
+from constants import SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL, SEARCH_PAGE_LIMIT
+from collections import OrderedDict
+import json
+import sqlite3
+import threading
+import time
+
+
+class SearchCache:
+    """Class caching search results with TTL and LRU eviction
+
+    Results are stored per genre in blocks of block_size offsets, so a
+    page of any limit is served from the blocks it overlaps. Each block
+    holds the results from its first offset on, and is marked complete
+    when a short page showed the results end inside it.
+    """
+
+    def __init__(
+            self,
+            max_entries=SEARCH_CACHE_SIZE,
+            ttl=SEARCH_CACHE_TTL,
+            db_path=None,
+            block_size=SEARCH_PAGE_LIMIT
+            ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.block_size = block_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.clock = time.time
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self.loads = 0
+        self.loading = {}
+        self.db = None
+
+        if db_path:
+            self.db = sqlite3.connect(db_path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                "key TEXT PRIMARY KEY, expires_at REAL, items TEXT)")
+            self.db.commit()
+
+    @staticmethod
+    def make_key(genre, block_start):
+        """Return the normalized cache key for one block of a genre"""
+        return f"{genre.strip().casefold()}|{block_start}"
+
+    def get(self, key):
+        """Return cached items for key, or None if missing or expired"""
+        with self.lock:
+            items = self._get(key)
+            if items is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return items
+
+    def cached_range(self, genre, limit, offset):
+        """Return (items, done) for the page of limit results at offset
+
+        items are the cached results from offset on, and done tells
+        whether they answer the page: all limit of them are cached, or
+        the results are known to end sooner.
+        """
+        items = []
+        position = offset
+        end = offset + limit
+        while position < end:
+            block_start = position - position % self.block_size
+            block = self.get(self.make_key(genre, block_start))
+            if block is None:
+                return items, False
+
+            stored = block["items"]
+            stop = block_start + len(stored)
+            if stop < position:
+                # The block stops short of offset: either the results end
+                # there, or the results in between were never fetched.
+                return items, block["complete"]
+            items.extend(stored[position - block_start:
+                                min(end, stop) - block_start])
+            position = max(position, min(end, stop))
+            if position < end and position == stop:
+                if block["complete"]:
+                    return items, True
+                if stop < block_start + self.block_size:
+                    return items, False
+        return items, True
+
+    def store_range(self, genre, offset, items, limit):
+        """Merge a fetched page of limit results at offset into blocks
+
+        Blocks only grow from their first offset on, so a segment that
+        would leave a gap in its block is not stored.
+        """
+        end = offset + len(items)
+        short = len(items) < limit
+        position = offset
+        with self.lock:
+            while True:
+                block_start = position - position % self.block_size
+                block_end = block_start + self.block_size
+                key = self.make_key(genre, block_start)
+                block = self._get(key)
+                stored = block["items"] if block else []
+                segment_end = min(end, block_end)
+                complete = short and end <= block_end
+
+                if block_start + len(stored) >= position and (
+                        complete or block_start + len(stored) < segment_end):
+                    merged = (stored[:position - block_start]
+                              + items[position - offset:segment_end - offset])
+                    self._set(key, {"items": merged, "complete": complete})
+
+                if end <= block_end:
+                    break
+                position = block_end
+
+    def get_range(self, genre, limit, offset, load):
+        """Return limit results from offset, loading only what is missing
+
+        load(limit, offset) fetches a page and returns its items, or None
+        on failure. Concurrent callers missing the same block wait for the
+        first one's load instead of fetching it again.
+        """
+        key = self.make_key(genre, offset - offset % self.block_size)
+        while True:
+            cached, done = self.cached_range(genre, limit, offset)
+            if done:
+                return cached
+
+            event, owner = self._claim(key)
+            if not owner:
+                event.wait()
+                continue
+
+            try:
+                start = offset + len(cached)
+                items = load(limit - len(cached), start)
+                if items is None:
+                    return None
+                self.store_range(genre, start, items, limit - len(cached))
+                return cached + items
+            finally:
+                self._release(key, event)
+
+    def get_or_load(self, key, load):
+        """Return cached items for key, calling load() once per miss
+
+        Concurrent callers missing the same key wait for the first one's
+        load instead of fetching the page again. load returns None on
+        failure, in which case a waiting caller retries the load itself.
+        """
+        while True:
+            items = self.get(key)
+            if items is not None:
+                return items
+
+            event, owner = self._claim(key)
+            if not owner:
+                event.wait()
+                continue
+
+            try:
+                items = load()
+                if items is not None:
+                    self.set(key, items)
+                return items
+            finally:
+                self._release(key, event)
+
+    def set(self, key, items):
+        """Cache items for key"""
+        with self.lock:
+            self._set(key, items)
+
+    def clear(self):
+        """Remove every cached page"""
+        with self.lock:
+            self.entries.clear()
+            if self.db is not None:
+                self.db.execute("DELETE FROM search_cache")
+                self.db.commit()
+
+    def stats(self):
+        """Return cache counters"""
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_hits": self.disk_hits,
+                "loads": self.loads
+            }
+
+    def close(self):
+        """Close the on-disk tier"""
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def _claim(self, key):
+        """Return the load event for key and whether the caller owns it"""
+        with self.lock:
+            event = self.loading.get(key)
+            if event is not None:
+                return event, False
+            event = self.loading[key] = threading.Event()
+            self.loads += 1
+            return event, True
+
+    def _release(self, key, event):
+        """Finish a load and wake the callers waiting for it"""
+        with self.lock:
+            del self.loading[key]
+        event.set()
+
+    def _get(self, key):
+        """Return a fresh entry from either tier; the lock must be held"""
+        now = self.clock()
+        entry = self.entries.get(key)
+        if entry is not None:
+            expires_at, items = entry
+            if expires_at > now:
+                self.entries.move_to_end(key)
+                return items
+            del self.entries[key]
+
+        entry = self._load(key, now)
+        if entry is not None:
+            expires_at, items = entry
+            self.disk_hits += 1
+            self._store(key, expires_at, items)
+            return items
+        return None
+
+    def _set(self, key, items):
+        """Write an entry to both tiers; the lock must be held"""
+        expires_at = self.clock() + self.ttl
+        self._store(key, expires_at, items)
+        if self.db is not None:
+            self.db.execute(
+                "INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?)",
+                (key, expires_at, json.dumps(items)))
+            self.db.commit()
+
+    def _store(self, key, expires_at, items):
+        """Insert into the memory tier, evicting least recently used"""
+        self.entries[key] = (expires_at, items)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def _load(self, key, now):
+        """Read a non-expired entry from the on-disk tier"""
+        if self.db is None:
+            return None
+
+        row = self.db.execute(
+            "SELECT expires_at, items FROM search_cache WHERE key = ?",
+            (key,)).fetchone()
+        if row is None:
+            return None
+
+        expires_at, items = row
+        if expires_at <= now:
+            self.db.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+            self.db.commit()
+            return None
+
+        return expires_at, json.loads(items)
@@ -1,56 +1,184 @@
 from TrackSearcher import TrackSearcher
 from SearchTracksByGenre import SearchTracksByGenre
-from constants import ACTIVITY_GENRES
+from TrackRanker import TrackRanker
+from constants import ACTIVITY_GENRES, RANKING_CANDIDATE_FACTOR
+import queue
 import random
+import threading
+import time
 
 
 class SearchTracksByActivity(TrackSearcher):
     """Strategy for searching tracks by activity"""
 
+    def __init__(self, auth, cache=None, catalog=None, page_size=None,
+                 audio_features=None):
+        super().__init__(auth, cache, catalog)
+        self.genre_searcher = SearchTracksByGenre(
+            auth, cache, catalog=catalog, page_size=page_size)
+        self.audio_features = audio_features
+
+    def set_progress_callback(self, callback):
+        """Register callback(genre, offset, count) called after every page"""
+        super().set_progress_callback(callback)
+        self.genre_searcher.set_progress_callback(callback)
+
     def search_tracks(self, activity, num_tracks=20):
         """Search for tracks by activity"""
+        all_tracks = list(self.search_tracks_iter(activity, num_tracks))
+
+        random.shuffle(all_tracks)
+
+        return all_tracks
+
+    def search_tracks_iter(self, activity, num_tracks=20):
+        """Yield unique tracks by activity as each genre page arrives
+
+        With an audio feature fetcher, a larger candidate pool is searched
+        first and the tracks closest to the activity's profile are
+        yielded, best first, once it is complete.
+        """
+        ranker = self._ranker(activity)
+        if ranker is None:
+            yield from self._search_candidates(activity, num_tracks)
+            return
+
+        candidates = list(self._search_candidates(
+            activity, num_tracks * RANKING_CANDIDATE_FACTOR))
+        features = self.audio_features.fetch(
+            track.id for track in candidates)
+        if features:
+            yield from ranker.top(candidates, features, num_tracks)
+        else:
+            yield from random.sample(
+                candidates, min(num_tracks, len(candidates)))
+
+    def _ranker(self, activity):
+        """Return the ranker for activity when features can be fetched"""
+        if self.audio_features is None or not self.audio_features.available:
+            return None
+        return TrackRanker.for_activity(activity)
+
+    def _search_candidates(self, activity, num_tracks):
+        """Yield unique tracks by activity in arrival order"""
         if activity not in ACTIVITY_GENRES:
             print(f"Error: Activity '{activity}' not recognized")
-            return []
+            return
 
         genres = ACTIVITY_GENRES[activity]
-        all_tracks = []
-        seen_signatures = set()
 
-        base_tracks_per_genre = num_tracks // len(genres)
+        # Cursors persist across attempts so retries continue paging
+        # instead of downloading the first pages again.
+        cursors = {
+            genre: self.genre_searcher.make_planner() for genre in genres
+        }
+
+        started = time.perf_counter()
+        counts = {"checked": 0, "discarded": 0}
+        try:
+            yield from self._merge_genres(
+                genres, num_tracks, cursors, counts)
+        finally:
+            self._record_dedupe(
+                "merge", counts["checked"], counts["discarded"])
+            self._record_generation(
+                "activity", started,
+                sum(cursor.pages_recorded for cursor in cursors.values()))
+
+    def _merge_genres(self, genres, num_tracks, cursors, counts):
+        """Yield unique tracks from all genres, sharing num_tracks out"""
+        seen_keys = set()
+        found = 0
+
         remainder = num_tracks % len(genres)
 
         attempts = 0
         max_attempts = 3
 
-        while len(all_tracks) < num_tracks and attempts < max_attempts:
-            remaining_tracks = num_tracks - len(all_tracks)
-            current_tracks_per_genre = remaining_tracks // len(genres)
-
-            for genre in genres:
-                target_tracks = current_tracks_per_genre + remainder + 10
-
-                genre_searcher = SearchTracksByGenre(self.auth)
-                tracks = genre_searcher.search_tracks(genre, target_tracks)
-
-                for track in tracks:
-                    signature = track.get_signature()
-                    if signature not in seen_signatures:
-                        all_tracks.append(track)
-                        seen_signatures.add(signature)
-
-                        if len(all_tracks) >= num_tracks:
-                            break
+        while found < num_tracks and attempts < max_attempts:
+            active_genres = [
+                genre for genre in genres if not cursors[genre].finished
+            ]
+            if not active_genres:
+                break
 
-                if len(all_tracks) >= num_tracks:
-                    break
+            remaining_tracks = num_tracks - found
+            current_tracks_per_genre = remaining_tracks // len(genres)
+            target_tracks = current_tracks_per_genre + remainder + 10
+
+            # Cap each genre at its share so the first genre to answer
+            # cannot fill the whole quota; surplus tops up the shortfall
+            genre_share = -(-remaining_tracks // len(genres))
+            taken = dict.fromkeys(genres, 0)
+            overflow = []
+
+            for genre, track in self._stream_genres(
+                    active_genres, target_tracks, cursors):
+                counts["checked"] += 1
+                key = track.get_dedupe_key()
+                if key in seen_keys:
+                    counts["discarded"] += 1
+                    continue
+                if taken[genre] >= genre_share:
+                    overflow.append(track)
+                    continue
+
+                seen_keys.add(key)
+                taken[genre] += 1
+                found += 1
+                yield track
+
+                if found >= num_tracks:
+                    return
+
+            for track in overflow:
+                key = track.get_dedupe_key()
+                if key in seen_keys:
+                    counts["discarded"] += 1
+                else:
+                    seen_keys.add(key)
+                    found += 1
+                    yield track
+
+                    if found >= num_tracks:
+                        return
 
             attempts += 1
 
-            if len(all_tracks) < num_tracks:
-                print(f"Retrieved {len(all_tracks)} tracks, ")
+            if found < num_tracks:
+                print(f"Retrieved {found} tracks, ")
                 print("attempting to fetch more...")
 
-        random.shuffle(all_tracks)
-
-        return all_tracks[:num_tracks]
+    def _stream_genres(self, genres, target_tracks, cursors):
+        """Search all genres in parallel, yielding (genre, track) pairs"""
+        results = queue.Queue()
+        stop = threading.Event()
+
+        def produce(genre):
+            try:
+                for track in self.genre_searcher.search_tracks_iter(
+                        genre, target_tracks, cursors[genre]):
+                    if stop.is_set():
+                        break
+                    results.put((genre, track))
+                results.put((genre, None))
+            except Exception as error:
+                results.put((genre, error))
+
+        for genre in genres:
+            thread = threading.Thread(target=produce, args=(genre,))
+            thread.daemon = True
+            thread.start()
+
+        pending = len(genres)
+        try:
+            while pending:
+                genre, item = results.get()
+                if item is None:
+                    pending -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield genre, item
+        finally:
+            stop.set()
@@ -1,39 +1,184 @@
 from TrackSearcher import TrackSearcher
-import random
+from constants import PAGE_FETCH_WORKERS
+from PaginationPlanner import PaginationPlanner
+from concurrent.futures import ThreadPoolExecutor
+import time
 
 
 class SearchTracksByGenre(TrackSearcher):
     """Strategy for searching tracks by genre"""
 
-    def search_tracks(self, genre, num_tracks=20):
+    def __init__(self, auth, cache=None, max_workers=PAGE_FETCH_WORKERS,
+                 random_offsets=False, catalog=None, page_size=None):
+        super().__init__(auth, cache, catalog)
+        self.max_workers = max_workers
+        self.random_offsets = random_offsets
+        self.page_size = page_size
+
+    def search_tracks(self, genre, num_tracks=20, cursor=None):
         """Search for tracks by genre"""
-        all_tracks = []
-        seen_signatures = set()
-        cycle = 0
-        limit = 50
+        return list(self.search_tracks_iter(genre, num_tracks, cursor))
+
+    def make_planner(self):
+        """Return a fresh pagination planner for one genre query"""
+        return PaginationPlanner(
+            random_offsets=self.random_offsets, page_size=self.page_size)
+
+    def search_tracks_iter(self, genre, num_tracks=20, cursor=None):
+        """Yield unique tracks by genre as each page arrives
+
+        Pass a planner from make_planner() as cursor to continue after the
+        pages and tracks an earlier call already returned. Resumed searches
+        count towards the generation that owns the cursor.
+        """
+        started = time.perf_counter()
+        planner = self.make_planner() if cursor is None else cursor
+        seen_keys = planner.seen_keys
+        found = 0
+        checked = 0
+        discarded = 0
+
+        try:
+            if self.catalog is not None:
+                for track in self._catalog_tracks(genre, num_tracks, planner):
+                    seen_keys.add(track.get_dedupe_key())
+                    found += 1
+                    yield track
+
+                    if found >= num_tracks:
+                        return
+
+            while found < num_tracks:
+                # Tracks an earlier call fetched but did not reach
+                while planner.held and found < num_tracks:
+                    track = planner.take_held()
+                    checked += 1
+                    key = track.get_dedupe_key()
+                    if key in seen_keys:
+                        discarded += 1
+                        continue
+
+                    seen_keys.add(key)
+                    planner.count_unique()
+                    found += 1
+                    yield track
+                if found >= num_tracks:
+                    break
+
+                max_pages = None if self.max_workers > 1 else 1
+                pages = planner.plan(num_tracks - found, max_pages)
+                if not pages:
+                    break
+
+                fetched = self._fetch_pages(genre, pages, planner)
+                try:
+                    for (limit, offset), tracks in zip(pages, fetched):
+                        unique = 0
+                        examined = 0
+                        try:
+                            for track in tracks:
+                                examined += 1
+                                checked += 1
+                                key = track.get_dedupe_key()
+                                if key in seen_keys:
+                                    discarded += 1
+                                    continue
+
+                                seen_keys.add(key)
+                                unique += 1
+                                found += 1
+                                yield track
 
-        while len(all_tracks) < num_tracks and cycle < 10:
-            remaining_tracks = num_tracks - len(all_tracks)
-            offset = cycle * limit
+                                if found >= num_tracks:
+                                    break
+                        finally:
+                            planner.record(limit, offset, len(tracks), unique)
+                            planner.hold(tracks[examined:])
 
-            tracks = self._search_tracks_by_genre(
-                genre, limit=limit, offset=offset)
+                        if found >= num_tracks or planner.exhausted:
+                            break
+                finally:
+                    # Pages of the wave this call did not reach
+                    fetched.close()
+        finally:
+            self._record_dedupe("page", checked, discarded)
+            if cursor is None:
+                self._record_generation(
+                    "genre", started, planner.pages_recorded)
 
-            if not tracks:
-                break
+    def _catalog_tracks(self, genre, num_tracks, planner):
+        """Yield unseen catalog tracks for genre in a random order"""
+        if planner.catalog_cursor is None:
+            start = planner.rng.random()
+            planner.catalog_cursor = {
+                "start": start, "after": start, "wrapped": False
+            }
+            if not planner.random_offsets:
+                # The network only has to cover pages the catalog lacks.
+                planner.skip_to(self.catalog.next_offset(genre))
 
-            for track in tracks:
-                signature = track.get_signature()
-                if signature not in seen_signatures:
-                    all_tracks.append(track)
-                    seen_signatures.add(signature)
+        cursor = planner.catalog_cursor
+        wanted = num_tracks
+        while wanted > 0:
+            before = cursor["start"] if cursor["wrapped"] else 2.0
+            rows = self.catalog.genre_tracks(
+                genre, wanted, cursor["after"], before)
+            if not rows:
+                if cursor["wrapped"]:
+                    return
+                cursor["wrapped"] = True
+                cursor["after"] = -1.0
+                continue
 
-                    if len(all_tracks) >= num_tracks:
-                        break
+            for key, track in rows:
+                cursor["after"] = key
+                if track.get_dedupe_key() not in planner.seen_keys:
+                    wanted -= 1
+                    yield track
 
-            cycle += 1
+    def _fetch_pages(self, genre, pages, planner=None):
+        """Yield result pages in plan order as they arrive
 
-        if len(all_tracks) > num_tracks:
-            return random.sample(all_tracks, num_tracks)
+        When the caller stops early, pages that already arrived are
+        recorded and held on planner, and the rest are released to be
+        planned again.
+        """
+        if self.max_workers <= 1 or len(pages) == 1:
+            consumed = 0
+            try:
+                for limit, offset in pages:
+                    tracks = self._search_tracks_by_genre(
+                        genre, limit=limit, offset=offset)
+                    consumed += 1
+                    yield tracks
+            finally:
+                if planner is not None:
+                    for page in pages[consumed:]:
+                        planner.release(page)
+            return
 
-        return all_tracks
+        workers = min(self.max_workers, len(pages))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = [
+            executor.submit(self._search_tracks_by_genre,
+                            genre, limit=limit, offset=offset)
+            for limit, offset in pages
+        ]
+        consumed = 0
+        try:
+            for future in futures:
+                tracks = future.result()
+                consumed += 1
+                yield tracks
+        finally:
+            for page, future in zip(pages[consumed:], futures[consumed:]):
+                if planner is None:
+                    future.cancel()
+                elif future.done() and not future.cancelled() \
+                        and future.exception() is None:
+                    planner.record(*page, len(future.result()), 0)
+                    planner.hold(future.result())
+                else:
+                    future.cancel()
+                    planner.release(page)
+            executor.shutdown(wait=False, cancel_futures=True)
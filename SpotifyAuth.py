@@ -1,31 +1,33 @@
 import base64
-import json
 import random
 import webbrowser
-from requests import post, get
 import urllib.parse
 import http.server
 import socketserver
 import threading
 import secret1
+from SpotifyClient import SpotifyClient
+from TokenManager import TokenManager
+from ResponseDecoder import decode_json
 
 
 class SpotifyAuth:
     """Class for handling Spotify authentication and token management"""
 
-    def __init__(self):
+    def __init__(self, client=None):
         self.__client_id = ""
         self.__client_secret = ""
         self.redirect_uri = secret1.REDIRECT_URI
-        self.token = None
+        self.client_token = TokenManager(self._request_client_token)
+        self.user_token = TokenManager(self._request_user_token)
         self.refresh_token = None
         self.auth_code = None
         self.user_id = None
-        self.access_token = None
         self.auth_completed = False
         self.auth_event = threading.Event()
         self.client_id = secret1.CLIENT_ID
         self.client_secret = secret1.CLIENT_SECRET
+        self.client = client or SpotifyClient()
 
     @property
     def client_id(self):
@@ -43,34 +45,84 @@ class SpotifyAuth:
     def client_secret(self, value):
         self.__client_secret = value
 
-    def get_token(self):
-        """Obtain a Spotify API token using client credentials flow"""
+    @property
+    def token(self):
+        return self.client_token.access_token
+
+    @property
+    def access_token(self):
+        """User access token, refreshed before it expires"""
+        if self.user_token.access_token is None:
+            return None
+        return self.user_token.get_token()
+
+    @access_token.setter
+    def access_token(self, value):
+        if value is None:
+            self.user_token.clear()
+        else:
+            self.user_token.set_token({"access_token": value})
+
+    def _basic_auth_headers(self):
+        """Return the client credentials headers for the accounts service"""
         auth_string = self.client_id + ":" + self.client_secret
         auth_bytes = auth_string.encode('utf-8')
         auth_base64 = str(base64.b64encode(auth_bytes), "utf-8")
 
-        url = "https://accounts.spotify.com/api/token"
-        headers = {
+        return {
             "Authorization": "Basic " + auth_base64,
             "Content-Type": "application/x-www-form-urlencoded"
         }
+
+    def _request_client_token(self):
+        """Request a token using client credentials flow"""
+        url = f"{self.client.accounts_url}/api/token"
         data = {"grant_type": "client_credentials"}
 
-        result = post(url, headers=headers, data=data)
-        json_result = json.loads(result.content)
+        result = self.client.post(
+            url, headers=self._basic_auth_headers(), data=data)
+        json_result = decode_json(result.content)
 
-        if "access_token" in json_result:
-            self.token = json_result["access_token"]
-            return self.token
-        else:
+        if "access_token" not in json_result:
             print(f"Error getting token: {json_result}")
             return None
+        return json_result
+
+    def _request_user_token(self):
+        """Exchange the refresh token for a new user access token"""
+        if not self.refresh_token:
+            print("No refresh token available")
+            return None
+
+        url = f"{self.client.accounts_url}/api/token"
+        data = {
+            "grant_type": "refresh_token",
+            "refresh_token": self.refresh_token
+        }
+
+        result = self.client.post(
+            url, headers=self._basic_auth_headers(), data=data)
+        json_result = decode_json(result.content)
+
+        if "access_token" not in json_result:
+            print(f"Error refreshing user token: {json_result}")
+            return None
+
+        self.refresh_token = json_result.get(
+            "refresh_token", self.refresh_token)
+        return json_result
+
+    def get_token(self):
+        """Obtain a Spotify API token using client credentials flow"""
+        return self.client_token.refresh()
 
     def get_auth_header(self):
-        """Return the authorization header with token"""
-        if not self.token:
-            self.get_token()
-        return {"Authorization": "Bearer " + self.token}
+        """Return the authorization header with a non-expired token"""
+        return {"Authorization": "Bearer " + self.client_token.get_token()}
+
+    def get_user_auth_header(self):
+        """Return the authorization header with the user's token"""
+        return {"Authorization": f"Bearer {self.access_token}"}
 
     def start_auth_server(self):
         """Start local server to handle OAuth callback"""
@@ -160,7 +212,7 @@ class SpotifyAuth:
             print("No authorization code available")
             return False
 
-        url = "https://accounts.spotify.com/api/token"
+        url = f"{self.client.accounts_url}/api/token"
 
         payload = {
             "grant_type": "authorization_code",
@@ -170,12 +222,13 @@ class SpotifyAuth:
             "client_secret": self.client_secret
         }
 
-        response = post(url, data=payload)
+        response = self.client.post(url, data=payload)
 
         if response.status_code == 200:
-            token_data = json.loads(response.content)
-            self.access_token = token_data.get("access_token")
+            token_data = decode_json(response.content)
             self.refresh_token = token_data.get("refresh_token")
+            if "access_token" in token_data:
+                self.user_token.set_token(token_data)
 
             if self.access_token:
                 self.get_user_profile()
@@ -191,11 +244,12 @@ class SpotifyAuth:
             print("No access token available")
             return False
 
-        headers = {"Authorization": f"Bearer {self.access_token}"}
-        response = get("https://api.spotify.com/v1/me", headers=headers)
+        headers = self.get_user_auth_header()
+        response = self.client.get(
+            f"{self.client.api_url}/me", headers=headers)
 
         if response.status_code == 200:
-            user_data = json.loads(response.content)
+            user_data = decode_json(response.content)
             self.user_id = user_data.get("id")
             return True
         else:
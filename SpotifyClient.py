@@ -0,0 +1,100 @@
+from constants import (
+    SPOTIFY_API_URL, SPOTIFY_ACCOUNTS_URL,
+    HTTP_POOL_SIZE, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT
+)
+from RequestScheduler import RequestScheduler
+from Metrics import MetricsRegistry, endpoint_name
+from requests import Session, ConnectionError, ConnectTimeout, Timeout
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+import time
+
+
+def request_not_sent(error):
+    """Return True if error happened before the request reached Spotify
+
+    Only connect timeouts and refused connections qualify; a read timeout
+    or a dropped connection may come after the server acted on the call.
+    """
+    if isinstance(error, ConnectTimeout):
+        return True
+    cause = error.args[0] if error.args else None
+    return isinstance(getattr(cause, "reason", cause), NewConnectionError)
+
+
+class SpotifyClient:
+    """Class wrapping a pooled keep-alive HTTP session for Spotify calls"""
+
+    def __init__(
+            self,
+            pool_size=HTTP_POOL_SIZE,
+            connect_timeout=HTTP_CONNECT_TIMEOUT,
+            read_timeout=HTTP_READ_TIMEOUT,
+            api_url=SPOTIFY_API_URL,
+            accounts_url=SPOTIFY_ACCOUNTS_URL,
+            scheduler=None,
+            metrics=None
+            ):
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.api_url = api_url
+        self.accounts_url = accounts_url
+        self.scheduler = scheduler or RequestScheduler()
+        self.metrics = metrics or MetricsRegistry()
+
+        self.session = Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, url, idempotent=None, **kwargs):
+        """Send a request through the shared session and scheduler
+
+        Requests that are not idempotent, POSTs by default, are only
+        repeated when they were throttled or never sent.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        endpoint = endpoint_name(url)
+
+        def send():
+            start = time.perf_counter()
+            status = "error"
+            try:
+                response = self.session.request(method, url, **kwargs)
+                status = response.status_code
+                return response
+            finally:
+                self.metrics.observe(
+                    "spotify_request_duration_seconds",
+                    time.perf_counter() - start,
+                    method=method, endpoint=endpoint)
+                self.metrics.inc("spotify_requests_total", method=method,
+                                 endpoint=endpoint, status=status)
+
+        if idempotent is None:
+            idempotent = method != "POST"
+        if not idempotent:
+            return self.scheduler.execute(
+                send, (ConnectionError,), retry_if=request_not_sent,
+                retry_server_errors=False)
+        return self.scheduler.execute(send, (ConnectionError, Timeout))
+
+    def get(self, url, **kwargs):
+        """Send a GET request through the shared session"""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        """Send a POST request through the shared session"""
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        """Send a PUT request through the shared session"""
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        """Send a DELETE request through the shared session"""
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
@@ -1,77 +1,132 @@
 from SpotifyAuth import SpotifyAuth
 from Playlist import Playlist
-from SearchTracksByGenre import SearchTracksByGenre
-from SearchTracksByActivity import SearchTracksByActivity
-import json
-from requests import post
+from PlaylistUploader import PlaylistUploader
+from SearchCache import SearchCache
+from TrackCatalog import TrackCatalog
+from PlaylistFactory import (
+    make_search_strategy, generate_playlist, playlist_from_uris
+)
+from TrackHydrator import TrackHydrator
+from AudioFeatures import AudioFeatureFetcher
+from AsyncSpotifyClient import AsyncSpotifyClient
+from AsyncSearchTracksByGenre import AsyncSearchTracksByGenre
+from AsyncSearchTracksByActivity import AsyncSearchTracksByActivity
 
 
 class SpotifyPlaylistGenerator:
     """Main class for generating playlists using different strategies"""
 
-    def __init__(self):
-        self.auth = SpotifyAuth()
+    def __init__(self, cache_path=None, catalog_path=":memory:", auth=None):
+        self.auth = auth or SpotifyAuth()
+        self.search_cache = SearchCache(db_path=cache_path)
+        self.catalog = TrackCatalog(catalog_path)
         self.playlist = Playlist()
         self.search_strategy = None
+        self.audio_features = AudioFeatureFetcher(self.auth)
+        self.hydrator = TrackHydrator(self.auth)
+        self.async_client = AsyncSpotifyClient(
+            api_url=self.auth.client.api_url,
+            accounts_url=self.auth.client.accounts_url,
+            scheduler=self.auth.client.scheduler,
+            metrics=self.auth.client.metrics)
+        self.async_search_strategy = None
 
     def set_strategy(self, strategy_type):
         """Set the search strategy"""
+        self.search_strategy = make_search_strategy(
+            strategy_type, self.auth, self.search_cache, self.catalog,
+            audio_features=self.audio_features)
         if strategy_type == "genre":
-            self.search_strategy = SearchTracksByGenre(self.auth)
-        elif strategy_type == "activity":
-            self.search_strategy = SearchTracksByActivity(self.auth)
+            self.async_search_strategy = AsyncSearchTracksByGenre(
+                self.auth, self.async_client, self.search_cache)
         else:
-            raise ValueError(f"Unknown strategy type: {strategy_type}")
+            self.async_search_strategy = AsyncSearchTracksByActivity(
+                self.auth, self.async_client, self.search_cache)
 
     def generate_playlist(self, query, num_tracks=20, playlist_name=None):
         """Generate a playlist using the current strategy"""
         if not self.search_strategy:
             raise ValueError("Search strategy not set")
 
+        if playlist_name:
+            self.playlist.name = playlist_name
+
+        self.playlist = generate_playlist(
+            self.search_strategy, query, num_tracks, self.playlist.name)
+
+        return self.playlist
+
+    def generate_playlist_iter(
+            self, query, num_tracks=20, playlist_name=None,
+            progress_callback=None):
+        """Generate a playlist using the current strategy, track by track"""
+        if not self.search_strategy:
+            raise ValueError("Search strategy not set")
+
+        self.search_strategy.set_progress_callback(progress_callback)
+
         if playlist_name:
             self.playlist.name = playlist_name
 
         self.playlist = Playlist(name=self.playlist.name)
 
-        tracks = self.search_strategy.search_tracks(query, num_tracks)
+        return self._stream_playlist(self.playlist, query, num_tracks)
 
-        self.playlist.add_tracks(tracks)
+    def _stream_playlist(self, playlist, query, num_tracks):
+        """Add tracks to the playlist as the strategy yields them"""
+        for track in self.search_strategy.search_tracks_iter(
+                query, num_tracks):
+            if playlist.add_track(track):
+                yield track
 
+    async def generate_playlist_async(
+            self, query, num_tracks=20, playlist_name=None):
+        """Generate a playlist using the current strategy without blocking"""
+        if not self.async_search_strategy:
+            raise ValueError("Search strategy not set")
+
+        if playlist_name:
+            self.playlist.name = playlist_name
+
+        playlist = Playlist(name=self.playlist.name)
+
+        tracks = await self.async_search_strategy.search_tracks(
+            query, num_tracks)
+
+        playlist.add_tracks(tracks)
+        self.playlist = playlist
+
+        return playlist
+
+    def load_playlist(self, track_uris, playlist_name=None):
+        """Rebuild the current playlist from stored track URIs"""
+        self.playlist = playlist_from_uris(
+            self.hydrator, track_uris, playlist_name or self.playlist.name)
         return self.playlist
 
+    def refresh_playlist(self):
+        """Refresh popularity and album data of the current playlist"""
+        return self.hydrator.hydrate_tracks(self.playlist.tracks)
+
     def create_spotify_playlist(self, user_id, access_token):
-        """Create the playlist in the user's Spotify account"""
+        """Create the playlist in Spotify and return the UploadResult"""
         if not self.playlist.tracks:
             print("No tracks in playlist")
             return None
 
-        create_url = f"https://api.spotify.com/v1/users/{user_id}/playlists"
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json"
-        }
-
-        data = {
-            "name": self.playlist.name,
-            "description": self.playlist.description,
-            "public": True
-        }
-
-        response = post(create_url, headers=headers, data=json.dumps(data))
-        playlist_data = json.loads(response.content)
-
-        if "id" not in playlist_data:
-            print(f"Error creating playlist: {playlist_data}")
+        uploader = PlaylistUploader(self.auth.client, access_token)
+        playlist_id = uploader.create_playlist(
+            user_id, self.playlist.name, self.playlist.description)
+        if playlist_id is None:
             return None
 
-        playlist_id = playlist_data["id"]
-
-        tracks_url = f"https://api.spotify.com/v1/playlists/{playlist_id}/tracks"
-        track_uris = self.playlist.get_track_uris()
+        return uploader.upload(playlist_id, self.playlist.get_track_uris())
 
-        for i in range(0, len(track_uris), 100):
-            batch = track_uris[i:i+100]
-            data = {"uris": batch}
-            post(tracks_url, headers=headers, data=json.dumps(data))
+    def sync_spotify_playlist(self, playlist_id, access_token):
+        """Update an existing Spotify playlist and return the SyncResult"""
+        if not self.playlist.tracks:
+            print("No tracks in playlist")
+            return None
 
-        return playlist_id
+        uploader = PlaylistUploader(self.auth.client, access_token)
+        return uploader.sync(playlist_id, self.playlist.get_track_uris())
@@ -0,0 +1,85 @@
+import unittest
+import asyncio
+from unittest.mock import Mock
+from AsyncSpotifyClient import AsyncSpotifyClient
+from AsyncSearchTracksByGenre import AsyncSearchTracksByGenre
+from AsyncSearchTracksByActivity import AsyncSearchTracksByActivity
+from MockSpotifyServer import MockSpotifyServer
+from RequestScheduler import RequestScheduler
+
+
+class TestAsyncTrackSearcher(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """Set up a local stand-in server and mocked auth"""
+        self.server = MockSpotifyServer()
+        self.server.start()
+        self.mock_auth = Mock()
+        self.mock_auth.get_auth_header.return_value = {
+            "Authorization": "Bearer test_token"
+        }
+        self.client = AsyncSpotifyClient(
+            api_url=self.server.api_url,
+            scheduler=RequestScheduler(rate=None))
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def test_genre_search(self):
+        """Test genre search against the stand-in server"""
+        searcher = AsyncSearchTracksByGenre(self.mock_auth, self.client)
+        result = await searcher.search_tracks("rock", 120)
+
+        self.assertEqual(len(result), 120)
+        self.assertEqual(self.server.request_count, 3)
+        self.assertEqual(len({track.id for track in result}), 120)
+
+    async def test_genre_cursor_resumes_inside_page(self):
+        """Test that a resumed cursor uses the rest of a cut page first"""
+        searcher = AsyncSearchTracksByGenre(
+            self.mock_auth, self.client, page_size=50)
+        cursor = searcher.make_planner()
+
+        first = await searcher.search_tracks("rock", 20, cursor)
+        second = await searcher.search_tracks("rock", 20, cursor)
+
+        self.assertEqual(self.server.request_count, 1)
+        self.assertEqual(len({track.id for track in first + second}), 40)
+
+    async def test_genre_search_short_catalog(self):
+        """Test that an exhausted result set stops paging"""
+        self.server.total_tracks = 30
+        searcher = AsyncSearchTracksByGenre(self.mock_auth, self.client)
+        result = await searcher.search_tracks("jazz", 100)
+
+        self.assertEqual(len(result), 30)
+
+    async def test_activity_search(self):
+        """Test activity search against the stand-in server"""
+        searcher = AsyncSearchTracksByActivity(self.mock_auth, self.client)
+        result = await searcher.search_tracks("Workout", 40)
+
+        self.assertEqual(len(result), 40)
+        self.assertTrue(any(track.id.startswith("electronic")
+                            for track in result))
+
+    async def test_invalid_activity(self):
+        """Test with invalid activity"""
+        searcher = AsyncSearchTracksByActivity(self.mock_auth, self.client)
+        result = await searcher.search_tracks("not_a_real_activity")
+        self.assertEqual(len(result), 0)
+
+    async def test_concurrent_generations_share_loop(self):
+        """Test many searches running on one event loop"""
+        searcher = AsyncSearchTracksByGenre(self.mock_auth, self.client)
+        results = await asyncio.gather(*(
+            searcher.search_tracks(f"genre{i}", 20) for i in range(50)))
+
+        self.assertTrue(all(len(result) == 20 for result in results))
+        self.assertEqual(self.server.request_count, 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
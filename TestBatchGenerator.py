@@ -0,0 +1,82 @@
+import unittest
+import csv
+import io
+import json
+from unittest.mock import Mock
+from BatchGenerator import BatchGenerator, BatchJob, write_json, write_csv
+from MockSpotifyServer import MockSpotifyServer
+from RequestScheduler import RequestScheduler
+from SearchCache import SearchCache
+from SpotifyClient import SpotifyClient
+
+
+class TestBatchGenerator(unittest.TestCase):
+    def setUp(self):
+        """Start a local stand-in server and auth pointing at it"""
+        self.server = MockSpotifyServer(latency=0.002)
+        self.server.start()
+        self.auth = Mock()
+        self.auth.get_auth_header.return_value = {
+            "Authorization": "Bearer test_token"
+        }
+        self.auth.client = SpotifyClient(
+            api_url=self.server.api_url,
+            scheduler=RequestScheduler(rate=None))
+        self.jobs = [
+            BatchJob("activity", "Workout", 20),
+            BatchJob("activity", "Focus", 50),
+            BatchJob("genre", "electronic", 50),
+            BatchJob("genre", "electronic", 100),
+        ]
+
+    def tearDown(self):
+        self.auth.client.close()
+        self.server.stop()
+
+    def test_jobs_share_page_fetches(self):
+        """Test that pages needed by several jobs are fetched once"""
+        cache = SearchCache()
+        results = BatchGenerator(self.auth, cache, max_workers=4).run(
+            self.jobs)
+
+        self.assertEqual([len(result.playlist) for result in results],
+                         [20, 50, 50, 100])
+        self.assertTrue(all(result.error is None for result in results))
+
+        unshared = 0
+        for job in self.jobs:
+            job_cache = SearchCache()
+            BatchGenerator(self.auth, job_cache).run_job(job)
+            unshared += job_cache.stats()["loads"]
+        self.assertLess(cache.stats()["loads"], unshared)
+
+    def test_failed_job_is_reported(self):
+        """Test that an unknown strategy fails only its own job"""
+        results = BatchGenerator(self.auth).run(
+            [BatchJob("mood", "happy", 20), BatchJob("genre", "rock", 20)])
+
+        self.assertIsNotNone(results[0].error)
+        self.assertIsNone(results[1].error)
+        self.assertEqual(len(results[1].playlist), 20)
+
+    def test_writers(self):
+        """Test JSON and CSV output"""
+        results = BatchGenerator(self.auth).run(self.jobs[2:3])
+
+        output = io.StringIO()
+        write_json(results, output)
+        document = json.loads(output.getvalue())
+        self.assertEqual(document[0]["query"], "electronic")
+        self.assertEqual(len(document[0]["tracks"]), 50)
+        self.assertIn("seconds", document[0])
+
+        output = io.StringIO()
+        write_csv(results, output)
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        self.assertEqual(rows[0][:4],
+                         ["strategy", "query", "num_tracks", "position"])
+        self.assertEqual(len(rows), 51)
+
+
+if __name__ == '__main__':
+    unittest.main()
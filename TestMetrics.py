@@ -0,0 +1,140 @@
+import unittest
+from unittest.mock import Mock
+from Metrics import MetricsRegistry, endpoint_name
+from MockSpotifyServer import MockSpotifyServer
+from PlaylistUploader import PlaylistUploader
+from RequestScheduler import RequestScheduler
+from SearchTracksByActivity import SearchTracksByActivity
+from SearchTracksByGenre import SearchTracksByGenre
+from SpotifyClient import SpotifyClient
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self):
+        self.metrics = MetricsRegistry(latency_buckets=(0.1, 1))
+
+    def test_counters(self):
+        """Test that counters add up per label set"""
+        self.metrics.inc("spotify_requests_total", endpoint="/v1/search",
+                         status=200)
+        self.metrics.inc("spotify_requests_total", 2, endpoint="/v1/search",
+                         status=200)
+        self.metrics.inc("spotify_requests_total", endpoint="/v1/search",
+                         status=429)
+
+        self.assertEqual(self.metrics.counter(
+            "spotify_requests_total", endpoint="/v1/search", status=200), 3)
+        self.assertEqual(self.metrics.total("spotify_requests_total"), 4)
+        self.assertEqual(self.metrics.counter("missing"), 0)
+
+    def test_histogram_buckets(self):
+        """Test that observations land in cumulative le buckets"""
+        for value in (0.05, 0.1, 0.5, 3):
+            self.metrics.observe("upload_duration_seconds", value,
+                                 operation="upload")
+
+        histogram = self.metrics.histogram(
+            "upload_duration_seconds", operation="upload")
+        self.assertEqual(histogram["count"], 4)
+        self.assertAlmostEqual(histogram["sum"], 3.65)
+        self.assertEqual(histogram["buckets"],
+                         {"0.1": 2, "1": 3, "+Inf": 4})
+
+    def test_prometheus_format(self):
+        """Test the text exposition output"""
+        self.metrics.inc("dedupe_tracks_total", 10, stage="page")
+        self.metrics.observe("upload_duration_seconds", 0.5,
+                             operation='say "hi"')
+
+        text = self.metrics.to_prometheus()
+
+        self.assertIn("# TYPE dedupe_tracks_total counter\n", text)
+        self.assertIn('dedupe_tracks_total{stage="page"} 10\n', text)
+        self.assertIn("# TYPE upload_duration_seconds histogram\n", text)
+        self.assertIn('upload_duration_seconds_bucket{operation="say \\"hi\\"",'
+                      'le="+Inf"} 1\n', text)
+        self.assertIn('upload_duration_seconds_count{operation="say \\"hi\\""}'
+                      ' 1\n', text)
+
+    def test_endpoint_name(self):
+        """Test that ids are folded out of endpoint labels"""
+        self.assertEqual(endpoint_name(
+            "https://api.spotify.com/v1/search?q=genre:rock"), "/v1/search")
+        self.assertEqual(endpoint_name(
+            "http://127.0.0.1:1/v1/playlists/abc/tracks"),
+            "/v1/playlists/{id}/tracks")
+        self.assertEqual(endpoint_name(
+            "http://127.0.0.1:1/v1/users/me123/playlists"),
+            "/v1/users/{id}/playlists")
+
+
+class TestMetricsCollection(unittest.TestCase):
+    def setUp(self):
+        """Start a stand-in server with re-released tracks mixed in"""
+        self.server = MockSpotifyServer(duplicate_rate=0.3)
+        self.server.start()
+        self.auth = Mock()
+        self.auth.get_auth_header.return_value = {
+            "Authorization": "Bearer test_token"
+        }
+        self.auth.client = SpotifyClient(
+            api_url=self.server.api_url,
+            scheduler=RequestScheduler(rate=None))
+        self.metrics = self.auth.client.metrics
+
+    def tearDown(self):
+        self.auth.client.close()
+        self.server.stop()
+
+    def test_genre_generation(self):
+        """Test request, page, dedupe and generation metrics of a search"""
+        SearchTracksByGenre(self.auth, max_workers=1).search_tracks(
+            "rock", 200)
+
+        requests = self.metrics.counter(
+            "spotify_requests_total", method="GET", endpoint="/v1/search",
+            status=200)
+        self.assertEqual(requests, self.server.request_count)
+        self.assertEqual(self.metrics.counter(
+            "search_pages_total", source="network"), requests)
+        self.assertEqual(self.metrics.histogram(
+            "spotify_request_duration_seconds", method="GET",
+            endpoint="/v1/search")["count"], requests)
+
+        ratio = self.metrics.ratio("dedupe_discarded_total",
+                                   "dedupe_tracks_total", stage="page")
+        self.assertGreater(ratio, 0.1)
+        self.assertLess(ratio, 0.5)
+
+        generation = self.metrics.histogram(
+            "generation_pages", strategy="genre")
+        self.assertEqual(generation["count"], 1)
+        self.assertEqual(generation["sum"], requests)
+
+    def test_activity_generation_counted_once(self):
+        """Test that an activity search is one generation"""
+        SearchTracksByActivity(self.auth).search_tracks("Workout", 60)
+
+        snapshot = self.metrics.snapshot()
+        strategies = [series["labels"]["strategy"]
+                      for series in snapshot["generation_pages"]]
+        self.assertEqual(strategies, ["activity"])
+        self.assertGreaterEqual(snapshot["generation_pages"][0]["sum"], 2)
+
+    def test_upload(self):
+        """Test upload duration, batch timings and written tracks"""
+        self.server.playlists["p1"] = []
+        uris = [f"spotify:track:{i}" for i in range(250)]
+
+        PlaylistUploader(self.auth.client, "token").upload("p1", uris)
+
+        self.assertEqual(self.metrics.counter(
+            "upload_tracks_total", operation="upload"), 250)
+        self.assertEqual(self.metrics.histogram(
+            "upload_batch_duration_seconds", operation="add")["count"], 3)
+        self.assertEqual(self.metrics.histogram(
+            "upload_duration_seconds", operation="upload")["count"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import random
+from PaginationPlanner import PaginationPlanner
+
+
+class TestPaginationPlanner(unittest.TestCase):
+    def test_small_request_uses_small_page(self):
+        """Test that 20 tracks are requested as a single page of 20"""
+        planner = PaginationPlanner()
+        self.assertEqual(planner.plan(20), [(20, 0)])
+
+    def test_large_request_splits_into_contiguous_pages(self):
+        """Test that pages cover the request without gaps"""
+        planner = PaginationPlanner()
+        self.assertEqual(planner.plan(120), [(50, 0), (50, 50), (20, 100)])
+        self.assertEqual(planner.plan(10, max_pages=1), [(10, 120)])
+
+    def test_plan_follows_observed_yield(self):
+        """Test that a low dedupe yield asks for proportionally more"""
+        planner = PaginationPlanner()
+        planner.plan(20)
+        planner.record(20, 0, received=20, unique=10)
+
+        self.assertEqual(planner.yield_ratio, 0.5)
+        self.assertEqual(planner.plan(10), [(20, 20)])
+
+    def test_short_page_exhausts(self):
+        """Test that a short page stops further planning"""
+        planner = PaginationPlanner()
+        planner.plan(50)
+        planner.record(50, 0, received=30, unique=30)
+
+        self.assertTrue(planner.exhausted)
+        self.assertEqual(planner.plan(20), [])
+
+    def test_page_budget_and_api_maximum(self):
+        """Test that planning stops at the page budget and max offset"""
+        planner = PaginationPlanner(max_pages=3)
+        self.assertEqual(len(planner.plan(1000)), 3)
+        self.assertEqual(planner.plan(50), [])
+
+        planner = PaginationPlanner(max_offset=120)
+        self.assertEqual(planner.plan(1000), [(50, 0), (50, 50), (20, 100)])
+
+    def test_random_offsets_never_repeat(self):
+        """Test that random offsets stay in range and never repeat"""
+        planner = PaginationPlanner(random_offsets=True,
+                                    rng=random.Random(3))
+        pages = planner.plan(1000)
+
+        offsets = [offset for _, offset in pages]
+        self.assertEqual(len(offsets), 20)
+        self.assertEqual(sorted(offsets), list(range(0, 1000, 50)))
+        self.assertNotEqual(offsets, sorted(offsets))
+        self.assertEqual(planner.plan(50), [])
+
+    def test_random_short_page_lowers_ceiling(self):
+        """Test that a short random page caps later offsets"""
+        planner = PaginationPlanner(random_offsets=True,
+                                    rng=random.Random(1))
+        limit, offset = planner.plan(50)[0]
+        planner.record(limit, offset, received=0, unique=0)
+
+        for _, later in planner.plan(1000):
+            self.assertLess(later, offset)
+
+    def test_held_tracks_keep_yield_accurate(self):
+        """Test that held tracks only count once they are examined"""
+        planner = PaginationPlanner()
+        planner.plan(50)
+        planner.record(50, 0, received=50, unique=20)
+        planner.hold(list(range(30)))
+        self.assertEqual(planner.yield_ratio, 1.0)
+
+        self.assertEqual(planner.take_held(), 0)
+        planner.count_unique()
+        self.assertEqual(planner.received, 21)
+        self.assertEqual(planner.unique, 21)
+
+    def test_released_pages_planned_again(self):
+        """Test that a cancelled page is planned before new offsets"""
+        planner = PaginationPlanner()
+        pages = planner.plan(100)
+        planner.release(pages[1])
+
+        self.assertEqual(planner.plan(50, max_pages=1), [(50, 50)])
+        self.assertEqual(planner.plan(50, max_pages=1), [(50, 100)])
+
+    def test_released_pages_past_the_end_dropped(self):
+        """Test that pages beyond a short page are not fetched again"""
+        planner = PaginationPlanner()
+        pages = planner.plan(150)
+        planner.record(*pages[0], received=30, unique=30)
+        planner.release(pages[1])
+        planner.release(pages[2])
+
+        self.assertTrue(planner.exhausted)
+        self.assertEqual(planner.plan(50), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
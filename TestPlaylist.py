@@ -0,0 +1,91 @@
+import unittest
+from Playlist import Playlist
+from Track import Track
+
+
+def make_track(index, name=None, artist="Artist"):
+    return Track({
+        "id": f"id{index}",
+        "name": name or f"Song {index}",
+        "artists": [{"name": artist}],
+        "uri": f"spotify:track:{index}"
+    })
+
+
+class TestPlaylist(unittest.TestCase):
+    def setUp(self):
+        """Set up a playlist with five tracks"""
+        self.playlist = Playlist()
+        self.tracks = [make_track(i) for i in range(5)]
+        self.playlist.add_tracks(self.tracks)
+
+    def test_add_tracks_skips_duplicates(self):
+        """Test that bulk and single adds both dedupe by normalized key"""
+        duplicate = make_track(9, name="song 0 - Remastered 2011")
+        self.assertEqual(self.playlist.add_tracks([duplicate, make_track(5)]), 1)
+        self.assertFalse(self.playlist.add_track(duplicate))
+        self.assertEqual(len(self.playlist), 6)
+
+    def test_lookup(self):
+        """Test lookup by dedupe key, URI and id"""
+        track = self.tracks[2]
+        self.assertIs(self.playlist.get_by_uri("spotify:track:2"), track)
+        self.assertIs(self.playlist.get_by_id("id2"), track)
+        self.assertIs(
+            self.playlist.get_by_dedupe_key(track.get_dedupe_key()), track)
+        self.assertIn(track, self.playlist)
+        self.assertIsNone(self.playlist.get_by_uri("spotify:track:missing"))
+
+        self.playlist.add_tracks([make_track(7)])
+        self.assertEqual(self.playlist.get_by_id("id7").uri, "spotify:track:7")
+
+    def test_remove(self):
+        """Test removal by track, URI and id keeps the indexes in step"""
+        self.assertTrue(self.playlist.remove_track(self.tracks[0]))
+        self.assertTrue(self.playlist.remove_uri("spotify:track:1"))
+        self.assertTrue(self.playlist.remove_id("id2"))
+        self.assertFalse(self.playlist.remove_id("id2"))
+
+        self.assertEqual(self.playlist.tracks, self.tracks[3:])
+        self.assertEqual(self.playlist.get_track_uris(),
+                         ["spotify:track:3", "spotify:track:4"])
+        self.assertIsNone(self.playlist.get_by_id("id1"))
+        self.assertTrue(self.playlist.add_track(self.tracks[0]))
+
+    def test_move(self):
+        """Test moving a track to every position"""
+        for index in range(5):
+            playlist = Playlist()
+            playlist.add_tracks(self.tracks)
+            playlist.move(self.tracks[2], index)
+
+            expected = [t for t in self.tracks if t is not self.tracks[2]]
+            expected.insert(index, self.tracks[2])
+            self.assertEqual(playlist.tracks, expected)
+
+    def test_reorder_and_move_to_end(self):
+        """Test sorting and moving to either end"""
+        self.playlist.reorder(lambda track: -int(track.id[2:]))
+        self.assertEqual(self.playlist.tracks, self.tracks[::-1])
+
+        self.playlist.move_to_end(self.tracks[4])
+        self.assertEqual(self.playlist.tracks[-1], self.tracks[4])
+        self.playlist.move_to_end(self.tracks[0], last=False)
+        self.assertEqual(self.playlist.tracks[0], self.tracks[0])
+
+    def test_cached_lists_refresh(self):
+        """Test that cached tracks and URIs follow mutations"""
+        uris = self.playlist.get_track_uris()
+        self.assertIs(self.playlist.get_track_uris(), uris)
+
+        self.playlist.add_track(make_track(5))
+        self.assertEqual(len(self.playlist.get_track_uris()), 6)
+        self.assertEqual(len(self.playlist.tracks), 6)
+
+        self.playlist.clear()
+        self.assertEqual(self.playlist.tracks, [])
+        self.assertEqual(self.playlist.get_track_uris(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
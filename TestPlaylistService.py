@@ -0,0 +1,160 @@
+import unittest
+import http.client
+import json
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+import requests
+from MockSpotifyServer import MockSpotifyServer
+from PlaylistService import PlaylistService
+from RequestScheduler import RequestScheduler
+from SearchCache import SearchCache
+from SpotifyClient import SpotifyClient
+
+
+class TestPlaylistService(unittest.TestCase):
+    def setUp(self):
+        """Start a stand-in Spotify server and the service in front of it"""
+        self.server = MockSpotifyServer(latency=0.002)
+        self.server.start()
+        self.auth = Mock()
+        self.auth.get_auth_header.return_value = {
+            "Authorization": "Bearer test_token"
+        }
+        self.auth.client = SpotifyClient(
+            api_url=self.server.api_url,
+            scheduler=RequestScheduler(rate=None))
+        self.cache = SearchCache()
+        self.service = PlaylistService(self.auth, self.cache, port=0)
+        self.url = self.service.start()
+
+    def tearDown(self):
+        self.service.stop()
+        self.auth.client.close()
+        self.server.stop()
+
+    def test_concurrent_generates(self):
+        """Test that parallel requests share one set of page fetches"""
+        def generate(index):
+            return requests.post(f"{self.url}/generate", json={
+                "strategy": "genre", "query": "rock", "num_tracks": 50})
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(generate, range(16)))
+
+        self.assertTrue(all(response.status_code == 200
+                            for response in responses))
+        track_lists = [[track["id"] for track in response.json()["tracks"]]
+                       for response in responses]
+        self.assertTrue(all(len(tracks) == 50 for tracks in track_lists))
+        self.assertEqual(self.cache.stats()["loads"], 1)
+
+    def test_different_sizes_share_cached_pages(self):
+        """Test that small pages are requested and shared through the cache"""
+        for num_tracks in (20, 35, 20):
+            response = requests.post(f"{self.url}/generate", json={
+                "strategy": "genre", "query": "rock",
+                "num_tracks": num_tracks})
+            self.assertEqual(len(response.json()["tracks"]), num_tracks)
+
+        # 20 tracks, then the 15 the second request lacked, then nothing
+        self.assertEqual(self.server.request_count, 2)
+        self.assertEqual(self.cache.stats()["loads"], 2)
+
+    def test_uploads_for_two_users(self):
+        """Test that each upload is sent with its caller's token"""
+        def upload(token):
+            return requests.post(
+                f"{self.url}/playlists",
+                headers={"Authorization": f"Bearer {token}"},
+                json={"name": token, "uris": [f"spotify:track:{token}{i}"
+                                              for i in range(150)]})
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            responses = list(executor.map(upload, ["alice", "bob"]))
+
+        for token, response in zip(["alice", "bob"], responses):
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertTrue(body["complete"])
+            self.assertEqual(
+                self.server.playlists[body["playlist_id"]],
+                [f"spotify:track:{token}{i}" for i in range(150)])
+        self.assertEqual(requests.get(f"{self.url}/health").json()["users"], 2)
+
+    def test_upload_syncs_existing_playlist(self):
+        """Test that passing playlist_id updates that playlist"""
+        self.server.playlists["p1"] = ["spotify:track:a", "spotify:track:b"]
+        response = requests.post(
+            f"{self.url}/playlists",
+            headers={"Authorization": "Bearer alice"},
+            json={"playlist_id": "p1",
+                  "uris": ["spotify:track:b", "spotify:track:c"]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.playlists["p1"],
+                         ["spotify:track:b", "spotify:track:c"])
+
+    def test_upload_requires_token(self):
+        """Test that uploads without a user token are refused"""
+        response = requests.post(f"{self.url}/playlists",
+                                 json={"uris": ["spotify:track:a"]})
+        self.assertEqual(response.status_code, 401)
+
+    def test_bad_requests(self):
+        """Test unknown strategies, bad bodies and unknown paths"""
+        response = requests.post(f"{self.url}/generate", json={
+            "strategy": "mood", "query": "happy"})
+        self.assertEqual(response.status_code, 400)
+
+        for body in ({"strategy": "genre", "query": ["rock"]},
+                     {"strategy": "activity", "query": {}},
+                     {"strategy": ["genre"], "query": "rock"},
+                     {"strategy": "genre", "query": "rock", "name": 7}):
+            response = requests.post(f"{self.url}/generate", json=body)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("error", response.json())
+
+        response = requests.post(f"{self.url}/generate", data=b"not json")
+        self.assertEqual(response.status_code, 400)
+
+        response = requests.get(f"{self.url}/missing")
+        self.assertEqual(response.status_code, 404)
+
+    def test_malformed_content_length(self):
+        """Test that a bad Content-Length header is answered with a 400"""
+        address = urllib.parse.urlsplit(self.url)
+        for length in ("abc", "-1"):
+            connection = http.client.HTTPConnection(
+                address.hostname, address.port, timeout=5)
+            connection.putrequest("POST", "/generate")
+            connection.putheader("Content-Length", length)
+            connection.endheaders()
+            response = connection.getresponse()
+            self.assertEqual(response.status, 400)
+            self.assertIn("error", json.loads(response.read()))
+            connection.close()
+
+    def test_metrics_endpoint(self):
+        """Test that request metrics are served in Prometheus format"""
+        requests.post(f"{self.url}/generate", json={
+            "strategy": "genre", "query": "rock", "num_tracks": 20})
+
+        response = requests.get(f"{self.url}/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["Content-Type"].startswith(
+            "text/plain"))
+        self.assertIn('spotify_requests_total{endpoint="/v1/search",'
+                      'method="GET",status="200"} 1', response.text)
+
+    def test_user_contexts_bounded(self):
+        """Test that the least recently used user is dropped first"""
+        self.service.max_users = 2
+        for token in ["a", "b", "a", "c"]:
+            self.service.user_context(token)
+        self.assertEqual(list(self.service.users), ["a", "c"])
+
+
+if __name__ == '__main__':
+    unittest.main()
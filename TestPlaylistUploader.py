@@ -0,0 +1,252 @@
+import unittest
+import json
+import random
+from unittest.mock import Mock
+from MockSpotifyServer import MockSpotifyServer
+from PlaylistUploader import PlaylistUploader, plan_moves
+from constants import UPLOAD_REORDER_ATTEMPTS
+from RequestScheduler import RequestScheduler
+from SpotifyClient import SpotifyClient
+
+
+class TestPlaylistUploader(unittest.TestCase):
+    def setUp(self):
+        """Start a local stand-in server with one empty playlist"""
+        self.server = MockSpotifyServer(latency=0.005)
+        self.server.start()
+        self.server.playlists["p1"] = []
+        self.client = SpotifyClient(
+            api_url=self.server.api_url,
+            scheduler=RequestScheduler(rate=None))
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_upload_keeps_order(self):
+        """Test that concurrent batches end up in the original order"""
+        uris = [f"spotify:track:{i}" for i in range(1050)]
+        uploader = PlaylistUploader(self.client, "token", max_workers=4)
+
+        result = uploader.upload("p1", uris)
+
+        self.assertEqual(self.server.playlists["p1"], uris)
+        self.assertEqual(result.added_count, 1050)
+        self.assertTrue(result.complete)
+        self.assertEqual(result.snapshot_id,
+                         f"snapshot-{self.server.snapshot_count}")
+
+    def test_upload_empty(self):
+        """Test uploading no tracks"""
+        result = PlaylistUploader(self.client, "token").upload("p1", [])
+        self.assertEqual(result.added_count, 0)
+        self.assertTrue(result.complete)
+
+    def ok_response(self, snapshot_id="s1"):
+        return Mock(status_code=201, content=json.dumps(
+            {"snapshot_id": snapshot_id}).encode("utf-8"))
+
+    def test_failed_batch_reported(self):
+        """Test that a failed batch is not counted as added or re-posted"""
+        for status_code in (400, 500):
+            failed = Mock(status_code=status_code, content=b"{}")
+            client = Mock(api_url="https://api.spotify.com/v1")
+            client.post.side_effect = [self.ok_response(), failed]
+
+            uploader = PlaylistUploader(client, "token", batch_size=2,
+                                        max_workers=1)
+            result = uploader.upload("p1", ["a", "b", "c"])
+
+            self.assertEqual(client.post.call_count, 2)
+            self.assertEqual(result.added_count, 2)
+            self.assertFalse(result.complete)
+            self.assertEqual(result.snapshot_id, "s1")
+
+    def fail_first_reorder(self):
+        """Make the server apply its first move but answer it with a 500"""
+        apply = self.server.reorder_playlist_items
+        calls = []
+
+        def reorder(playlist_id, body):
+            calls.append(body)
+            response = apply(playlist_id, body)
+            if len(calls) == 1:
+                return self.server.error(500, "Response lost")
+            return response
+
+        self.server.reorder_playlist_items = reorder
+        return calls
+
+    def test_failed_reorder_reported(self):
+        """Test that moves stop at a failure and leave the upload partial"""
+        client = Mock(api_url="https://api.spotify.com/v1")
+        client.post.return_value = self.ok_response()
+        client.put.return_value = Mock(status_code=500, content=b"{}")
+        uploader = PlaylistUploader(client, "token", batch_size=1,
+                                    max_workers=2)
+        uploader._landed_order = Mock(return_value=[2, 1, 0])
+
+        result = uploader.upload("p1", ["a", "b", "c"])
+
+        self.assertEqual(client.put.call_count, UPLOAD_REORDER_ATTEMPTS)
+        self.assertEqual(uploader._landed_order.call_count,
+                         UPLOAD_REORDER_ATTEMPTS)
+        self.assertEqual(result.added_count, 3)
+        self.assertFalse(result.ordered)
+        self.assertFalse(result.complete)
+
+        uploader._landed_order = Mock(return_value=None)
+        self.assertFalse(uploader.upload("p1", ["a", "b", "c"]).complete)
+
+    def test_out_of_order_batches_reordered(self):
+        """Test that batches appended out of order are moved back"""
+        uris = [f"spotify:track:{i}" for i in range(10)]
+        landed = uris[4:6] + uris[0:2] + uris[6:8] + uris[2:4] + uris[8:]
+        self.server.playlists["p1"] = landed
+
+        uploader = PlaylistUploader(self.client, "token", batch_size=2,
+                                    max_workers=2)
+        order = uploader._landed_order(
+            f"{self.server.api_url}/playlists/p1/tracks",
+            [uris[i:i + 2] for i in range(0, 10, 2)], range(5))
+        self.assertEqual(order, [2, 0, 3, 1, 4])
+
+        for range_start, range_length, insert_before in plan_moves(
+                order, {index: 2 for index in order}):
+            uploader._reorder(f"{self.server.api_url}/playlists/p1/tracks",
+                              range_start, range_length, insert_before)
+        self.assertEqual(self.server.playlists["p1"], uris)
+
+    def test_failed_reorder_replanned_from_playlist(self):
+        """Test that a move applied despite an error is not sent again"""
+        uris = [f"spotify:track:{i}" for i in range(10)]
+        self.server.playlists["p1"] = uris[4:6] + uris[0:4] + uris[6:]
+        calls = self.fail_first_reorder()
+
+        uploader = PlaylistUploader(self.client, "token", batch_size=2,
+                                    max_workers=2)
+        ordered, _ = uploader._restore_order(
+            f"{self.server.api_url}/playlists/p1/tracks",
+            [uris[i:i + 2] for i in range(0, 10, 2)], range(5), None)
+
+        self.assertTrue(ordered)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.server.playlists["p1"], uris)
+
+    def test_sync_sends_minimal_diff(self):
+        """Test that a small change only removes, moves and adds the diff"""
+        old = [f"spotify:track:{i}" for i in range(300)]
+        new = old[:150] + ["spotify:track:new"] + old[150:299]
+        new[10], new[200] = new[200], new[10]
+        self.server.playlists["p1"] = list(old)
+
+        before = self.server.request_count
+        result = PlaylistUploader(self.client, "token").sync("p1", new)
+
+        self.assertEqual(self.server.playlists["p1"], new)
+        self.assertEqual(result.removed_count, 1)
+        self.assertEqual(result.added_count, 1)
+        self.assertEqual(result.moved_count, 2)
+        self.assertFalse(result.replaced)
+        self.assertTrue(result.complete)
+        self.assertEqual(self.server.request_count - before, 3 + 1 + 2 + 1)
+
+    def test_sync_unchanged_playlist_only_reads(self):
+        """Test that syncing identical tracks sends no writes"""
+        uris = [f"spotify:track:{i}" for i in range(120)]
+        self.server.playlists["p1"] = list(uris)
+
+        before = self.server.snapshot_count
+        result = PlaylistUploader(self.client, "token").sync("p1", uris)
+
+        self.assertEqual(self.server.snapshot_count, before)
+        self.assertEqual(result.kept_count, 120)
+        self.assertTrue(result.complete)
+
+    def test_sync_replaces_unrelated_playlist(self):
+        """Test that a reshuffled playlist is rewritten instead of moved"""
+        uris = [f"spotify:track:{i}" for i in range(50)]
+        self.server.playlists["p1"] = list(uris)
+        uris.reverse()
+
+        before = self.server.request_count
+        result = PlaylistUploader(self.client, "token").sync("p1", uris)
+
+        self.assertEqual(self.server.playlists["p1"], uris)
+        self.assertTrue(result.replaced)
+        self.assertEqual(self.server.request_count - before, 3)
+
+    def test_sync_failed_move_replaces_playlist(self):
+        """Test that a failed move falls back to rewriting the playlist"""
+        old = [f"spotify:track:{i}" for i in range(300)]
+        new = list(old)
+        new[10], new[200] = new[200], new[10]
+        self.server.playlists["p1"] = list(old)
+
+        uploader = PlaylistUploader(self.client, "token", max_workers=1)
+        uploader._reorder = Mock(return_value=None)
+        result = uploader.sync("p1", new)
+
+        uploader._reorder.assert_called_once()
+        self.assertEqual(self.server.playlists["p1"], new)
+        self.assertTrue(result.replaced)
+        self.assertTrue(result.complete)
+
+    def test_sync_move_applied_despite_error(self):
+        """Test that a move answered with a 500 is not applied twice"""
+        self.server.playlists["p1"] = ["a", "b", "c", "d"]
+        calls = self.fail_first_reorder()
+
+        result = PlaylistUploader(self.client, "token").sync(
+            "p1", ["b", "c", "d", "a"])
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.server.playlists["p1"], ["b", "c", "d", "a"])
+        self.assertTrue(result.replaced)
+        self.assertTrue(result.complete)
+
+    def test_sync_unavailable_items(self):
+        """Test that null tracks are cleared without a DELETE by null URI"""
+        self.server.playlists["p1"] = ["a", None, "b"]
+
+        result = PlaylistUploader(self.client, "token").sync(
+            "p1", ["a", "b", "c"])
+
+        self.assertEqual(self.server.playlists["p1"], ["a", "b", "c"])
+        self.assertTrue(result.replaced)
+        self.assertEqual(result.removed_count, 1)
+        self.assertTrue(result.complete)
+
+    def test_sync_duplicate_uris(self):
+        """Test that duplicated URIs end up exactly where targeted"""
+        self.server.playlists["p1"] = ["a", "b", "a", "c"]
+
+        PlaylistUploader(self.client, "token").sync("p1", ["c", "a", "b", "d"])
+
+        self.assertEqual(self.server.playlists["p1"], ["c", "a", "b", "d"])
+
+    def test_plan_moves(self):
+        """Test that planned moves sort any order with few moves"""
+        rng = random.Random(7)
+        for size in range(1, 30):
+            order = list(range(size))
+            rng.shuffle(order)
+            sizes = {rank: rng.randint(1, 3) for rank in order}
+            items = [(rank, part) for rank in order
+                     for part in range(sizes[rank])]
+
+            moves = plan_moves(order, sizes)
+            for range_start, range_length, insert_before in moves:
+                block = items[range_start:range_start + range_length]
+                del items[range_start:range_start + range_length]
+                if insert_before > range_start:
+                    insert_before -= range_length
+                items[insert_before:insert_before] = block
+
+            self.assertEqual(items, sorted(items))
+            self.assertLess(len(moves), max(size, 1))
+        self.assertEqual(plan_moves([0, 1, 2]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
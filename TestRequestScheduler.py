@@ -0,0 +1,107 @@
+import unittest
+from unittest.mock import Mock
+from RequestScheduler import RequestScheduler
+
+
+class TestRequestScheduler(unittest.TestCase):
+    def setUp(self):
+        """Set up a scheduler with a fake clock and sleep"""
+        self.now = 0.0
+        self.sleeps = []
+        self.scheduler = RequestScheduler(
+            rate=2, burst=2, max_concurrency=4, max_retries=3)
+        self.scheduler.clock = lambda: self.now
+        self.scheduler.updated_at = 0.0
+        self.scheduler.sleep = self.fake_sleep
+
+    def fake_sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def response(self, status_code, headers=None):
+        return Mock(status_code=status_code, headers=headers or {})
+
+    def test_token_bucket_paces_requests(self):
+        """Test that requests beyond the burst wait for new tokens"""
+        send = Mock(return_value=self.response(200))
+        for _ in range(4):
+            self.scheduler.execute(send)
+
+        self.assertEqual(send.call_count, 4)
+        self.assertAlmostEqual(self.now, 1.0)
+
+    def test_retry_after_honoured(self):
+        """Test that a 429 waits at least Retry-After before retrying"""
+        send = Mock(side_effect=[
+            self.response(429, {"Retry-After": "3"}),
+            self.response(200)
+        ])
+        result = self.scheduler.execute(send)
+
+        self.assertEqual(result.status_code, 200)
+        self.assertGreaterEqual(self.now, 3)
+        self.assertEqual(self.scheduler.stats()["throttled"], 1)
+
+    def test_concurrency_adapts_to_throttling(self):
+        """Test that 429s halve concurrency and successes restore it"""
+        send = Mock(side_effect=[
+            self.response(429, {"Retry-After": "0"}),
+            self.response(200)
+        ])
+        self.scheduler.execute(send)
+        self.assertEqual(self.scheduler.concurrency_limit, 2)
+
+        send = Mock(return_value=self.response(200))
+        for _ in range(10):
+            self.scheduler.execute(send)
+        self.assertEqual(self.scheduler.concurrency_limit, 4)
+
+    def test_server_errors_retried_then_returned(self):
+        """Test that 5xx responses are retried up to max_retries"""
+        send = Mock(return_value=self.response(503))
+        result = self.scheduler.execute(send)
+
+        self.assertEqual(result.status_code, 503)
+        self.assertEqual(send.call_count, 4)
+        self.assertEqual(self.scheduler.stats()["in_flight"], 0)
+
+    def test_connection_errors_retried(self):
+        """Test that listed exceptions are retried"""
+        send = Mock(side_effect=[ConnectionError(), self.response(200)])
+        result = self.scheduler.execute(send, (ConnectionError,))
+
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(self.scheduler.stats()["retries"], 1)
+
+    def test_retry_if_filters_exceptions(self):
+        """Test that exceptions rejected by retry_if are raised at once"""
+        send = Mock(side_effect=ConnectionError("after send"))
+        with self.assertRaises(ConnectionError):
+            self.scheduler.execute(send, (ConnectionError,),
+                                   retry_if=lambda error: False)
+        self.assertEqual(send.call_count, 1)
+        self.assertEqual(self.scheduler.stats()["in_flight"], 0)
+
+    def test_server_errors_not_retried_when_disabled(self):
+        """Test that unsafe requests only retry 429s"""
+        send = Mock(side_effect=[
+            self.response(429, {"Retry-After": "0"}),
+            self.response(500),
+            self.response(200)
+        ])
+        result = self.scheduler.execute(send, retry_server_errors=False)
+
+        self.assertEqual(result.status_code, 500)
+        self.assertEqual(send.call_count, 2)
+        self.assertEqual(self.scheduler.stats()["in_flight"], 0)
+
+    def test_other_errors_release_slot(self):
+        """Test that unexpected exceptions free the concurrency slot"""
+        send = Mock(side_effect=ValueError())
+        with self.assertRaises(ValueError):
+            self.scheduler.execute(send)
+        self.assertEqual(self.scheduler.stats()["in_flight"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
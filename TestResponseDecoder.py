@@ -0,0 +1,61 @@
+import unittest
+import json
+from unittest.mock import patch
+import ResponseDecoder
+from ResponseDecoder import decode_json, decode_search_page, decode_track_items
+from MockSpotifyServer import MockSpotifyServer
+from Track import Track
+
+
+class TestResponseDecoder(unittest.TestCase):
+    def setUp(self):
+        """Set up a search page with full track objects"""
+        item = MockSpotifyServer().make_track("rock", 7)
+        self.item = item
+        self.content = json.dumps(
+            {"tracks": {"items": [item]}}).encode("utf-8")
+
+    def test_items_keep_only_track_fields(self):
+        """Test that unused fields are dropped from decoded items"""
+        items = decode_track_items(self.content)
+
+        self.assertEqual(len(items), 1)
+        self.assertNotIn("available_markets", items[0])
+        self.assertNotIn("images", items[0]["album"])
+        self.assertEqual(items[0]["album"]["name"], self.item["album"]["name"])
+
+    def test_slim_items_build_same_track(self):
+        """Test that slimmed items produce identical tracks"""
+        slim = Track(decode_track_items(self.content)[0])
+        full = Track(self.item)
+
+        self.assertEqual(slim.get_signature(), full.get_signature())
+        self.assertEqual((slim.id, slim.uri, slim.album, slim.popularity),
+                         (full.id, full.uri, full.album, full.popularity))
+
+    def test_error_payload_returns_none(self):
+        """Test that a response without tracks yields None"""
+        content = json.dumps({"error": {"status": 429}}).encode("utf-8")
+        self.assertIsNone(decode_track_items(content))
+
+    def test_stdlib_fallback(self):
+        """Test decoding without the optional fast backend"""
+        with patch.object(ResponseDecoder, "orjson", None):
+            self.assertEqual(decode_json(b'{"id": "1"}'), {"id": "1"})
+
+    def test_stdlib_drops_fields_while_parsing(self):
+        """Test that the stdlib backend strips unused fields per object"""
+        with patch.object(ResponseDecoder, "orjson", None):
+            page = decode_search_page(self.content)
+            items = decode_track_items(self.content)
+
+        item = page["tracks"]["items"][0]
+        self.assertNotIn("available_markets", item)
+        self.assertNotIn("images", item["album"])
+        self.assertNotIn("external_urls", item["artists"][0])
+        self.assertEqual(Track(items[0]).get_signature(),
+                         Track(self.item).get_signature())
+
+
+if __name__ == '__main__':
+    unittest.main()
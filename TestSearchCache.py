@@ -0,0 +1,165 @@
+import unittest
+import json
+import os
+import tempfile
+import threading
+import time
+from unittest.mock import Mock
+from SearchCache import SearchCache
+from SearchTracksByGenre import SearchTracksByGenre
+
+
+class TestSearchCache(unittest.TestCase):
+    def setUp(self):
+        """Set up a cache with a controllable clock"""
+        self.now = 1000.0
+        self.cache = SearchCache(max_entries=2, ttl=60)
+        self.cache.clock = lambda: self.now
+
+    def test_make_key_normalizes_genre(self):
+        """Test that keys ignore case and surrounding whitespace"""
+        self.assertEqual(SearchCache.make_key(" Rock ", 0),
+                         SearchCache.make_key("rock", 0))
+        self.assertNotEqual(SearchCache.make_key("rock", 0),
+                            SearchCache.make_key("rock", 50))
+
+    def page_loader(self, total=1000):
+        """Return a load(limit, offset) stub and the pages it served"""
+        requests = []
+
+        def load(limit, offset):
+            requests.append((limit, offset))
+            return [{"id": str(i)}
+                    for i in range(offset, min(offset + limit, total))]
+        return load, requests
+
+    def ids(self, items):
+        return [int(item["id"]) for item in items]
+
+    def test_small_pages_share_blocks(self):
+        """Test that pages of any limit are sliced from cached blocks"""
+        cache = SearchCache(block_size=50)
+        load, requests = self.page_loader()
+
+        self.assertEqual(self.ids(cache.get_range("rock", 20, 0, load)),
+                         list(range(20)))
+        self.assertEqual(self.ids(cache.get_range("Rock", 35, 0, load)),
+                         list(range(35)))
+        self.assertEqual(self.ids(cache.get_range("rock", 10, 5, load)),
+                         list(range(5, 15)))
+        self.assertEqual(requests, [(20, 0), (15, 20)])
+
+    def test_pages_across_blocks(self):
+        """Test that a page spanning two blocks fills both"""
+        cache = SearchCache(block_size=50)
+        load, requests = self.page_loader()
+
+        cache.get_range("rock", 50, 30, load)
+        self.assertEqual(self.ids(cache.get_range("rock", 20, 50, load)),
+                         list(range(50, 70)))
+        self.assertEqual(self.ids(cache.get_range("rock", 30, 0, load)),
+                         list(range(30)))
+        self.assertEqual(requests, [(50, 30), (30, 0)])
+
+    def test_short_page_ends_results(self):
+        """Test that results known to end are not requested again"""
+        cache = SearchCache(block_size=50)
+        load, requests = self.page_loader(total=30)
+
+        self.assertEqual(len(cache.get_range("jazz", 50, 0, load)), 30)
+        self.assertEqual(len(cache.get_range("jazz", 20, 20, load)), 10)
+        self.assertEqual(cache.get_range("jazz", 20, 40, load), [])
+        self.assertEqual(cache.get_range("jazz", 20, 100, load), [])
+        self.assertEqual(requests, [(50, 0), (20, 100)])
+
+    def test_hit_and_miss(self):
+        """Test hit and miss counters"""
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.set("a", [{"id": "1"}])
+        self.assertEqual(self.cache.get("a"), [{"id": "1"}])
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_ttl_expiry(self):
+        """Test that entries expire after the TTL"""
+        self.cache.set("a", [])
+        self.now += 61
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        self.cache.set("a", [])
+        self.cache.set("b", [])
+        self.cache.get("a")
+        self.cache.set("c", [])
+
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_disk_tier_survives_restart(self):
+        """Test that the SQLite tier is read by a new cache instance"""
+        with tempfile.TemporaryDirectory() as directory:
+            db_path = os.path.join(directory, "cache.db")
+            cache = SearchCache(db_path=db_path)
+            cache.set("rock|50|0", [{"id": "1"}])
+            cache.close()
+
+            restarted = SearchCache(db_path=db_path)
+            self.assertEqual(restarted.get("rock|50|0"), [{"id": "1"}])
+            self.assertEqual(restarted.stats()["disk_hits"], 1)
+            restarted.close()
+
+    def test_searcher_uses_cache(self):
+        """Test that repeated page requests are served from the cache"""
+        mock_auth = Mock()
+        mock_response = Mock()
+        mock_response.content = json.dumps({
+            "tracks": {"items": [{"id": "1", "name": "Test Track"}]}
+        }).encode("utf-8")
+        mock_auth.client.get.return_value = mock_response
+        searcher = SearchTracksByGenre(mock_auth, SearchCache())
+
+        first = searcher._search_tracks_by_genre("rock", limit=50, offset=0)
+        second = searcher._search_tracks_by_genre("Rock", limit=50, offset=0)
+
+        self.assertEqual(first[0].id, second[0].id)
+        self.assertEqual(mock_auth.client.get.call_count, 1)
+
+    def test_get_or_load_single_flight(self):
+        """Test that concurrent misses for one key load it only once"""
+        cache = SearchCache()
+        calls = []
+
+        def load():
+            calls.append(1)
+            time.sleep(0.05)
+            return [{"id": "1"}]
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.get_or_load("k", load)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [[{"id": "1"}]] * 5)
+
+    def test_get_or_load_failure_not_cached(self):
+        """Test that a failed load is retried by the next caller"""
+        cache = SearchCache()
+        self.assertIsNone(cache.get_or_load("k", lambda: None))
+        self.assertEqual(cache.get_or_load("k", lambda: []), [])
+        self.assertEqual(cache.loading, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
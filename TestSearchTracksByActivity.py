@@ -1,8 +1,9 @@
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 from SearchTracksByActivity import SearchTracksByActivity
 from Track import Track
 import json
+import threading
 
 
 class TestSearchTracksByActivity(unittest.TestCase):
@@ -12,6 +13,7 @@ class TestSearchTracksByActivity(unittest.TestCase):
         self.mock_auth.get_auth_header.return_value = {
             "Authorization": "Bearer test_token"
         }
+        self.mock_auth.client.api_url = "https://api.spotify.com/v1"
         self.searcher = SearchTracksByActivity(self.mock_auth)
 
     def test_invalid_activity(self):
@@ -19,8 +21,7 @@ class TestSearchTracksByActivity(unittest.TestCase):
         result = self.searcher.search_tracks("not_a_real_activity")
         self.assertEqual(len(result), 0)
 
-    @patch('TrackSearcher.get')
-    def test_valid_activity(self, mock_get):
+    def test_valid_activity(self):
         """Test with valid activity"""
         # Create mock response data
         response_data = {
@@ -36,7 +37,7 @@ class TestSearchTracksByActivity(unittest.TestCase):
         mock_response.status_code = 200
         mock_response.content = json.dumps(response_data).encode('utf-8')
         mock_response.json.return_value = response_data
-        mock_get.return_value = mock_response
+        self.mock_auth.client.get.return_value = mock_response
 
         # Test with "Gaming" activity
         result = self.searcher.search_tracks("Gaming", 2)
@@ -47,6 +48,81 @@ class TestSearchTracksByActivity(unittest.TestCase):
         self.assertEqual(result[0].id, "1")
         self.assertEqual(result[0].name, "Test Track")
 
+    def test_genres_fetched_concurrently(self):
+        """Test that activity genres are searched in parallel"""
+        barrier = threading.Barrier(2, timeout=2)
+
+        def search_genre(genre, num_tracks=20, cursor=None):
+            barrier.wait()
+            return iter([
+                Track({"id": f"{genre}-{i}", "name": f"{genre} {i}"})
+                for i in range(num_tracks)
+            ])
+        self.searcher.genre_searcher.search_tracks_iter = Mock(
+            side_effect=search_genre)
+
+        result = self.searcher.search_tracks("Workout", 20)
+
+        self.assertEqual(len(result), 20)
+        genres = {track.id.rsplit("-", 1)[0] for track in result}
+        self.assertEqual(genres, {"electronic", "hip-hop"})
+        self.assertEqual(
+            self.searcher.genre_searcher.search_tracks_iter.call_count, 2)
+
+    def test_search_tracks_iter_balances_genres(self):
+        """Test that streamed tracks respect each genre's share"""
+        def search_genre(genre, num_tracks=20, cursor=None):
+            return iter([
+                Track({"id": f"{genre}-{i}", "name": f"{genre} {i}"})
+                for i in range(num_tracks)
+            ])
+        self.searcher.genre_searcher.search_tracks_iter = Mock(
+            side_effect=search_genre)
+
+        result = list(self.searcher.search_tracks_iter("Party", 10))
+
+        self.assertEqual(len(result), 10)
+        dance = [track for track in result if track.id.startswith("dance")]
+        self.assertEqual(len(dance), 5)
+
+    def test_search_tracks_iter_tops_up_from_other_genre(self):
+        """Test that a short genre is topped up by the other genre"""
+        def search_genre(genre, num_tracks=20, cursor=None):
+            count = 2 if genre == "dance" else num_tracks
+            return iter([
+                Track({"id": f"{genre}-{i}", "name": f"{genre} {i}"})
+                for i in range(count)
+            ])
+        self.searcher.genre_searcher.search_tracks_iter = Mock(
+            side_effect=search_genre)
+
+        result = list(self.searcher.search_tracks_iter("Party", 10))
+
+        self.assertEqual(len(result), 10)
+        self.assertEqual(
+            self.searcher.genre_searcher.search_tracks_iter.call_count, 2)
+
+    def test_retries_resume_genre_cursors(self):
+        """Test that later attempts continue paging instead of restarting"""
+        fetched = []
+
+        def fetch_page(genre, limit=20, offset=0):
+            fetched.append((genre, offset))
+            # Both genres return the same titles, so half are duplicates
+            return [
+                Track({"id": f"{genre}-{i}", "name": f"Track {i}"})
+                for i in range(offset, offset + limit)
+            ]
+        self.searcher.genre_searcher._search_tracks_by_genre = Mock(
+            side_effect=fetch_page)
+
+        result = self.searcher.search_tracks("Workout", 60)
+
+        self.assertEqual(len(result), 60)
+        self.assertEqual(len(fetched), len(set(fetched)))
+        self.assertEqual({track.name for track in result},
+                         {f"Track {i}" for i in range(60)})
+
 
 if __name__ == '__main__':
     unittest.main()
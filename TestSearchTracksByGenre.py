@@ -2,6 +2,8 @@ import unittest
 from unittest.mock import Mock, patch
 from SearchTracksByGenre import SearchTracksByGenre
 from Track import Track
+import threading
+import time
 
 
 class TestSearchTracksByGenre(unittest.TestCase):
@@ -38,6 +40,158 @@ class TestSearchTracksByGenre(unittest.TestCase):
         result = self.searcher.search_tracks("rock", 2)
         self.assertEqual(len(result), 1)
 
+    def test_search_tracks_parallel_pages_merge_in_order(self):
+        """Test that parallel pages are merged in offset order"""
+        def fetch_page(genre, limit=20, offset=0):
+            # Later pages finish first to force out-of-order completion
+            time.sleep(0.05 - offset / 10000)
+            return [
+                Track({"id": str(i), "name": f"Track {i}"})
+                for i in range(offset, offset + limit)
+            ]
+        self.searcher._search_tracks_by_genre = Mock(side_effect=fetch_page)
+
+        result = self.searcher.search_tracks("rock", 120)
+
+        self.assertEqual([track.id for track in result],
+                         [str(i) for i in range(120)])
+        offsets = sorted(call.kwargs["offset"] for call in
+                         self.searcher._search_tracks_by_genre.call_args_list)
+        self.assertEqual(offsets, [0, 50, 100])
+
+    def test_search_tracks_parallel_pages_fetched_concurrently(self):
+        """Test that all planned pages are in flight at the same time"""
+        barrier = threading.Barrier(3, timeout=2)
+
+        def fetch_page(genre, limit=20, offset=0):
+            barrier.wait()
+            return [
+                Track({"id": str(i), "name": f"Track {i}"})
+                for i in range(offset, offset + limit)
+            ]
+        self.searcher._search_tracks_by_genre = Mock(side_effect=fetch_page)
+
+        result = self.searcher.search_tracks("rock", 150)
+        self.assertEqual(len(result), 150)
+
+    def test_search_tracks_sequential_mode(self):
+        """Test that a single worker fetches one page at a time"""
+        searcher = SearchTracksByGenre(self.mock_auth, max_workers=1)
+        mock_tracks = [
+            Track({"id": str(i), "name": f"Track {i}"})
+            for i in range(50)
+        ]
+        searcher._search_tracks_by_genre = Mock(return_value=mock_tracks)
+
+        result = searcher.search_tracks("rock", 30)
+        self.assertEqual(len(result), 30)
+        self.assertEqual(searcher._search_tracks_by_genre.call_count, 1)
+
+    def test_search_tracks_page_size_follows_request(self):
+        """Test that a small request asks for a small page"""
+        def fetch_page(genre, limit=20, offset=0):
+            return [
+                Track({"id": str(i), "name": f"Track {i}"})
+                for i in range(offset, offset + limit)
+            ]
+        self.searcher._search_tracks_by_genre = Mock(side_effect=fetch_page)
+
+        result = self.searcher.search_tracks("rock", 20)
+
+        self.assertEqual(len(result), 20)
+        self.searcher._search_tracks_by_genre.assert_called_once_with(
+            "rock", limit=20, offset=0)
+
+    def test_search_tracks_stops_at_end_of_results(self):
+        """Test that a short page ends the search"""
+        def fetch_page(genre, limit=20, offset=0):
+            return [
+                Track({"id": str(i), "name": f"Track {i}"})
+                for i in range(offset, min(offset + limit, 70))
+            ]
+        searcher = SearchTracksByGenre(self.mock_auth, max_workers=1)
+        searcher._search_tracks_by_genre = Mock(side_effect=fetch_page)
+
+        result = searcher.search_tracks("rock", 200)
+
+        self.assertEqual(len(result), 70)
+        self.assertEqual(searcher._search_tracks_by_genre.call_count, 2)
+
+    def test_search_tracks_iter_streams_first_page(self):
+        """Test that tracks are yielded before later pages arrive"""
+        release = threading.Event()
+
+        def fetch_page(genre, limit=20, offset=0):
+            if offset > 0:
+                release.wait(2)
+            return [
+                Track({"id": str(i), "name": f"Track {i}"})
+                for i in range(offset, offset + limit)
+            ]
+        self.searcher._search_tracks_by_genre = Mock(side_effect=fetch_page)
+
+        stream = self.searcher.search_tracks_iter("rock", 100)
+        first = next(stream)
+        self.assertEqual(first.id, "0")
+        self.assertFalse(release.is_set())
+
+        release.set()
+        self.assertEqual(len(list(stream)), 99)
+
+    def fetch_range(self, genre, limit=20, offset=0):
+        return [Track({"id": str(i), "name": f"Track {i}"})
+                for i in range(offset, offset + limit)]
+
+    def test_cursor_resumes_inside_fetched_page(self):
+        """Test that a resumed cursor uses the rest of a cut page first"""
+        searcher = SearchTracksByGenre(self.mock_auth, max_workers=1,
+                                       page_size=50)
+        searcher._search_tracks_by_genre = Mock(side_effect=self.fetch_range)
+        cursor = searcher.make_planner()
+
+        first = searcher.search_tracks("rock", 20, cursor)
+        second = searcher.search_tracks("rock", 20, cursor)
+
+        self.assertEqual([t.id for t in first], [str(i) for i in range(20)])
+        self.assertEqual([t.id for t in second],
+                         [str(i) for i in range(20, 40)])
+        searcher._search_tracks_by_genre.assert_called_once_with(
+            "rock", limit=50, offset=0)
+
+    def test_cursor_keeps_unconsumed_parallel_pages(self):
+        """Test that pages fetched beyond the quota serve the next call"""
+        searcher = SearchTracksByGenre(self.mock_auth, max_workers=4,
+                                       page_size=20)
+        searcher._search_tracks_by_genre = Mock(side_effect=self.fetch_range)
+        cursor = searcher.make_planner()
+        # A low observed yield makes the first wave ask for two pages
+        cursor.received, cursor.unique = 20, 10
+
+        first = searcher.search_tracks("rock", 20, cursor)
+        second = searcher.search_tracks("rock", 20, cursor)
+
+        self.assertEqual([t.id for t in first + second],
+                         [str(i) for i in range(40)])
+        offsets = {call.kwargs["offset"] for call in
+                   searcher._search_tracks_by_genre.call_args_list}
+        self.assertEqual(offsets, {0, 20})
+
+    def test_closed_stream_holds_rest_of_page(self):
+        """Test that tracks after an abandoned stream stay on the cursor"""
+        searcher = SearchTracksByGenre(self.mock_auth, max_workers=1,
+                                       page_size=50)
+        searcher._search_tracks_by_genre = Mock(side_effect=self.fetch_range)
+        cursor = searcher.make_planner()
+
+        stream = searcher.search_tracks_iter("rock", 50, cursor)
+        self.assertEqual([next(stream).id for _ in range(5)],
+                         [str(i) for i in range(5)])
+        stream.close()
+
+        rest = searcher.search_tracks("rock", 10, cursor)
+        self.assertEqual([t.id for t in rest], [str(i) for i in range(5, 15)])
+        self.assertEqual(searcher._search_tracks_by_genre.call_count, 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,139 @@
+import unittest
+from unittest.mock import Mock
+from requests import ConnectionError, ConnectTimeout, ReadTimeout
+from MockSpotifyServer import MockSpotifyServer
+from RequestScheduler import RequestScheduler
+from SearchTracksByGenre import SearchTracksByGenre
+from SpotifyClient import SpotifyClient, request_not_sent
+
+
+class TestSpotifyClient(unittest.TestCase):
+    def setUp(self):
+        """Start a local stand-in server for each test"""
+        self.server = MockSpotifyServer()
+        self.server.start()
+        self.client = SpotifyClient(pool_size=4, api_url=self.server.api_url)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+    def test_pool_configuration(self):
+        """Test that the session adapter uses the configured pool size"""
+        adapter = self.client.session.get_adapter(self.server.api_url)
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(self.client.timeout, (5, 15))
+
+    def test_connection_reused(self):
+        """Test that consecutive requests share one keep-alive connection"""
+        for offset in range(0, 250, 50):
+            response = self.client.get(
+                f"{self.client.api_url}/search",
+                params={"q": "genre:rock", "limit": 50, "offset": offset})
+            self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self.server.request_count, 5)
+        self.assertEqual(self.server.connection_count, 1)
+
+    def test_injected_throttling_retried(self):
+        """Test that injected 429s are retried until the call succeeds"""
+        server = MockSpotifyServer(throttle_rate=0.3, retry_after=0, seed=3)
+        server.start()
+        client = SpotifyClient(
+            api_url=server.api_url,
+            scheduler=RequestScheduler(rate=None, backoff_base=0.001))
+        try:
+            for offset in range(0, 500, 50):
+                response = client.get(
+                    f"{client.api_url}/search",
+                    params={"q": "genre:rock", "limit": 50, "offset": offset})
+                self.assertEqual(response.status_code, 200)
+        finally:
+            client.close()
+            server.stop()
+
+        self.assertGreater(server.throttled_count, 0)
+        self.assertEqual(client.scheduler.stats()["throttled"],
+                         server.throttled_count)
+
+    def test_duplicate_heavy_pages_deduped(self):
+        """Test that re-released tracks are dropped by the searcher"""
+        self.server.duplicate_rate = 0.5
+        auth = Mock(client=SpotifyClient(
+            api_url=self.server.api_url,
+            scheduler=RequestScheduler(rate=None)))
+        auth.get_auth_header.return_value = {"Authorization": "Bearer t"}
+
+        result = SearchTracksByGenre(auth).search_tracks("rock", 100)
+        auth.client.close()
+
+        keys = {track.get_dedupe_key() for track in result}
+        self.assertEqual(len(result), 100)
+        self.assertEqual(len(keys), 100)
+        self.assertGreater(self.server.request_count, 2)
+
+    def test_post_not_repeated_after_read_timeout(self):
+        """Test that a POST that may have landed is not sent again"""
+        client = SpotifyClient(scheduler=RequestScheduler(
+            rate=None, backoff_base=0.001))
+        client.session.request = Mock(side_effect=ReadTimeout())
+        with self.assertRaises(ReadTimeout):
+            client.post("https://api.spotify.com/v1/playlists/p/tracks")
+        self.assertEqual(client.session.request.call_count, 1)
+
+        client.session.request = Mock(side_effect=[ReadTimeout(), Mock(
+            status_code=200, headers={})])
+        response = client.get("https://api.spotify.com/v1/search")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(client.session.request.call_count, 2)
+        client.close()
+
+    def test_post_retried_only_when_not_sent(self):
+        """Test that POSTs retry connect failures and 429s but not 5xx"""
+        client = SpotifyClient(scheduler=RequestScheduler(
+            rate=None, backoff_base=0.001))
+        ok = Mock(status_code=201, headers={})
+        client.session.request = Mock(side_effect=[
+            ConnectTimeout(), Mock(status_code=429, headers={}), ok])
+        self.assertIs(client.post("https://api.spotify.com/v1/x"), ok)
+
+        client.session.request = Mock(
+            return_value=Mock(status_code=502, headers={}))
+        self.assertEqual(
+            client.post("https://api.spotify.com/v1/x").status_code, 502)
+        self.assertEqual(client.session.request.call_count, 1)
+        client.close()
+
+    def test_non_idempotent_put_not_repeated(self):
+        """Test that a PUT flagged non-idempotent is not retried on 5xx"""
+        client = SpotifyClient(scheduler=RequestScheduler(
+            rate=None, max_retries=2, backoff_base=0.001))
+        client.session.request = Mock(
+            return_value=Mock(status_code=500, headers={}))
+        client.put("https://api.spotify.com/v1/x", idempotent=False)
+        self.assertEqual(client.session.request.call_count, 1)
+
+        client.put("https://api.spotify.com/v1/x")
+        self.assertEqual(client.session.request.call_count, 1 + 3)
+        client.close()
+
+    def test_refused_connection_counts_as_not_sent(self):
+        """Test the classification of real connection failures"""
+        closed = MockSpotifyServer()
+        closed.start()
+        url = closed.api_url
+        closed.stop()
+        client = SpotifyClient(scheduler=RequestScheduler(
+            rate=None, max_retries=1, backoff_base=0.001))
+        with self.assertRaises(ConnectionError) as raised:
+            client.post(f"{url}/users/u/playlists")
+        client.close()
+
+        self.assertTrue(request_not_sent(raised.exception))
+        self.assertEqual(client.scheduler.stats()["retries"], 1)
+        self.assertFalse(request_not_sent(ConnectionError(
+            "Connection aborted.")))
+
+
+if __name__ == '__main__':
+    unittest.main()
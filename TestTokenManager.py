@@ -0,0 +1,70 @@
+import unittest
+import threading
+import time
+from unittest.mock import Mock
+from TokenManager import TokenManager
+
+
+class TestTokenManager(unittest.TestCase):
+    def setUp(self):
+        """Set up a manager with a controllable clock"""
+        self.now = 1000.0
+        self.fetch_token = Mock(return_value={
+            "access_token": "token-1",
+            "expires_in": 3600
+        })
+        self.manager = TokenManager(self.fetch_token, refresh_margin=60)
+        self.manager.clock = lambda: self.now
+
+    def test_token_fetched_once_while_fresh(self):
+        """Test that a fresh token is reused"""
+        self.assertEqual(self.manager.get_token(), "token-1")
+        self.now += 1000
+        self.assertEqual(self.manager.get_token(), "token-1")
+        self.assertEqual(self.fetch_token.call_count, 1)
+
+    def test_token_refreshed_before_expiry(self):
+        """Test that the token is refreshed inside the margin"""
+        self.manager.get_token()
+        self.fetch_token.return_value = {
+            "access_token": "token-2",
+            "expires_in": 3600
+        }
+        self.now += 3600 - 30
+
+        self.assertFalse(self.manager.is_fresh())
+        self.assertEqual(self.manager.get_token(), "token-2")
+        self.assertEqual(self.manager.refresh_count, 2)
+
+    def test_failed_refresh_keeps_token(self):
+        """Test that a failed refresh does not drop the current token"""
+        self.manager.get_token()
+        self.fetch_token.return_value = None
+        self.now += 3600
+
+        self.assertEqual(self.manager.get_token(), "token-1")
+
+    def test_single_flight_refresh(self):
+        """Test that concurrent callers trigger a single refresh"""
+        def slow_fetch():
+            time.sleep(0.05)
+            return {"access_token": "token-1", "expires_in": 3600}
+        self.fetch_token.side_effect = slow_fetch
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(self.manager.get_token()))
+            for _ in range(50)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ["token-1"] * 50)
+        self.assertEqual(self.fetch_token.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
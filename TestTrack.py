@@ -1,5 +1,6 @@
 import unittest
-from Track import Track
+from Track import Track, dedupe_key
+from TrackBatch import TrackBatch
 
 
 class TestTrack(unittest.TestCase):
@@ -62,6 +63,60 @@ class TestTrack(unittest.TestCase):
         # Signatures should differ for different data
         self.assertNotEqual(signature1, signature3)
 
+    def test_dedupe_key_collapses_versions(self):
+        """Test that remasters, features and case variants share a key"""
+        variants = [
+            "Test Song",
+            "TEST SONG",
+            "Test Song - Remastered 2011",
+            "Test Song (feat. Someone)",
+            "Test Song [Live at Wembley]",
+            "Test Song - Radio Edit",
+            "Test  Song ft. Someone",
+        ]
+        keys = set()
+        for name in variants:
+            self.track_data["name"] = name
+            keys.add(Track(self.track_data).get_dedupe_key())
+        self.assertEqual(keys, {dedupe_key("test song", "TEST ARTIST")})
+
+        self.track_data["name"] = "Test Song (Remix)"
+        self.assertNotEqual(Track(self.track_data).get_dedupe_key(),
+                            self.track.get_dedupe_key())
+        self.assertEqual(self.track.get_signature(),
+                         ("Test Song", "Test Artist"))
+
+    def test_track_has_no_instance_dict(self):
+        """Test that tracks use slots instead of a per-instance dict"""
+        self.assertFalse(hasattr(self.track, "__dict__"))
+
+    def test_repeated_names_are_shared(self):
+        """Test that artist and album names are interned"""
+        data = {
+            "artists": [{"name": "".join(["Shared ", "Artist"])}],
+            "album": {"name": "".join(["Shared ", "Album"])}
+        }
+        other = {
+            "artists": [{"name": "".join(["Shared ", "Artist"])}],
+            "album": {"name": "".join(["Shared ", "Album"])}
+        }
+        track1 = Track(data)
+        track2 = Track(other)
+        self.assertIs(track1.main_artist, track2.main_artist)
+        self.assertIs(track1.album, track2.album)
+
+    def test_track_batch_from_items(self):
+        """Test columnar batch construction and materialization"""
+        items = [self.track_data, {"id": "456", "name": "Other Song"}]
+        batch = TrackBatch.from_items(items)
+
+        self.assertEqual(len(batch), 2)
+        self.assertEqual(batch.ids, ["test123", "456"])
+        self.assertEqual(batch[0].get_signature(),
+                         self.track.get_signature())
+        self.assertEqual(batch.signatures()[1], ("Other Song", "Unknown"))
+        self.assertEqual(str(batch.tracks()[0]), "Test Song by Test Artist")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,193 @@
+import unittest
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from unittest.mock import Mock
+from SearchTracksByGenre import SearchTracksByGenre
+from Track import Track
+from TrackCatalog import TrackCatalog
+
+
+def make_track(index, artist="Artist", popularity=0):
+    return Track.from_fields(
+        f"id{index}", f"Song {index}", (artist, "Guest"),
+        f"spotify:track:{index}", "Album", popularity)
+
+
+class TestTrackCatalog(unittest.TestCase):
+    def setUp(self):
+        """Set up an in-memory catalog with a controllable clock"""
+        self.now = 1000.0
+        self.catalog = TrackCatalog(max_age=60)
+        self.catalog.clock = lambda: self.now
+
+    def tearDown(self):
+        self.catalog.close()
+
+    def test_upsert_round_trip(self):
+        """Test that stored tracks come back with every field"""
+        self.catalog.upsert_tracks("Rock", [make_track(1, popularity=42)])
+
+        track = self.catalog.get_tracks(["id1"])[0]
+        self.assertEqual(track.name, "Song 1")
+        self.assertEqual(track.artists, ("Artist", "Guest"))
+        self.assertEqual(track.uri, "spotify:track:1")
+        self.assertEqual(track.popularity, 42)
+        self.assertEqual(track.get_dedupe_key(),
+                         make_track(1).get_dedupe_key())
+
+    def test_upsert_updates_existing_rows(self):
+        """Test that upserting again refreshes rather than duplicates"""
+        self.catalog.upsert_tracks("rock", [make_track(1, popularity=10)])
+        self.catalog.upsert_tracks("indie", [make_track(1, popularity=90)])
+
+        self.assertEqual(self.catalog.count(), 1)
+        self.assertEqual(self.catalog.count("rock"), 1)
+        self.assertEqual(self.catalog.count("indie"), 1)
+        self.assertEqual(self.catalog.get_tracks(["id1"])[0].popularity, 90)
+
+    def test_bulk_upsert(self):
+        """Test upserting thousands of rows in one call"""
+        tracks = [make_track(i, artist=f"Artist {i % 10}", popularity=i % 100)
+                  for i in range(5000)]
+        self.assertEqual(self.catalog.upsert_tracks("pop", tracks), 5000)
+
+        self.assertEqual(len(self.catalog.genre_tracks(" POP ", 10000)), 5000)
+        by_artist = self.catalog.tracks_by_artist("Artist 3", limit=5)
+        self.assertEqual(len(by_artist), 5)
+        self.assertTrue(all(t.main_artist == "Artist 3" for t in by_artist))
+        popular = self.catalog.tracks_by_popularity(99, genre="pop")
+        self.assertEqual(len(popular), 50)
+
+    def test_stale_tracks_ignored(self):
+        """Test that tracks older than max_age are not offered"""
+        self.catalog.upsert_tracks("rock", [make_track(1)])
+        self.now += 61
+        self.assertEqual(self.catalog.genre_tracks("rock", 10), [])
+
+    def test_genre_tracks_pages_by_shuffle_key(self):
+        """Test that paging by the last key visits every track once"""
+        self.catalog.upsert_tracks("rock", [make_track(i) for i in range(25)])
+
+        seen = []
+        after = -1.0
+        while True:
+            rows = self.catalog.genre_tracks("rock", 10, after)
+            if not rows:
+                break
+            after = rows[-1][0]
+            seen.extend(track.id for _, track in rows)
+
+        self.assertEqual(sorted(seen), sorted(f"id{i}" for i in range(25)))
+
+    def test_next_offset_tracks_pages(self):
+        """Test that page offsets advance the genre's network cursor"""
+        self.catalog.upsert_tracks("rock", [make_track(i) for i in range(50)],
+                                   offset=0)
+        self.catalog.upsert_tracks("rock", [make_track(i) for i in range(20)],
+                                   offset=50)
+        self.assertEqual(self.catalog.next_offset("rock"), 70)
+        self.assertEqual(self.catalog.next_offset("jazz"), 0)
+
+    def test_next_offset_expires_with_pages(self):
+        """Test that a stale cursor restarts at the next cataloged page"""
+        self.catalog.upsert_tracks("rock", [make_track(i) for i in range(50)],
+                                   offset=0)
+        self.now += 61
+        self.assertEqual(self.catalog.next_offset("rock"), 0)
+
+        self.catalog.upsert_tracks("rock", [make_track(i) for i in range(20)],
+                                   offset=0)
+        self.assertEqual(self.catalog.next_offset("rock"), 20)
+
+    def test_genre_search_refetches_expired_pages(self):
+        """Test that expired pages are searched again from offset 0"""
+        self.catalog.upsert_tracks(
+            "rock", [make_track(i) for i in range(1000)], offset=0)
+        self.now += 61
+        searcher = SearchTracksByGenre(Mock(), catalog=self.catalog,
+                                       max_workers=1)
+        fetch = Mock(side_effect=lambda genre, limit=20, offset=0: [
+            make_track(i) for i in range(offset, offset + limit)])
+        searcher._search_tracks_by_genre = fetch
+
+        result = searcher.search_tracks("rock", 20)
+
+        self.assertEqual(len(result), 20)
+        fetch.assert_called_once_with("rock", limit=20, offset=0)
+
+    def test_legacy_genre_pages_are_migrated(self):
+        """Test that a catalog without cursor timestamps starts over"""
+        path = os.path.join(tempfile.mkdtemp(), "catalog.db")
+        db = sqlite3.connect(path)
+        db.execute("CREATE TABLE genre_pages ("
+                   "genre TEXT PRIMARY KEY, next_offset INTEGER)")
+        db.execute("INSERT INTO genre_pages VALUES ('rock', 500)")
+        db.commit()
+        db.close()
+
+        catalog = TrackCatalog(path, max_age=60)
+        try:
+            self.assertEqual(catalog.next_offset("rock"), 0)
+            catalog.upsert_tracks(
+                "rock", [make_track(i) for i in range(10)], offset=0)
+            self.assertEqual(catalog.next_offset("rock"), 10)
+        finally:
+            catalog.close()
+            shutil.rmtree(os.path.dirname(path))
+
+    def test_genre_search_fills_from_catalog_first(self):
+        """Test that a repeat search is served without network pages"""
+        searcher = SearchTracksByGenre(Mock(), catalog=self.catalog)
+        searcher._search_tracks_by_genre = Mock(return_value=[])
+
+        self.catalog.upsert_tracks("rock", [make_track(i) for i in range(30)],
+                                   offset=0)
+        result = searcher.search_tracks("rock", 20)
+        self.assertEqual(len(result), 20)
+        self.assertEqual(len({track.id for track in result}), 20)
+        searcher._search_tracks_by_genre.assert_not_called()
+
+        cursor = searcher.make_planner()
+        first = searcher.search_tracks("rock", 20, cursor)
+        rest = searcher.search_tracks("rock", 20, cursor)
+        self.assertEqual(len(rest), 10)
+        self.assertEqual({t.id for t in first + rest},
+                         {f"id{i}" for i in range(30)})
+
+    def test_genre_search_fetches_only_shortfall(self):
+        """Test that the network continues after the cataloged pages"""
+        self.catalog.upsert_tracks("rock", [make_track(i) for i in range(30)],
+                                   offset=0)
+        searcher = SearchTracksByGenre(Mock(), catalog=self.catalog,
+                                       max_workers=1)
+        fetch = Mock(side_effect=lambda genre, limit=20, offset=0: [
+            make_track(i) for i in range(offset, offset + limit)])
+        searcher._search_tracks_by_genre = fetch
+
+        result = searcher.search_tracks("rock", 40)
+
+        self.assertEqual(len(result), 40)
+        fetch.assert_called_once_with("rock", limit=10, offset=30)
+
+    def test_network_pages_are_cataloged(self):
+        """Test that fetched search pages are upserted into the catalog"""
+        items = [{"id": f"id{i}", "name": f"Song {i}",
+                  "artists": [{"name": "Artist"}]} for i in range(3)]
+        response = Mock(content=json.dumps(
+            {"tracks": {"items": items}}).encode("utf-8"))
+        auth = Mock()
+        auth.client.api_url = "https://api.spotify.com/v1"
+        auth.client.get.return_value = response
+
+        searcher = SearchTracksByGenre(auth, catalog=self.catalog)
+        searcher.search_tracks("jazz", 3)
+
+        self.assertEqual(self.catalog.count("jazz"), 3)
+        self.assertEqual(self.catalog.next_offset("jazz"), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import Mock
+from MockSpotifyServer import MockSpotifyServer
+from PlaylistFactory import playlist_from_uris
+from RequestScheduler import RequestScheduler
+from SpotifyClient import SpotifyClient
+from Track import Track
+from TrackHydrator import TrackHydrator, track_id_from_uri
+
+
+class TestTrackHydrator(unittest.TestCase):
+    def setUp(self):
+        """Start a stand-in server and auth pointing at it"""
+        self.server = MockSpotifyServer()
+        self.server.start()
+        self.auth = Mock()
+        self.auth.get_auth_header.return_value = {
+            "Authorization": "Bearer test_token"
+        }
+        self.auth.client = SpotifyClient(
+            api_url=self.server.api_url,
+            scheduler=RequestScheduler(rate=None))
+        self.hydrator = TrackHydrator(self.auth)
+
+    def tearDown(self):
+        self.auth.client.close()
+        self.server.stop()
+
+    def test_batches_deduped_ids(self):
+        """Test that repeated ids and URIs are fetched once, 50 per call"""
+        ids = [f"rock-{i}" for i in range(120)]
+        uris = [f"spotify:track:{track_id}" for track_id in ids[:30]]
+
+        tracks = self.hydrator.hydrate(ids + ids[:40] + uris)
+
+        self.assertEqual(len(tracks), 120)
+        self.assertEqual(self.server.request_count, 3)
+        self.assertEqual(tracks["rock-7"].name, "Rock Track 7")
+        self.assertEqual(tracks["rock-7"].popularity, 7)
+
+    def test_fresh_ids_skipped(self):
+        """Test that recently hydrated ids are served from memory"""
+        now = [1000.0]
+        self.hydrator.clock = lambda: now[0]
+        self.hydrator.hydrate([f"rock-{i}" for i in range(40)])
+
+        self.hydrator.hydrate([f"rock-{i}" for i in range(60)])
+        self.assertEqual(self.server.request_count, 2)
+        self.assertEqual(self.auth.client.metrics.counter(
+            "hydrated_tracks_total", source="memory"), 40)
+
+        now[0] += self.hydrator.max_age + 1
+        self.hydrator.hydrate(["rock-1"])
+        self.assertEqual(self.server.request_count, 3)
+
+    def test_memory_bounded(self):
+        """Test that the oldest hydrated tracks are dropped first"""
+        self.hydrator.max_entries = 10
+        self.hydrator.hydrate([f"rock-{i}" for i in range(25)])
+        self.assertEqual(len(self.hydrator.fresh), 10)
+        self.assertIn("rock-24", self.hydrator.fresh)
+
+    def test_unknown_ids_dropped(self):
+        """Test that ids Spotify does not know are left out"""
+        tracks = self.hydrator.hydrate(["rock-1", "nosuchtrack"])
+        self.assertEqual(list(tracks), ["rock-1"])
+
+    def test_hydrate_tracks_updates_in_place(self):
+        """Test that existing tracks get fresh popularity and album"""
+        track = Track({"id": "jazz-42", "name": "Jazz Track 42",
+                       "artists": [{"name": "Jazz Artist 42"}]})
+        self.assertEqual(track.popularity, 0)
+
+        self.assertEqual(self.hydrator.hydrate_tracks([track]), 1)
+        self.assertEqual(track.popularity, 42)
+        self.assertEqual(track.album, "Jazz Album 11")
+
+    def test_playlist_from_uris(self):
+        """Test rebuilding a playlist keeps the stored order"""
+        uris = [f"spotify:track:rock-{i}" for i in (5, 3, 9, 1)]
+        playlist = playlist_from_uris(self.hydrator, uris, "Stored")
+
+        self.assertEqual(playlist.name, "Stored")
+        self.assertEqual(playlist.get_track_uris(), uris)
+
+    def test_track_id_from_uri(self):
+        self.assertEqual(track_id_from_uri("spotify:track:abc"), "abc")
+        self.assertEqual(track_id_from_uri("abc"), "abc")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import random
+from unittest.mock import Mock, patch
+from AudioFeatures import AudioFeatureFetcher
+from MockSpotifyServer import MockSpotifyServer
+from RequestScheduler import RequestScheduler
+from SearchTracksByActivity import SearchTracksByActivity
+from SpotifyClient import SpotifyClient
+from Track import Track
+from TrackRanker import TrackRanker
+
+
+def make_tracks(count):
+    return [Track({"id": f"t{i}", "name": f"Track {i}"})
+            for i in range(count)]
+
+
+class TestTrackRanker(unittest.TestCase):
+    def setUp(self):
+        self.ranker = TrackRanker({"energy": 0.9, "tempo": 140})
+        rng = random.Random(5)
+        self.tracks = make_tracks(500)
+        self.features = {
+            track.id: {"energy": rng.random(), "tempo": rng.uniform(60, 180)}
+            for track in self.tracks
+        }
+
+    def test_top_matches_full_sort(self):
+        """Test that top-k selection agrees with sorting every score"""
+        scores = self.ranker.scores(self.tracks, self.features)
+        expected = sorted(range(500), key=lambda i: -scores[i])[:25]
+
+        result = self.ranker.top(self.tracks, self.features, 25)
+
+        self.assertEqual([track.id for track in result],
+                         [f"t{i}" for i in expected])
+
+    def test_closest_track_first(self):
+        """Test that the track nearest the profile ranks first"""
+        self.features["t7"] = {"energy": 0.9, "tempo": 140}
+        self.assertEqual(self.ranker.top(
+            self.tracks, self.features, 1)[0].id, "t7")
+
+    def test_missing_features_ranked_last(self):
+        """Test that tracks without features are picked last"""
+        del self.features["t0"]
+        result = self.ranker.top(self.tracks, self.features, 500)
+        self.assertEqual(result[-1].id, "t0")
+        self.assertEqual(self.ranker.top(self.tracks, self.features, 0), [])
+
+    def test_without_numpy(self):
+        """Test that the pure Python fallback ranks the same way"""
+        expected = self.ranker.top(self.tracks, self.features, 25)
+        with patch("TrackRanker.np", None):
+            result = self.ranker.top(self.tracks, self.features, 25)
+        self.assertEqual(result, expected)
+
+    def test_activity_profiles(self):
+        """Test that activities without a profile get no ranker"""
+        self.assertIsNotNone(TrackRanker.for_activity("Workout"))
+        self.assertIsNone(TrackRanker.for_activity("not_a_real_activity"))
+
+
+class TestAudioFeatureFetcher(unittest.TestCase):
+    def setUp(self):
+        """Start a stand-in server and auth pointing at it"""
+        self.server = MockSpotifyServer()
+        self.server.start()
+        self.auth = Mock()
+        self.auth.get_auth_header.return_value = {
+            "Authorization": "Bearer test_token"
+        }
+        self.auth.client = SpotifyClient(
+            api_url=self.server.api_url,
+            scheduler=RequestScheduler(rate=None))
+
+    def tearDown(self):
+        self.auth.client.close()
+        self.server.stop()
+
+    def test_fetch_in_batches(self):
+        """Test that ids are fetched 100 per request"""
+        ids = [f"rock-{i}" for i in range(250)]
+        features = AudioFeatureFetcher(self.auth).fetch(ids + ids[:10])
+
+        self.assertEqual(len(features), 250)
+        self.assertEqual(self.server.request_count, 3)
+        self.assertEqual(features["rock-3"]["id"], "rock-3")
+
+    def test_deprecated_endpoint_disables_fetcher(self):
+        """Test that a 403 stops further feature requests"""
+        self.server.audio_features_enabled = False
+        fetcher = AudioFeatureFetcher(self.auth)
+
+        self.assertEqual(fetcher.fetch(["rock-1"]), {})
+        self.assertFalse(fetcher.available)
+        self.assertEqual(fetcher.fetch(["rock-2"]), {})
+        self.assertEqual(self.server.request_count, 1)
+
+    def test_activity_search_ranked(self):
+        """Test that ranked activity tracks sit closer to the profile"""
+        fetcher = AudioFeatureFetcher(self.auth)
+        ranked = SearchTracksByActivity(
+            self.auth, audio_features=fetcher).search_tracks("Workout", 30)
+        plain = SearchTracksByActivity(self.auth).search_tracks("Workout", 30)
+
+        self.assertEqual(len(ranked), 30)
+        ranker = TrackRanker.for_activity("Workout")
+        features = fetcher.fetch(
+            [track.id for track in ranked + plain])
+        ranked_scores = ranker.scores(ranked, features)
+        plain_scores = ranker.scores(plain, features)
+        self.assertGreater(sum(ranked_scores) / 30, sum(plain_scores) / 30)
+
+    def test_activity_search_without_features(self):
+        """Test that activity search still fills up when features fail"""
+        self.server.audio_features_enabled = False
+        result = SearchTracksByActivity(
+            self.auth, audio_features=AudioFeatureFetcher(self.auth)
+        ).search_tracks("Workout", 30)
+
+        self.assertEqual(len(result), 30)
+        self.assertEqual(len({track.id for track in result}), 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import importlib
+import sys
+import types
+from unittest.mock import Mock, patch
+
+
+class FakeFrame:
+    """Stand-in for CTkFrame so the list can be built without a display"""
+
+    height = 0
+
+    def __init__(self, master=None, **kwargs):
+        self.master = master
+
+    def pack(self, **kwargs):
+        pass
+
+    def bind(self, *args):
+        pass
+
+    def winfo_height(self):
+        return FakeFrame.height
+
+
+class FakeWidget:
+    """Stand-in for CTkLabel and CTkScrollbar recording every call"""
+
+    def __init__(self, master=None, **kwargs):
+        self.options = kwargs
+        self.place = Mock()
+        self.pack = Mock()
+        self.bind = Mock()
+        self.configure = Mock()
+        self.destroy = Mock()
+        self.set = Mock()
+
+
+fake_ctk = types.ModuleType("customtkinter")
+fake_ctk.CTkFrame = FakeFrame
+fake_ctk.CTkScrollbar = FakeWidget
+fake_ctk.CTkLabel = FakeWidget
+
+with patch.dict(sys.modules, {"customtkinter": fake_ctk}):
+    VirtualTrackList = importlib.import_module(
+        "VirtualTrackList").VirtualTrackList
+
+
+class TestVirtualTrackList(unittest.TestCase):
+    def setUp(self):
+        """Build a list tall enough for four 24 px rows"""
+        FakeFrame.height = 4 * 24
+        self.track_list = VirtualTrackList(None, row_height=24)
+        self.track_list.on_resize()
+
+    def texts(self):
+        return [label.configure.call_args.kwargs["text"]
+                for label in self.track_list.rows]
+
+    def test_rows_sized_in_constructor(self):
+        """Test that row height goes to the label, not to place()"""
+        self.assertEqual(len(self.track_list.rows), 4)
+        for label in self.track_list.rows:
+            self.assertEqual(label.options["height"], 24)
+            self.assertNotIn("height", label.place.call_args.kwargs)
+
+    def test_render_visible_slice(self):
+        """Test that only the rows in view are written"""
+        self.track_list.set_items([f"Track {i}" for i in range(10)])
+        self.assertEqual(self.texts(), ["1. Track 0", "2. Track 1",
+                                        "3. Track 2", "4. Track 3"])
+
+        self.track_list.scroll_to(3)
+        self.assertEqual(self.texts(), ["4. Track 3", "5. Track 4",
+                                        "6. Track 5", "7. Track 6"])
+        self.track_list.scrollbar.set.assert_called_with(0.3, 0.7)
+
+    def test_scroll_clamped(self):
+        """Test that scrolling stops at both ends of the list"""
+        self.track_list.set_items([f"Track {i}" for i in range(6)])
+
+        self.track_list.scroll_to(50)
+        self.assertEqual(self.track_list.first_index, 2)
+        self.assertEqual(self.texts()[-1], "6. Track 5")
+
+        self.track_list.scroll_to(-5)
+        self.assertEqual(self.track_list.first_index, 0)
+
+    def test_resize_shrinks_pool(self):
+        """Test that rows no longer in view are destroyed"""
+        removed = self.track_list.rows[-1]
+        FakeFrame.height = 2 * 24
+        self.track_list.on_resize()
+
+        self.assertEqual(len(self.track_list.rows), 2)
+        removed.destroy.assert_called_once()
+
+    def test_short_list_blanks_extra_rows(self):
+        """Test that rows past the end of the items are cleared"""
+        self.track_list.set_items(["Only"])
+        self.assertEqual(self.texts(), ["1. Only", "", "", ""])
+        self.track_list.scrollbar.set.assert_called_with(0, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
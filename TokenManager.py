@@ -0,0 +1,55 @@
+from constants import TOKEN_REFRESH_MARGIN
+import threading
+import time
+
+
+class TokenManager:
+    """Class tracking an access token's expiry and refreshing it on demand"""
+
+    def __init__(self, fetch_token, refresh_margin=TOKEN_REFRESH_MARGIN):
+        self.fetch_token = fetch_token
+        self.refresh_margin = refresh_margin
+        self.access_token = None
+        self.expires_at = 0
+        self.refresh_count = 0
+        self.lock = threading.Lock()
+        self.clock = time.time
+
+    def set_token(self, token_data):
+        """Store a token response from the accounts service"""
+        self.access_token = token_data.get("access_token")
+        self.expires_at = self.clock() + token_data.get("expires_in", 3600)
+
+    def clear(self):
+        """Forget the current token"""
+        with self.lock:
+            self.access_token = None
+            self.expires_at = 0
+
+    def is_fresh(self):
+        """Return True if the token is valid beyond the refresh margin"""
+        return (self.access_token is not None
+                and self.clock() < self.expires_at - self.refresh_margin)
+
+    def get_token(self):
+        """Return a fresh token, refreshing it once for all waiting callers"""
+        if self.is_fresh():
+            return self.access_token
+
+        with self.lock:
+            if not self.is_fresh():
+                self._refresh()
+            return self.access_token
+
+    def refresh(self):
+        """Fetch a new token regardless of the current one's expiry"""
+        with self.lock:
+            self._refresh()
+            return self.access_token
+
+    def _refresh(self):
+        """Fetch and store a new token, caller must hold the lock"""
+        token_data = self.fetch_token()
+        if token_data and "access_token" in token_data:
+            self.set_token(token_data)
+            self.refresh_count += 1
@@ -1,16 +1,109 @@
+from functools import lru_cache
+from sys import intern
+import re
+
+VERSION_WORDS = (
+    r"remaster(?:ed)?|live|version|edit|mono|stereo|deluxe|single"
+    r"|bonus track|anniversary|explicit|clean"
+)
+
+# " - Remastered 2011", "(feat. X)", "[Live at Wembley]", " ft. X"
+TITLE_SUFFIX = re.compile(
+    r"\s*[(\[](?:feat\.?|ft\.?|featuring|with)\s[^)\]]*[)\]]"
+    r"|\s*[(\[][^)\]]*\b(?:" + VERSION_WORDS + r")\b[^)\]]*[)\]]"
+    r"|\s+-\s+[^-]*\b(?:" + VERSION_WORDS + r")\b.*$"
+    r"|\s+(?:feat\.?|ft\.?|featuring)\s.*$"
+)
+SUFFIX_MARKERS = ("(", "[", " - ", "feat", "ft.", "featuring")
+
+
+def intern_name(value):
+    """Intern repeated artist and album names so tracks share them"""
+    return intern(value) if isinstance(value, str) else value
+
+
+def normalize_title(name):
+    """Casefold a title and strip version and featured-artist suffixes"""
+    # Titles are casefolded before matching, so the pattern is lowercase.
+    if not name:
+        return ""
+    title = name.casefold()
+    if any(marker in title for marker in SUFFIX_MARKERS):
+        title = TITLE_SUFFIX.sub("", title)
+    return " ".join(title.split())
+
+
+@lru_cache(maxsize=4096)
+def normalize_artist(name):
+    """Casefold an artist name; artists repeat, so results are cached"""
+    return intern(" ".join(name.casefold().split())) if name else ""
+
+
+def dedupe_key(name, main_artist):
+    """Return the key under which near-duplicate tracks collapse
+
+    Only the hash of the normalized title and artist is kept, so a track
+    does not hold a casefolded copy of its name for its whole lifetime.
+    """
+    return hash((normalize_title(name), normalize_artist(main_artist)))
+
+
 class Track:
     """Class representing a Spotify track"""
 
+    __slots__ = (
+        "id", "name", "artists", "main_artist", "uri", "album",
+        "popularity", "_signature", "_dedupe_key"
+    )
+
     def __init__(self, track_data):
         self.id = track_data.get('id')
         self.name = track_data.get('name')
-        self.artists = [
-            artist['name'] for artist in track_data.get('artists', [])
-        ]
+        self.artists = tuple(
+            intern_name(artist['name']) for artist in track_data.get('artists', [])
+        )
         self.main_artist = self.artists[0] if self.artists else "Unknown"
         self.uri = track_data.get('uri')
-        self.album = track_data.get('album', {}).get('name', "Unknown Album")
+        self.album = intern_name(
+            track_data.get('album', {}).get('name', "Unknown Album"))
         self.popularity = track_data.get('popularity', 0)
+        self._signature = (self.name, self.main_artist)
+        self._dedupe_key = dedupe_key(self.name, self.main_artist)
+
+    @classmethod
+    def from_fields(cls, id, name, artists, uri, album, popularity=0):
+        """Build a track from already extracted field values"""
+        track = cls.__new__(cls)
+        track.id = id
+        track.name = name
+        track.artists = tuple(artists)
+        track.main_artist = track.artists[0] if track.artists else "Unknown"
+        track.uri = uri
+        track.album = album
+        track.popularity = popularity
+        track._signature = (name, track.main_artist)
+        track._dedupe_key = dedupe_key(name, track.main_artist)
+        return track
+
+    def update_from(self, other):
+        """Take fresh metadata from other, a newer copy of this track
+
+        Name, artists and URI are kept, because playlists index tracks by
+        their URI and by the dedupe key built from name and artist.
+        """
+        self.popularity = other.popularity
+        self.album = other.album
+
+    def to_dict(self):
+        """Return the track's fields as a JSON-ready dict"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "artists": list(self.artists),
+            "uri": self.uri,
+            "album": self.album,
+            "popularity": self.popularity
+        }
 
     def __str__(self):
         return f"{self.name} by {self.main_artist}"
@@ -20,4 +113,8 @@ class Track:
 
     def get_signature(self):
         """Return a unique signature for the track to avoid duplicates"""
-        return (self.name, self.main_artist)
+        return self._signature
+
+    def get_dedupe_key(self):
+        """Return the normalized key that catches remasters and features"""
+        return self._dedupe_key
@@ -0,0 +1,57 @@
+from Track import Track, intern_name
+from array import array
+
+
+class TrackBatch:
+    """Columnar collection of tracks built straight from search items"""
+
+    def __init__(self):
+        self.ids = []
+        self.names = []
+        self.artists = []
+        self.uris = []
+        self.albums = []
+        self.popularity = array("B")
+
+    @classmethod
+    def from_items(cls, items):
+        """Build a batch from the items list of a search response page"""
+        batch = cls()
+        batch.extend(items)
+        return batch
+
+    def extend(self, items):
+        """Append search items column by column"""
+        for item in items:
+            self.ids.append(item.get('id'))
+            self.names.append(item.get('name'))
+            self.artists.append(tuple(
+                intern_name(artist['name']) for artist in item.get('artists', [])
+            ))
+            self.uris.append(item.get('uri'))
+            self.albums.append(intern_name(
+                item.get('album', {}).get('name', "Unknown Album")))
+            self.popularity.append(item.get('popularity', 0))
+
+    def track(self, index):
+        """Materialize the track at index"""
+        return Track.from_fields(
+            self.ids[index], self.names[index], self.artists[index],
+            self.uris[index], self.albums[index], self.popularity[index])
+
+    def tracks(self):
+        """Materialize every track in the batch"""
+        return [self.track(index) for index in range(len(self))]
+
+    def signatures(self):
+        """Return the dedupe signature of every track in the batch"""
+        return [
+            (name, artists[0] if artists else "Unknown")
+            for name, artists in zip(self.names, self.artists)
+        ]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        return self.track(index)
@@ -0,0 +1,203 @@
+from constants import CATALOG_MAX_AGE
+from Track import Track, intern_name
+import random
+import sqlite3
+import threading
+import time
+
+ARTIST_SEPARATOR = "\x1f"
+
+
+class TrackCatalog:
+    """Class storing every fetched track in a local SQLite catalog"""
+
+    def __init__(self, db_path=":memory:", max_age=CATALOG_MAX_AGE):
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.clock = time.time
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        if db_path != ":memory:":
+            self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+
+        with self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS tracks ("
+                "id TEXT PRIMARY KEY, name TEXT, artists TEXT, "
+                "main_artist TEXT, uri TEXT, album TEXT, "
+                "popularity INTEGER, updated_at REAL)")
+            # shuffle_key is a random number fixed at insert time, so a
+            # range scan from a random start is a random sample.
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS track_genres ("
+                "genre TEXT, track_id TEXT, shuffle_key REAL, "
+                "updated_at REAL, PRIMARY KEY (genre, track_id)"
+                ") WITHOUT ROWID")
+            self.db.execute(
+                "CREATE INDEX IF NOT EXISTS track_genres_shuffle "
+                "ON track_genres (genre, shuffle_key)")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS genre_pages ("
+                "genre TEXT PRIMARY KEY, next_offset INTEGER, "
+                "updated_at REAL)")
+            columns = {row[1] for row in self.db.execute(
+                "PRAGMA table_info(genre_pages)")}
+            if "updated_at" not in columns:
+                # Catalogs written before offsets expired; treat their
+                # cursors as stale so the first pages are fetched again.
+                self.db.execute(
+                    "ALTER TABLE genre_pages ADD COLUMN updated_at REAL "
+                    "DEFAULT 0")
+            self.db.execute(
+                "CREATE INDEX IF NOT EXISTS tracks_main_artist "
+                "ON tracks (main_artist)")
+            self.db.execute(
+                "CREATE INDEX IF NOT EXISTS tracks_popularity "
+                "ON tracks (popularity)")
+
+    @staticmethod
+    def normalize_genre(genre):
+        return genre.strip().casefold()
+
+    def upsert_tracks(self, genre, tracks, offset=None):
+        """Insert or refresh tracks found for genre in one transaction
+
+        When offset is given the tracks are a search page, and the genre's
+        next network offset is advanced past it. A cursor older than
+        max_age is restarted at this page, since the pages before it are
+        no longer served from the catalog.
+        """
+        genre = self.normalize_genre(genre)
+        now = self.clock()
+        rows = [
+            (track.id, track.name, ARTIST_SEPARATOR.join(track.artists),
+             track.main_artist, track.uri, track.album,
+             track.popularity or 0, now)
+            for track in tracks if track.id
+        ]
+
+        with self.lock, self.db:
+            self.db.executemany(
+                "INSERT INTO tracks VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET name = excluded.name, "
+                "artists = excluded.artists, "
+                "main_artist = excluded.main_artist, uri = excluded.uri, "
+                "album = excluded.album, popularity = excluded.popularity, "
+                "updated_at = excluded.updated_at",
+                rows)
+            self.db.executemany(
+                "INSERT INTO track_genres VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (genre, track_id) DO UPDATE SET "
+                "updated_at = excluded.updated_at",
+                ((genre, row[0], random.random(), now) for row in rows))
+            if offset is not None:
+                # updated_at keeps the time of the cursor's first page,
+                # so the whole run expires with its oldest tracks.
+                self.db.execute(
+                    "INSERT INTO genre_pages VALUES (?, ?, ?) "
+                    "ON CONFLICT (genre) DO UPDATE SET "
+                    "next_offset = CASE WHEN updated_at > ? "
+                    "THEN max(next_offset, excluded.next_offset) "
+                    "ELSE excluded.next_offset END, "
+                    "updated_at = CASE WHEN updated_at > ? "
+                    "THEN updated_at ELSE excluded.updated_at END",
+                    (genre, offset + len(tracks), now,
+                     now - self.max_age, now - self.max_age))
+        return len(rows)
+
+    def genre_tracks(self, genre, limit, after=-1.0, before=2.0):
+        """Return (shuffle_key, track) pairs for fresh tracks of genre
+
+        Pairs come in shuffle_key order from the open range (after,
+        before), so callers page through a random sample by passing the
+        last key they saw.
+        """
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT shuffle_key, id, name, artists, uri, album, "
+                "popularity FROM track_genres "
+                "JOIN tracks ON tracks.id = track_genres.track_id "
+                "WHERE genre = ? AND shuffle_key > ? AND shuffle_key < ? "
+                "AND track_genres.updated_at > ? "
+                "ORDER BY shuffle_key LIMIT ?",
+                (self.normalize_genre(genre), after, before,
+                 self.clock() - self.max_age, limit)).fetchall()
+        return [(row[0], self._to_track(row[1:])) for row in rows]
+
+    def get_tracks(self, track_ids):
+        """Return catalog tracks for track_ids, in the given order"""
+        found = {}
+        with self.lock:
+            for start in range(0, len(track_ids), 500):
+                chunk = track_ids[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                for row in self.db.execute(
+                        "SELECT id, name, artists, uri, album, popularity "
+                        f"FROM tracks WHERE id IN ({placeholders})", chunk):
+                    found[row[0]] = self._to_track(row)
+        return [found[track_id] for track_id in track_ids
+                if track_id in found]
+
+    def tracks_by_artist(self, artist, limit=50):
+        """Return the most popular catalog tracks by artist"""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT id, name, artists, uri, album, popularity "
+                "FROM tracks WHERE main_artist = ? "
+                "ORDER BY popularity DESC LIMIT ?",
+                (artist, limit)).fetchall()
+        return [self._to_track(row) for row in rows]
+
+    def tracks_by_popularity(self, min_popularity, genre=None, limit=50):
+        """Return catalog tracks at or above min_popularity"""
+        query = ("SELECT id, name, artists, uri, album, popularity "
+                 "FROM tracks WHERE popularity >= ?")
+        params = [min_popularity]
+        if genre is not None:
+            query += (" AND id IN (SELECT track_id FROM track_genres "
+                      "WHERE genre = ?)")
+            params.append(self.normalize_genre(genre))
+        query += " ORDER BY popularity DESC LIMIT ?"
+        params.append(limit)
+
+        with self.lock:
+            rows = self.db.execute(query, params).fetchall()
+        return [self._to_track(row) for row in rows]
+
+    def next_offset(self, genre):
+        """Return the search offset after the pages already cataloged
+
+        Returns 0 once the cursor is older than max_age, as the tracks
+        of its pages have expired too.
+        """
+        with self.lock:
+            row = self.db.execute(
+                "SELECT next_offset FROM genre_pages "
+                "WHERE genre = ? AND updated_at > ?",
+                (self.normalize_genre(genre),
+                 self.clock() - self.max_age)).fetchone()
+        return row[0] if row else 0
+
+    def count(self, genre=None):
+        """Return how many tracks are cataloged, optionally for one genre"""
+        with self.lock:
+            if genre is None:
+                row = self.db.execute("SELECT count(*) FROM tracks")
+            else:
+                row = self.db.execute(
+                    "SELECT count(*) FROM track_genres WHERE genre = ?",
+                    (self.normalize_genre(genre),))
+            return row.fetchone()[0]
+
+    def close(self):
+        """Close the catalog database"""
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def _to_track(self, row):
+        track_id, name, artists, uri, album, popularity = row
+        artists = artists.split(ARTIST_SEPARATOR) if artists else ()
+        return Track.from_fields(
+            track_id, name, (intern_name(artist) for artist in artists),
+            uri, intern_name(album), popularity)
@@ -0,0 +1,117 @@
+from constants import (
+    TRACKS_BATCH_SIZE, HYDRATE_WORKERS, HYDRATE_MAX_AGE, HYDRATE_CACHE_SIZE
+)
+from ResponseDecoder import decode_json, slim_track_item
+from Track import Track
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+
+def track_id_from_uri(value):
+    """Return the track id of a spotify:track: URI, or value unchanged"""
+    if value and value.startswith("spotify:track:"):
+        return value[len("spotify:track:"):]
+    return value
+
+
+class TrackHydrator:
+    """Class fetching full tracks by id through the multi-id endpoint
+
+    Hydrated tracks are kept in memory for max_age seconds, so ids that
+    were fetched recently are answered without a request.
+    """
+
+    def __init__(
+            self,
+            auth,
+            batch_size=TRACKS_BATCH_SIZE,
+            max_workers=HYDRATE_WORKERS,
+            max_age=HYDRATE_MAX_AGE,
+            max_entries=HYDRATE_CACHE_SIZE
+            ):
+        self.auth = auth
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.fresh = OrderedDict()
+        self.lock = threading.Lock()
+        self.clock = time.time
+
+    def hydrate(self, track_ids):
+        """Return {track_id: Track} for ids or track URIs Spotify knows"""
+        ids = list(dict.fromkeys(
+            track_id_from_uri(track_id) for track_id in track_ids if track_id))
+        found = {}
+        stale = []
+
+        now = self.clock()
+        with self.lock:
+            for track_id in ids:
+                entry = self.fresh.get(track_id)
+                if entry is not None and entry[0] > now - self.max_age:
+                    self.fresh.move_to_end(track_id)
+                    found[track_id] = entry[1]
+                else:
+                    stale.append(track_id)
+
+        metrics = self.auth.client.metrics
+        if found:
+            metrics.inc("hydrated_tracks_total", len(found), source="memory")
+        if not stale:
+            return found
+
+        batches = [stale[start:start + self.batch_size]
+                   for start in range(0, len(stale), self.batch_size)]
+        if len(batches) == 1 or self.max_workers <= 1:
+            pages = [self._fetch_batch(batch) for batch in batches]
+        else:
+            workers = min(self.max_workers, len(batches))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                pages = list(executor.map(self._fetch_batch, batches))
+
+        fetched_at = self.clock()
+        with self.lock:
+            for page in pages:
+                for track in page:
+                    self.fresh[track.id] = (fetched_at, track)
+                    self.fresh.move_to_end(track.id)
+                    found[track.id] = track
+            while len(self.fresh) > self.max_entries:
+                self.fresh.popitem(last=False)
+
+        metrics.inc("hydrated_tracks_total", sum(map(len, pages)),
+                    source="network")
+        return found
+
+    def hydrate_tracks(self, tracks):
+        """Refresh tracks in place; return how many were updated"""
+        hydrated = self.hydrate(track.id for track in tracks)
+        updated = 0
+        for track in tracks:
+            fresh = hydrated.get(track.id)
+            if fresh is not None:
+                track.update_from(fresh)
+                updated += 1
+        return updated
+
+    def tracks_for_uris(self, uris):
+        """Return tracks for uris in the same order, skipping unknown ones"""
+        hydrated = self.hydrate(uris)
+        return [hydrated[track_id] for track_id in map(track_id_from_uri, uris)
+                if track_id in hydrated]
+
+    def _fetch_batch(self, ids):
+        """Fetch up to batch_size tracks in one request"""
+        response = self.auth.client.get(
+            f"{self.auth.client.api_url}/tracks",
+            headers=self.auth.get_auth_header(),
+            params={"ids": ",".join(ids)})
+        if response.status_code != 200:
+            print(f"Error fetching tracks: {response.content}")
+            return []
+
+        items = decode_json(response.content).get("tracks") or []
+        return [Track(slim_track_item(item)) for item in items if item]
@@ -0,0 +1,89 @@
+from constants import ACTIVITY_PROFILES, AUDIO_FEATURES, TEMPO_RANGE
+import heapq
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def normalize_feature(name, value):
+    """Scale a feature to 0-1; only tempo comes in other units"""
+    if name == "tempo":
+        low, high = TEMPO_RANGE
+        return min(max((value - low) / (high - low), 0.0), 1.0)
+    return value
+
+
+class TrackRanker:
+    """Class ranking tracks by closeness to a target audio-feature profile
+
+    Scores are the negated mean squared distance to the profile, so
+    higher is better. Tracks without features score -inf and are only
+    picked once every track with features has been.
+    """
+
+    def __init__(self, profile):
+        self.names = [name for name in AUDIO_FEATURES if name in profile]
+        self.target = [normalize_feature(name, profile[name])
+                       for name in self.names]
+
+    @classmethod
+    def for_activity(cls, activity):
+        """Return a ranker for activity, or None if it has no profile"""
+        profile = ACTIVITY_PROFILES.get(activity)
+        return None if profile is None else cls(profile)
+
+    def scores(self, tracks, features):
+        """Return the score of every track, in track order"""
+        items = [features.get(track.id) for track in tracks]
+        if np is None:
+            return [self._score_item(item) for item in items]
+        return self._score_matrix(items)
+
+    def top(self, tracks, features, k):
+        """Return the k best-scoring tracks, best first"""
+        k = min(k, len(tracks))
+        if k <= 0:
+            return []
+
+        scores = self.scores(tracks, features)
+        if np is None:
+            best = heapq.nlargest(k, range(len(tracks)),
+                                  key=scores.__getitem__)
+        else:
+            # Partial selection keeps this linear; only k get sorted.
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best], kind="stable")]
+        return [tracks[index] for index in best]
+
+    def _score_matrix(self, items):
+        """Score all items with one vectorized pass per feature"""
+        count = len(items)
+        missing = np.fromiter((item is None for item in items), dtype=bool,
+                              count=count)
+        present = [item or {} for item in items]
+        distance = np.zeros(count)
+        for name, target in zip(self.names, self.target):
+            column = np.fromiter((item.get(name, np.nan) for item in present),
+                                 dtype=float, count=count)
+            if name == "tempo":
+                low, high = TEMPO_RANGE
+                column = np.clip((column - low) / (high - low), 0.0, 1.0)
+            # A feature Spotify left out counts as on target.
+            distance += np.nan_to_num(column - target) ** 2
+
+        scores = -distance / max(len(self.names), 1)
+        scores[missing] = -np.inf
+        return scores
+
+    def _score_item(self, item):
+        """Score one track's features without NumPy"""
+        if item is None:
+            return float("-inf")
+        distance = 0.0
+        for name, target in zip(self.names, self.target):
+            value = item.get(name)
+            if value is not None:
+                distance += (normalize_feature(name, value) - target) ** 2
+        return -distance / max(len(self.names), 1)
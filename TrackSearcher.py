@@ -1,32 +1,91 @@
 from Track import Track
-import json
+from ResponseDecoder import decode_search_page, extract_track_items
 from abc import ABC, abstractmethod
-from requests import get
+import time
 
 
 class TrackSearcher(ABC):
     """Abstract base class for track searching strategies"""
-    def __init__(self, auth):
+    def __init__(self, auth, cache=None, catalog=None):
         self.auth = auth
+        self.cache = cache
+        self.catalog = catalog
+        self.progress_callback = None
 
     @abstractmethod
     def search_tracks(self, query, num_tracks=20):
         """Abstract method to search for tracks based on query"""
         pass
 
+    def search_tracks_iter(self, query, num_tracks=20):
+        """Yield tracks based on query as they become available"""
+        yield from self.search_tracks(query, num_tracks)
+
+    @property
+    def metrics(self):
+        """Metrics registry shared with the HTTP client"""
+        return self.auth.client.metrics
+
+    def set_progress_callback(self, callback):
+        """Register callback(genre, offset, count) called after every page"""
+        self.progress_callback = callback
+
     def _search_tracks_by_genre(self, genre, limit=20, offset=0):
         """Helper method to search tracks by genre"""
-        url = "https://api.spotify.com/v1/search"
+        fetched = []
+
+        def load(limit, offset):
+            items = self._request_page(genre, limit, offset)
+            fetched.append(items)
+            return items
+
+        if self.cache is not None:
+            # Only the part of the page the cache lacks is requested
+            items = self.cache.get_range(genre, limit, offset, load)
+        else:
+            items = load(limit, offset)
+
+        if items is None:
+            return []
+
+        source = "network" if fetched else "cache"
+        self.metrics.inc("search_pages_total", source=source)
+        self.metrics.inc("search_page_tracks_total", len(items), source=source)
+        self._report_page(genre, offset, len(items))
+        tracks = [Track(item) for item in items]
+        if fetched and self.catalog is not None:
+            self.catalog.upsert_tracks(genre, tracks, offset)
+        return tracks
+
+    def _request_page(self, genre, limit, offset):
+        """Fetch one search page, returning its items or None on error"""
+        url = f"{self.auth.client.api_url}/search"
         headers = self.auth.get_auth_header()
         query = f"q=genre:{genre}&type=track&limit={limit}&offset={offset}"
         url += f"?{query}"
 
-        result = get(url, headers=headers)
-        json_result = json.loads(result.content)
+        result = self.auth.client.get(url, headers=headers)
+        json_result = decode_search_page(result.content)
+        items = extract_track_items(json_result)
 
-        if "tracks" in json_result and "items" in json_result["tracks"]:
-            return [Track(item) for item in json_result["tracks"]["items"]]
-        else:
+        if items is None:
             print(f"Error: Could not retrieve tracks for genre '{genre}'.")
             print(f"Response: {json_result}")
-            return []
+        return items
+
+    def _record_dedupe(self, stage, checked, discarded):
+        """Count tracks checked and dropped by one dedupe pass"""
+        if checked:
+            self.metrics.inc("dedupe_tracks_total", checked, stage=stage)
+            self.metrics.inc("dedupe_discarded_total", discarded, stage=stage)
+
+    def _record_generation(self, strategy, started, pages):
+        """Record the time and pages one top-level search took"""
+        self.metrics.observe("generation_duration_seconds",
+                             time.perf_counter() - started, strategy=strategy)
+        self.metrics.observe("generation_pages", pages, strategy=strategy)
+
+    def _report_page(self, genre, offset, count):
+        """Notify the progress callback that a page was fetched"""
+        if self.progress_callback is not None:
+            self.progress_callback(genre, offset, count)
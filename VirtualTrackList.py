@@ -0,0 +1,102 @@
+import customtkinter as ctk
+
+
+class VirtualTrackList(ctk.CTkFrame):
+    """Scrollable track list that only creates widgets for visible rows"""
+
+    def __init__(self, master, row_height=24, **kwargs):
+        super().__init__(master, **kwargs)
+        self.row_height = row_height
+        self.items = []
+        self.first_index = 0
+        self.rows = []
+
+        self.rows_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.rows_frame.pack(side="left", fill="both", expand=True, padx=10)
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.rows_frame.bind("<Configure>", self.on_resize)
+        self.bind_scroll_wheel(self.rows_frame)
+
+    def set_items(self, items):
+        """Replace the listed items and scroll back to the top"""
+        self.items = list(items)
+        self.first_index = 0
+        self.render()
+
+    def format_item(self, index, item):
+        """Return the text shown for one row"""
+        return f"{index + 1}. {item}"
+
+    def visible_count(self):
+        """Return how many rows fit in the current height"""
+        height = self.rows_frame.winfo_height()
+        return max(1, height // self.row_height)
+
+    def scroll_to(self, index):
+        """Make index the first visible row"""
+        last_first = max(0, len(self.items) - len(self.rows))
+        self.first_index = min(max(0, index), last_first)
+        self.render()
+
+    def render(self):
+        """Write the visible slice of items into the pooled row labels"""
+        for row, label in enumerate(self.rows):
+            index = self.first_index + row
+            if index < len(self.items):
+                label.configure(text=self.format_item(index, self.items[index]))
+            else:
+                label.configure(text="")
+
+        total = len(self.items)
+        if total <= len(self.rows):
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.first_index / total,
+                               (self.first_index + len(self.rows)) / total)
+
+    def on_resize(self, event=None):
+        """Grow or shrink the row pool to match the visible height"""
+        count = self.visible_count()
+
+        while len(self.rows) < count:
+            # customtkinter rejects width/height in place(); size the
+            # label through its constructor instead.
+            label = ctk.CTkLabel(
+                self.rows_frame,
+                text="",
+                font=("Helvetica", 12),
+                anchor="w",
+                height=self.row_height
+            )
+            label.place(x=0, y=len(self.rows) * self.row_height, relwidth=1)
+            self.bind_scroll_wheel(label)
+            self.rows.append(label)
+
+        while len(self.rows) > count:
+            self.rows.pop().destroy()
+
+        self.scroll_to(self.first_index)
+
+    def on_scrollbar(self, *args):
+        """Handle scrollbar drags and arrow clicks"""
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.items)))
+        elif args[0] == "scroll":
+            step = len(self.rows) if args[2] == "pages" else 1
+            self.scroll_to(self.first_index + int(args[1]) * step)
+
+    def on_mouse_wheel(self, event):
+        """Scroll three rows per wheel notch"""
+        if getattr(event, "num", None) == 4 or event.delta > 0:
+            self.scroll_to(self.first_index - 3)
+        else:
+            self.scroll_to(self.first_index + 3)
+
+    def bind_scroll_wheel(self, widget):
+        """Route wheel events from widget to the list"""
+        widget.bind("<MouseWheel>", self.on_mouse_wheel)
+        widget.bind("<Button-4>", self.on_mouse_wheel)
+        widget.bind("<Button-5>", self.on_mouse_wheel)
@@ -0,0 +1,96 @@
+from SpotifyAuth import SpotifyAuth
+from BatchGenerator import (
+    BatchGenerator, BatchJob, write_json, write_csv, write_timings
+)
+from SearchCache import SearchCache
+from AudioFeatures import AudioFeatureFetcher
+from TrackCatalog import TrackCatalog
+from constants import (
+    ACTIVITY_GENRES, BATCH_WORKERS, BATCH_SIZES, BATCH_CACHE_SIZE
+)
+import argparse
+import sys
+import time
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate many playlists without the UI")
+    parser.add_argument("--activities", action="store_true",
+                        help="generate every activity in ACTIVITY_GENRES")
+    parser.add_argument("--activity", action="append", default=[],
+                        help="activity to generate (repeatable)")
+    parser.add_argument("--genre", action="append", default=[],
+                        help="genre to generate (repeatable)")
+    parser.add_argument("--genres-file",
+                        help="file with one genre per line")
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=list(BATCH_SIZES),
+                        help="playlist sizes to generate for every query")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS,
+                        help="jobs generated at the same time")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--output", help="output file (default stdout)")
+    parser.add_argument("--cache-db", help="SQLite file for search pages")
+    parser.add_argument("--catalog", help="SQLite track catalog file")
+    parser.add_argument("--metrics",
+                        help="write Prometheus metrics to this file")
+    return parser, parser.parse_args(argv)
+
+
+def build_jobs(args):
+    """Return one job per query and size"""
+    queries = []
+    activities = list(ACTIVITY_GENRES) if args.activities else args.activity
+    queries.extend(("activity", activity) for activity in activities)
+    queries.extend(("genre", genre) for genre in args.genre)
+
+    if args.genres_file:
+        with open(args.genres_file, encoding="utf-8") as genres_file:
+            queries.extend(("genre", line.strip()) for line in genres_file
+                           if line.strip() and not line.startswith("#"))
+
+    return [BatchJob(strategy, query, size)
+            for strategy, query in queries for size in args.sizes]
+
+
+def main(argv=None):
+    parser, args = parse_args(argv)
+    jobs = build_jobs(args)
+    if not jobs:
+        parser.error("no jobs: pass --activities, --activity, --genre "
+                     "or --genres-file")
+
+    cache = SearchCache(max_entries=BATCH_CACHE_SIZE, db_path=args.cache_db)
+    catalog = TrackCatalog(args.catalog) if args.catalog else None
+    auth = SpotifyAuth()
+    generator = BatchGenerator(auth, cache, catalog, args.workers,
+                               AudioFeatureFetcher(auth))
+
+    start = time.perf_counter()
+    results = generator.run(jobs)
+    elapsed = time.perf_counter() - start
+
+    write = write_json if args.format == "json" else write_csv
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as output:
+            write(results, output)
+    else:
+        write(results, sys.stdout)
+
+    write_timings(results, sys.stderr)
+    stats = cache.stats()
+    sys.stderr.write(f"{len(jobs)} jobs in {elapsed:.2f} s, "
+                     f"{stats['loads']} pages fetched\n")
+    if args.metrics:
+        with open(args.metrics, "w", encoding="utf-8") as metrics_file:
+            metrics_file.write(auth.client.metrics.to_prometheus())
+
+    cache.close()
+    if catalog is not None:
+        catalog.close()
+    return 1 if any(result.error for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
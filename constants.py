@@ -11,3 +11,84 @@ ACTIVITY_GENRES = {
         "Cooking": ["jazz", "soul"],
         "Gaming": ["edm", "dubstep"]
     }
+
+# Target audio features per activity; tempo is in BPM, the rest are 0-1
+ACTIVITY_PROFILES = {
+        "Workout": {"energy": 0.9, "danceability": 0.7, "tempo": 140,
+                    "valence": 0.6},
+        "Study": {"energy": 0.2, "instrumentalness": 0.8, "tempo": 80,
+                  "acousticness": 0.7},
+        "Relax": {"energy": 0.25, "acousticness": 0.7, "tempo": 75,
+                  "valence": 0.5},
+        "Party": {"energy": 0.8, "danceability": 0.85, "tempo": 125,
+                  "valence": 0.8},
+        "Driving": {"energy": 0.7, "valence": 0.6, "tempo": 115},
+        "Focus": {"energy": 0.35, "instrumentalness": 0.85, "tempo": 100,
+                  "speechiness": 0.05},
+        "Cooking": {"energy": 0.5, "valence": 0.7, "acousticness": 0.5,
+                    "tempo": 105},
+        "Gaming": {"energy": 0.85, "tempo": 140, "instrumentalness": 0.6}
+    }
+
+SPOTIFY_API_URL = "https://api.spotify.com/v1"
+SPOTIFY_ACCOUNTS_URL = "https://accounts.spotify.com"
+
+HTTP_POOL_SIZE = 10
+HTTP_CONNECT_TIMEOUT = 5
+HTTP_READ_TIMEOUT = 15
+
+PAGE_FETCH_WORKERS = 4
+
+AUDIO_FEATURES = (
+    "energy", "danceability", "valence", "tempo", "acousticness",
+    "instrumentalness", "speechiness"
+)
+AUDIO_FEATURES_BATCH_SIZE = 100
+AUDIO_FEATURES_WORKERS = 4
+TEMPO_RANGE = (50, 200)
+RANKING_CANDIDATE_FACTOR = 3
+
+TRACKS_BATCH_SIZE = 50
+HYDRATE_WORKERS = 4
+HYDRATE_MAX_AGE = 3600
+HYDRATE_CACHE_SIZE = 10000
+
+SEARCH_PAGE_LIMIT = 50
+SEARCH_MAX_OFFSET = 1000
+SEARCH_MAX_PAGES = 20
+SEARCH_MIN_YIELD = 0.1
+
+SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_TTL = 3600
+
+CATALOG_PATH = "track_catalog.db"
+CATALOG_MAX_AGE = 7 * 24 * 3600
+
+TOKEN_REFRESH_MARGIN = 60
+
+SCHEDULER_RATE = 10
+SCHEDULER_BURST = 20
+SCHEDULER_MAX_CONCURRENCY = 8
+SCHEDULER_MAX_RETRIES = 4
+SCHEDULER_BACKOFF_BASE = 0.5
+SCHEDULER_BACKOFF_CAP = 30
+
+UI_TRACK_BATCH_SIZE = 10
+
+METRICS_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+METRICS_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+BATCH_WORKERS = 4
+BATCH_SIZES = (20, 50, 100)
+BATCH_CACHE_SIZE = 4096
+
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8080
+SERVICE_MAX_USERS = 1024
+SERVICE_MAX_TRACKS = 1000
+
+UPLOAD_BATCH_SIZE = 100
+UPLOAD_WORKERS = 8
+UPLOAD_REORDER_ATTEMPTS = 3
+PLAYLIST_PAGE_SIZE = 100
@@ -1,8 +1,9 @@
 from SpotifyPlaylistGenerator import SpotifyPlaylistGenerator
 from AppUI import AppUI
+from constants import CATALOG_PATH
 
 
 if __name__ == "__main__":
-    generator = SpotifyPlaylistGenerator()
+    generator = SpotifyPlaylistGenerator(catalog_path=CATALOG_PATH)
     app = AppUI(generator)
     app.run()
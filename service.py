@@ -0,0 +1,34 @@
+from SpotifyAuth import SpotifyAuth
+from PlaylistService import PlaylistService
+from TrackCatalog import TrackCatalog
+from AudioFeatures import AudioFeatureFetcher
+from constants import SERVICE_HOST, SERVICE_PORT
+import argparse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Serve playlist generation and upload over HTTP")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--reuse-port", action="store_true",
+                        help="let several processes share the port")
+    parser.add_argument("--catalog", help="SQLite track catalog file")
+    args = parser.parse_args(argv)
+
+    catalog = TrackCatalog(args.catalog) if args.catalog else None
+    auth = SpotifyAuth()
+    service = PlaylistService(
+        auth, catalog=catalog, host=args.host, port=args.port,
+        reuse_port=args.reuse_port,
+        audio_features=AudioFeatureFetcher(auth))
+    print(f"Serving on {service.start()}")
+
+    try:
+        service.server_thread.join()
+    except KeyboardInterrupt:
+        service.stop()
+
+
+if __name__ == "__main__":
+    main()